@@ -0,0 +1,276 @@
+"""
+The benchmarks themselves. Each one builds what it needs the same way the game does (same levels, same assets), and
+measures it with best_time() or by counting how much gets done in a fixed amount of work.
+
+The display must already exist (see run.py), since images are converted for it.
+"""
+
+import random
+from pathlib import Path
+
+import pygame
+import pymunk
+
+from benchmarks.harness import benchmark, best_time, metric
+from scripts.enemy.basic_enemy import BasicEnemy
+from scripts.headless import DEFAULT_SCRIPT
+from scripts.leveldesigner import level_compiler, level_generator
+from scripts.leveldesigner.level_designer import LevelDesigner
+from scripts.player.player import Player
+from scripts.scenes.level_one import LevelOneScene
+from scripts.scenes.scene_manager import SceneManager
+from scripts.util import assets, coloring, game_time, input_source
+from scripts.util.image_utils import auto_crop
+from scripts.util.input_source import ScriptedInput
+
+# Enemy counts LevelOneScene.update is measured with, and how many updates to time for each
+ENEMY_COUNTS = {0: 3000, 100: 600, 1000: 120}
+
+# Size of the generated level the stress benchmark uses, and how many updates of it to time
+GENERATED_LEVEL = dict(width=10000, height=20, density=0.3, run_length=(2, 8), enemies=2000, seed=0)
+GENERATED_LEVEL_STEPS = 30
+
+# Where the player (and so the camera) is put when measuring rendering, as fractions of the level's width
+CAMERA_POSITIONS = (0.0, 0.5, 1.0)
+
+
+def compiled_levels() -> list[int]:
+    """ Returns the number of every level that has a compiled file. """
+    return sorted(int(path.stem[len("level"):]) for path in level_compiler.COMPILED_DIR.glob("level*.lvl"))
+
+
+def make_level(enemies: int = None, level=None, streamed: bool = True, component_store: bool = False) -> LevelOneScene:
+    """
+    Builds level one, played by the default headless script. The level keeps running even if the player dies.
+
+    :param enemies: if given, the level's enemies are replaced by this many, spread over its walkable ground. All of
+    them are kept in the world, rather than streamed in as the camera comes near.
+    :param level: if given, the layout to play instead of level one's, as anything LevelDesigner accepts.
+    :param streamed: if True, only the chunks of the level near the camera are in the world.
+    :param component_store: if True, enemies and bullets are also kept in a ComponentStore.
+    """
+
+    input_source.use(ScriptedInput(DEFAULT_SCRIPT))
+    scene = LevelOneScene(seed=0, level=level, streamed=streamed and enemies is None, component_store=component_store)
+    SceneManager(initial_scene=scene)
+    scene.fail_level = lambda: None
+    if enemies is not None:
+        set_enemy_count(scene, enemies)
+    return scene
+
+
+def set_enemy_count(scene: LevelOneScene, count: int) -> None:
+    """ Replaces a level's enemies with a number of new ones, spread evenly over every stretch of walkable ground. """
+
+    for enemy in scene.enemies:
+        scene.world.remove(enemy.body, enemy.shape)
+        game_time.unschedule(enemy.update_animation)
+        if scene.entities is not None:
+            scene.entities.remove(enemy)
+    scene.enemies.clear()
+
+    walkable = scene.level_designer.walkable
+    spans = walkable.spans
+    for i in range(count):
+        left, right, top = spans[i % len(spans)]
+        x = left + (i // len(spans) * 61) % max(right - left - 48, 1)
+        enemy = BasicEnemy(enemy_type=("frog", "slime", "scorpion")[i % 3], rect=pygame.Rect(x, top, 48, 48),
+                           world=scene.world, walkable=walkable)
+        scene.enemies.append(enemy)
+        if scene.entities is not None:
+            scene.entities.add(enemy, frames=enemy.animations[enemy.enemy_type], healthbar=enemy.healthbar)
+
+
+@benchmark("level_load")
+def level_load() -> dict:
+    """ How long it takes to build each level's platforms, enemies, terrain cache, etc. """
+
+    results = dict()
+    for level in compiled_levels():
+        seconds = best_time(lambda: LevelDesigner(world=pymunk.Space(), level=level), repeat=5,
+                            setup=game_time.reset)
+        results[f"level {level}"] = metric(seconds * 1000, "ms")
+    return results
+
+
+@benchmark("entity_construction")
+def entity_construction() -> dict:
+    """ How long it takes to create a player and an enemy, once their images have been loaded. """
+
+    world = pymunk.Space()
+    player = best_time(lambda: Player("default", rect=pygame.Rect(100, 350, 50, 100), world=world), repeat=5,
+                       number=10, setup=game_time.reset)
+    enemy = best_time(lambda: BasicEnemy(enemy_type="frog", rect=pygame.Rect(0, 0, 48, 48), world=world),
+                      repeat=5, number=100, setup=game_time.reset)
+    return {
+        "player": metric(player * 1000, "ms"),
+        "enemy": metric(enemy * 1e6, "us"),
+    }
+
+
+def measure_level_update(component_store: bool) -> dict:
+    """ How many fixed-timestep updates of level one run per second, with different numbers of enemies. """
+
+    results = dict()
+    for count, steps in ENEMY_COUNTS.items():
+        scene = make_level(enemies=count, component_store=component_store)
+
+        # Let everything settle onto the ground first
+        for _ in range(30):
+            input_source.advance()
+            scene.handle_events(input_source.get_events())
+            scene.update()
+
+        def run():
+            for _ in range(steps):
+                input_source.advance()
+                scene.handle_events(input_source.get_events())
+                scene.update()
+
+        seconds = best_time(run, repeat=5)
+        results[f"{count} enemies"] = metric(steps / seconds, "steps/s", better="higher")
+    input_source.use(input_source.KeyboardInput())
+    return results
+
+
+@benchmark("level_update")
+def level_update() -> dict:
+    """ How many fixed-timestep updates of level one run per second, with different numbers of enemies. """
+    return measure_level_update(component_store=False)
+
+
+@benchmark("level_update_store")
+def level_update_store() -> dict:
+    """ The same as level_update, with enemies and bullets also kept in a ComponentStore. """
+    return measure_level_update(component_store=True)
+
+
+@benchmark("generated_level")
+def generated_level() -> dict:
+    """
+    How long a huge generated level takes to build, and how many updates of it run per second, both when it is
+    streamed in chunks and when all of it is in the world.
+    """
+
+    generate_seconds = best_time(lambda: level_generator.generate_level(**GENERATED_LEVEL), repeat=3)
+    level = level_generator.generate_level(**GENERATED_LEVEL)
+    results = {"generate": metric(generate_seconds * 1000, "ms")}
+
+    for streamed in (True, False):
+        label = "streamed" if streamed else "everything"
+        chunk_columns = LevelOneScene.CHUNK_COLUMNS if streamed else None
+        load_seconds = best_time(lambda: LevelDesigner(world=pymunk.Space(), level=level,
+                                                       chunk_columns=chunk_columns), repeat=3, setup=game_time.reset)
+
+        scene = make_level(level=level, streamed=streamed)
+
+        def run():
+            for _ in range(GENERATED_LEVEL_STEPS):
+                input_source.advance()
+                scene.handle_events(input_source.get_events())
+                scene.update()
+
+        update_seconds = best_time(run, repeat=3)
+        results[f"load, {label}"] = metric(load_seconds * 1000, "ms")
+        results[f"update, {label}"] = metric(GENERATED_LEVEL_STEPS / update_seconds, "steps/s", better="higher")
+
+    input_source.use(input_source.KeyboardInput())
+    return results
+
+
+def measure_level_render(component_store: bool) -> dict:
+    """
+    How many frames of level one can be drawn per second, with the camera at a few fixed places, and in the middle
+    of the level with the most enemies level_update uses.
+    """
+
+    screen = pygame.display.get_surface()
+    scene = make_level(component_store=component_store)
+    scene.update()
+
+    def move_player(fraction: float):
+        # Move the player (which the camera follows) there, standing still
+        scene.player.body.position = (fraction * scene.level_designer.max_x, scene.level_designer.max_y / 2)
+        scene.player.body.velocity = (0, 0)
+        scene.player.body.save_position()
+        scene.stream_level()
+
+    results = dict()
+    for fraction in CAMERA_POSITIONS:
+        move_player(fraction)
+        seconds = best_time(lambda: scene.render(screen), repeat=5, number=20)
+        results[f"camera at {fraction:.0%}"] = metric(1 / seconds, "frames/s", better="higher")
+
+    count = max(ENEMY_COUNTS)
+    scene = make_level(enemies=count, component_store=component_store)
+    for _ in range(30):
+        scene.update()
+    move_player(0.5)
+    seconds = best_time(lambda: scene.render(screen), repeat=5, number=10)
+    results[f"{count} enemies, camera at 50%"] = metric(1 / seconds, "frames/s", better="higher")
+
+    input_source.use(input_source.KeyboardInput())
+    return results
+
+
+@benchmark("level_render")
+def level_render() -> dict:
+    """ How many frames of level one can be drawn per second, see measure_level_render(). """
+    return measure_level_render(component_store=False)
+
+
+@benchmark("level_render_store")
+def level_render_store() -> dict:
+    """ The same as level_render, with enemies and bullets drawn from a ComponentStore. """
+    return measure_level_render(component_store=True)
+
+
+@benchmark("clock")
+def clock() -> dict:
+    """ How long game_time.Clock takes to schedule 10,000 events, and to tick through them. """
+
+    events = 10000
+    rng = random.Random(0)
+    delays = [rng.uniform(0.01, 10) for _ in range(events)]
+
+    def schedule_all() -> game_time.Clock:
+        scheduled = game_time.Clock()
+        for delay in delays:
+            scheduled.schedule(lambda: None, delay)
+        return scheduled
+
+    # Ticks with nothing due (the usual case), and one tick that runs every event at once
+    pending = schedule_all()
+    clocks: list[game_time.Clock] = []
+    return {
+        "schedule 10k": metric(best_time(schedule_all, repeat=3) * 1000, "ms"),
+        "tick, nothing due": metric(best_time(lambda: pending.tick(dt=0), repeat=5, number=1000) * 1e6, "us"),
+        "tick, 10k due": metric(best_time(lambda: clocks.pop().tick(dt=10), repeat=3,
+                                          setup=lambda: clocks.append(schedule_all())) * 1000, "ms"),
+    }
+
+
+@benchmark("image_processing")
+def image_processing() -> dict:
+    """ How many player animation frames per second can be cropped and scaled, and recolored. """
+
+    animations = [[assets.load_image(frame) for frame in sorted(folder.iterdir())]
+                  for folder in sorted(Path("assets/player/animations").iterdir())]
+    frame_count = sum(len(frames) for frames in animations)
+    cropped = [auto_crop(images=frames, size=(50, 100)) for frames in animations]
+
+    copies: list[pygame.Surface] = []
+
+    def copy_frames():
+        copies[:] = [frame.copy() for frames in cropped for frame in frames]
+
+    def recolor_frames():
+        # Fresh copies every time, so palette_swap() can't just hand back what it remembered
+        coloring.palette_swap(copies, {(227, 224, 224): (255, 0, 0)})
+
+    crop_seconds = best_time(lambda: [auto_crop(images=frames, size=(50, 100)) for frames in animations], repeat=5)
+    recolor_seconds = best_time(recolor_frames, repeat=5, setup=copy_frames)
+    return {
+        "auto_crop": metric(frame_count / crop_seconds, "frames/s", better="higher"),
+        "palette_swap": metric(frame_count / recolor_seconds, "frames/s", better="higher"),
+    }
@@ -0,0 +1,49 @@
+"""
+Compares benchmark results against a baseline, and exits with status 1 if anything got slower than allowed.
+
+example usage (from the project's root folder):
+    python -m benchmarks.compare baseline.json results.json --threshold 0.15
+"""
+
+import argparse
+import sys
+
+from benchmarks.harness import compare_results, load_results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="benchmarks.compare", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline", help="results to compare against, from benchmarks.run")
+    parser.add_argument("current", help="new results, from benchmarks.run")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="how much worse a metric can get before it counts as a regression (default: 0.10, "
+                             "meaning 10%%)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    baseline, current = load_results(args.baseline), load_results(args.current)
+
+    # Numbers from different machines don't say much about the code
+    if baseline["machine"]["platform"] != current["machine"]["platform"] or \
+            baseline["machine"]["processor"] != current["machine"]["processor"]:
+        print("Warning: the results were measured on different machines")
+
+    comparisons = compare_results(baseline, current, threshold=args.threshold)
+    print(f"{'benchmark':<22} {'metric':<24} {'baseline':>12} {'current':>12} {'change':>8}")
+    for c in comparisons:
+        flag = "  REGRESSION" if c["regressed"] else ""
+        print(f"{c['benchmark']:<22} {c['metric']:<24} {c['baseline']:>12.3f} {c['current']:>12.3f} "
+              f"{c['change']:>+8.1%} {c['unit']}{flag}")
+
+    regressions = [c for c in comparisons if c["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} of {len(comparisons)} metrics regressed by more than {args.threshold:.0%}")
+        return 1
+    print(f"No regressions in {len(comparisons)} metrics")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
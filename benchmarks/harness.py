@@ -0,0 +1,172 @@
+"""
+The machinery behind the benchmark suite: a registry of benchmarks, timing helpers, machine info, and reading,
+writing and comparing results.
+
+A benchmark is a function decorated with @benchmark that returns a dict of metrics, each made with metric().
+
+example usage:
+    @benchmark("clock")
+    def clock_benchmark() -> dict:
+        seconds = best_time(lambda: Clock().tick(), repeat=5)
+        return {"tick": metric(seconds * 1e6, "us", better="lower")}
+"""
+
+import json
+import platform
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Union
+
+import numpy as np
+import pygame
+import pymunk
+
+# Every registered benchmark, by name, in the order they were registered
+BENCHMARKS: dict[str, Callable[[], dict]] = dict()
+
+# Results files are only compared if they were written in the same format
+FORMAT_VERSION = 1
+
+
+def benchmark(name: str) -> Callable:
+    """ Registers a function as a benchmark with the given name. """
+
+    def register(function: Callable[[], dict]) -> Callable[[], dict]:
+        if name in BENCHMARKS:
+            raise Exception(f"There is already a benchmark named '{name}'")
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+def metric(value: float, unit: str, better: str = "lower") -> dict:
+    """
+    Makes one measurement of a benchmark.
+
+    :param value: the measured value.
+    :param unit: what the value is measured in, e.g. "ms" or "steps/s".
+    :param better: "lower" if smaller values are better (e.g. times), "higher" if bigger ones are (e.g. throughput).
+    """
+
+    if better not in ("lower", "higher"):
+        raise Exception(f"better must be 'lower' or 'higher', not '{better}'")
+    return {"value": float(value), "unit": unit, "better": better}
+
+
+def best_time(function: Callable, repeat: int = 5, number: int = 1, setup: Callable = None) -> float:
+    """
+    Times a function, returning the fastest of several runs. The fastest run is the one least disturbed by
+    everything else the machine was doing, so it varies the least from one run of the suite to the next.
+
+    :param function: the code to time.
+    :param repeat: how many runs to take the fastest of.
+    :param number: how many times to call the function per run.
+    :param setup: if given, called before each run, untimed.
+    :return: the seconds one call took, in the fastest run.
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def machine_info() -> dict:
+    """ Returns what the benchmarks were run on, since results are only comparable on the same machine. """
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "pymunk": pymunk.version,
+        "numpy": np.__version__,
+        "commit": commit,
+    }
+
+
+def run_benchmarks(names: list[str] = None, verbose: bool = True) -> dict:
+    """
+    Runs benchmarks and collects their results.
+
+    :param names: which benchmarks to run. Default is None, meaning all of them.
+    :param verbose: if True, prints each metric as it is measured.
+    :return: a dict with machine info and, for every benchmark, its metrics.
+    """
+
+    names = list(BENCHMARKS) if names is None else names
+    results = dict()
+    for name in names:
+        if name not in BENCHMARKS:
+            raise Exception(f"No benchmark named '{name}'. Choose from {list(BENCHMARKS)}")
+        start = time.perf_counter()
+        results[name] = BENCHMARKS[name]()
+        if verbose:
+            print(f"{name} ({time.perf_counter() - start:.1f} s)")
+            for metric_name, measured in results[name].items():
+                print(f"    {metric_name:<32} {measured['value']:>12.3f} {measured['unit']}")
+
+    return {"format": FORMAT_VERSION, "machine": machine_info(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results}
+
+
+def save_results(results: dict, path: Union[str, Path]) -> None:
+    """ Writes results from run_benchmarks() to a JSON file. """
+    Path(path).write_text(json.dumps(results, indent=2))
+
+
+def load_results(path: Union[str, Path]) -> dict:
+    """ Reads results written by save_results(). """
+
+    results = json.loads(Path(path).read_text())
+    if results.get("format") != FORMAT_VERSION:
+        raise Exception(f"'{path}' was written in format {results.get('format')}, not {FORMAT_VERSION}")
+    return results
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.10) -> list[dict]:
+    """
+    Compares two sets of results, metric by metric.
+
+    :param baseline: the results to compare against.
+    :param current: the new results.
+    :param threshold: how much worse (as a fraction, e.g. 0.10 for 10%) a metric can get before it counts as a
+    regression.
+    :return: one dict per metric found in both, with its benchmark, name, unit, both values, the relative change
+    (positive means better) and whether it regressed.
+    """
+
+    comparisons = []
+    for name, metrics in current["results"].items():
+        for metric_name, measured in metrics.items():
+            old = baseline["results"].get(name, {}).get(metric_name)
+            if old is None or old["value"] == 0:
+                continue
+
+            change = (measured["value"] - old["value"]) / old["value"]
+            if measured["better"] == "lower":
+                change = -change
+            comparisons.append({
+                "benchmark": name,
+                "metric": metric_name,
+                "unit": measured["unit"],
+                "baseline": old["value"],
+                "current": measured["value"],
+                "change": change,
+                "regressed": change < -threshold,
+            })
+    return comparisons
@@ -0,0 +1,46 @@
+"""
+Runs the benchmark suite without a window and writes the results to a JSON file.
+
+example usage (from the project's root folder):
+    python -m benchmarks.run --output baseline.json
+    python -m benchmarks.run --output results.json level_update level_render
+    python -m benchmarks.compare baseline.json results.json
+"""
+
+import argparse
+
+from scripts import headless
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="benchmarks.run", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", help="the benchmarks to run (default: all of them)")
+    parser.add_argument("--output", "-o", default="benchmark_results.json", help="file to write the results to")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks, without running them")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # No window or sound, but a display to convert images for, like the real game
+    headless.use_dummy_drivers()
+    import pygame
+    pygame.init()
+    pygame.display.set_mode((1280, 720))
+
+    from benchmarks import cases  # noqa: F401 (registers the benchmarks)
+    from benchmarks.harness import BENCHMARKS, run_benchmarks, save_results
+
+    if args.list:
+        for name, function in BENCHMARKS.items():
+            print(f"{name:<24} {function.__doc__.strip()}")
+        return
+
+    results = run_benchmarks(names=args.names or None)
+    save_results(results, args.output)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,38 +1,155 @@
-import pygame
+import argparse
 
-from scripts.scenes.title_scene import TitleScene
-from scripts.scenes.scene_manager import SceneManager
+from scripts.util import startup_profile
 
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Lost in Cyberspace")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print a breakdown of the time spent before the first frame is shown")
+    parser.add_argument("--fps", type=int, default=60,
+                        help="the most frames to draw per second, or 0 for no limit. The game itself always "
+                             "updates 60 times per second, however many frames are drawn")
+    parser.add_argument("--headless", action="store_true",
+                        help="play level one with scripted input, without a window and as fast as possible, "
+                             "then print how fast it ran")
+    parser.add_argument("--seconds", type=float, default=60.0,
+                        help="with --headless, how many seconds of game time to play")
+    parser.add_argument("--level", metavar="FILE",
+                        help="with --headless or --replay, play a compiled level file (e.g. made with "
+                             "scripts/leveldesigner/level_generator.py) instead of level one")
+    parser.add_argument("--component-store", action="store_true",
+                        help="draw enemies and bullets from a NumPy component store, which culls and draws them in "
+                             "bulk (faster with thousands of them on screen)")
+    parser.add_argument("--render", action="store_true",
+                        help="with --headless or --replay, also draw every frame (off screen)")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record the input of the last level played to a file, to be replayed later")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="play back a recording without a window, as fast as possible, and check that it ends "
+                             "the same way it did when it was recorded")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="time every frame, and write the last few hundred to a Chrome trace file on exit "
+                             "(press F3 in game to see the timings)")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    if args.profile_startup:
+        startup_profile.enable()
+
+    # Imported here, rather than at the top, so that --profile-startup can time these imports too
+    import pygame
+
+    from scripts.scenes.title_scene import TitleScene
+    from scripts.scenes.scene_manager import SceneManager
+    from scripts.util import frame_profiler, game_time, input_source
+    startup_profile.mark("modules imported")
+
     # Control for pygame itself
+    if args.headless or args.replay:
+        from scripts import headless
+        headless.use_dummy_drivers()
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Lost in Cyberspace")
     clock = pygame.time.Clock()
     running = True
+    startup_profile.mark("display created")
+
+    if args.trace:
+        frame_profiler.enable()
+    if args.component_store:
+        from scripts.scenes.level_one import LevelOneScene
+        LevelOneScene.USE_COMPONENT_STORE = True
+
+    # Without a window, there is no menu: go straight to running the level
+    if args.replay or args.headless:
+        if args.replay:
+            headless.print_report(headless.replay(args.replay, render=args.render, level=args.level))
+        else:
+            headless.print_report(headless.run(seconds=args.seconds, render=args.render, record=args.record,
+                                               level=args.level))
+        if args.trace:
+            frame_profiler.save_chrome_trace(args.trace)
+        return
+    if args.record:
+        from scripts.util.replay import InputRecorder
+        input_source.use(InputRecorder(input_source.current, args.record))
 
     # Control for this game
     scene_manager = SceneManager(initial_scene=TitleScene())
+    startup_profile.mark("title scene created")
+
+    # Updates run in fixed steps, as many per frame as the time the last frame took calls for. The first frame gets one
+    timestep = game_time.main_timestep
+    frame_time = timestep.step
+
+    # Where the profiler overlay was drawn last frame, if it was
+    overlay: pygame.Rect = None
 
     # Main game loop
-    while running:
-        # Catch the quit event before handing control to a scene
-        if pygame.event.get(eventtype=pygame.QUIT):
-            running = False
-            return
-
-        # Let the current scene do what it needs to do
-        scene_manager.current_scene.handle_events(pygame.event.get())
-        scene_manager.current_scene.update()
-        scene_manager.current_scene.render(screen)
-
-        # Update the screen, wait until it's time for the next frame
-        pygame.display.flip()
-        clock.tick(60)
+    try:
+        while running:
+            # Catch the quit event before handing control to a scene
+            if pygame.event.get(eventtype=pygame.QUIT):
+                running = False
+                return
+
+            # Let the current scene do what it needs to do
+            scene = scene_manager.current_scene
+            frame_profiler.begin_frame()
+            with frame_profiler.section("handle_events"):
+                input_source.advance()
+                events = input_source.get_events()
+                overlay_toggled = any(event.type == pygame.KEYDOWN and event.key == pygame.K_F3 for event in events)
+                if overlay_toggled:
+                    frame_profiler.toggle_overlay()
+                scene_manager.current_scene.handle_events(events)
+            with frame_profiler.section("update"):
+                for _ in range(timestep.advance(frame_time)):
+                    scene_manager.current_scene.update()
+                    # A new scene gets its first step on the next frame, not the rest of this one's
+                    if scene_manager.current_scene is not scene:
+                        break
+            with frame_profiler.section("render"):
+                # The profiler overlay is see-through, so whatever it was drawn over last frame has to be drawn again
+                # first (scenes that only redraw what changed wouldn't otherwise)
+                if overlay is not None:
+                    scene_manager.current_scene.invalidate_area(overlay)
+                    overlay = None
+                scene_manager.current_scene.render(screen)
+                # The profiler overlay goes on top. The whole screen is updated when it appears or disappears
+                dirty_rects = None if overlay_toggled else scene_manager.current_scene.dirty_rects
+                if frame_profiler.main_profiler.overlay_visible:
+                    overlay = frame_profiler.draw_overlay(screen)
+                    dirty_rects = None if dirty_rects is None else dirty_rects + [overlay]
+
+            # Update the screen (only the parts that changed, if the scene says which), wait until it's time for the
+            # next frame
+            with frame_profiler.section("flip"):
+                if dirty_rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(dirty_rects)
+            frame_profiler.end_frame()
+            startup_profile.finish()
+            frame_time = clock.tick(args.fps) / 1000
+
+            # The time spent creating a new scene isn't game time: catching up on it would move everything before the
+            # scene is first drawn. It starts over with one step
+            if scene_manager.current_scene is not scene:
+                timestep.reset()
+                frame_time = timestep.step
+    finally:
+        # Let the input source finish up (e.g. write out a recording), and save the frame timings if asked to
+        input_source.close()
+        if args.trace:
+            frame_profiler.save_chrome_trace(args.trace)
 
 
 if __name__ == '__main__':
@@ -1,11 +1,35 @@
 import pymunk
 
+from scripts.util import game_time
+
 
 class Body(pymunk.Body):
     def __init__(self, obj=None, *args, **kwargs):
         """Subclass of pymunk.Body that allows the body to have a connection back to the entity using this body."""
         super(Body, self).__init__(*args, **kwargs)
         self.obj = obj
+        self._previous_position: pymunk.Vec2d = None
 
     def __getattr__(self, item):
         return self.obj.__getattribute__(item)
+
+    @property
+    def previous_position(self) -> pymunk.Vec2d:
+        """ Where the body was before the latest physics step (see save_position). """
+        return self.position if self._previous_position is None else self._previous_position
+
+    def save_position(self) -> None:
+        """ Remembers the body's current position as its previous one. Call right before each physics step. """
+        self._previous_position = self.position
+
+    @property
+    def render_position(self) -> pymunk.Vec2d:
+        """
+        Where to draw the body: part of the way from its previous position to its current one, depending on how far
+        the frame being drawn is between the last two physics steps (see game_time.FixedTimestep).
+        """
+
+        alpha = game_time.main_timestep.alpha
+        if alpha >= 1 or self._previous_position is None:
+            return self.position
+        return self._previous_position.interpolate_to(self.position, alpha)
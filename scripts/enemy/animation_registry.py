@@ -0,0 +1,112 @@
+from pathlib import Path
+
+import pygame
+
+from scripts.util import assets
+from scripts.util.image_utils import mirror
+
+
+class AnimationRegistry:
+    def __init__(self, root: Path = Path("assets/enemy")):
+        """
+        Loads each enemy animation exactly once and shares it between every enemy that uses it.
+
+        Animations are keyed by enemy type and size. The frames handed out are tuples, and the surfaces in them are
+        shared, so nobody should draw onto them.
+
+        :param root: folder containing one sub-folder of frames per enemy type.
+        """
+
+        self.root: Path = root
+        self._animations: dict[tuple[str, tuple], tuple[pygame.Surface, ...]] = dict()
+        self._mirrored: dict[tuple[str, tuple], tuple[tuple[pygame.Surface, pygame.Surface], ...]] = dict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, enemy_type: str, size: tuple) -> tuple[pygame.Surface, ...]:
+        """
+        Returns the frames of an enemy type's animation at a given size, loading them from disk only the first time.
+
+        :param enemy_type: name of the folder (under the root folder) that holds the frames.
+        :param size: a (width, height) tuple the frames are scaled to.
+        :return: a tuple of frames, in file name order.
+        """
+
+        key = (enemy_type, tuple(size))
+        if key in self._animations:
+            self.hits += 1
+            return self._animations[key]
+
+        self.misses += 1
+        return self._load(key)
+
+    def get_mirrored(self, enemy_type: str, size: tuple) -> tuple[tuple[pygame.Surface, pygame.Surface], ...]:
+        """
+        Same as get(), but every frame comes paired with a horizontally flipped copy of itself.
+
+        :return: a tuple of (right-facing, left-facing) frame pairs, in file name order.
+        """
+
+        key = (enemy_type, tuple(size))
+        if key in self._mirrored:
+            self.hits += 1
+            return self._mirrored[key]
+
+        self.misses += 1
+        self._mirrored[key] = tuple(mirror(self._load(key)))
+        return self._mirrored[key]
+
+    def _load(self, key: tuple[str, tuple]) -> tuple[pygame.Surface, ...]:
+        """
+        Returns the frames for an (enemy type, size) key, loading them if needed. Unlike get(), this doesn't count as
+        a lookup, so each call to get() or get_mirrored() is counted exactly once.
+        """
+
+        if key in self._animations:
+            return self._animations[key]
+
+        enemy_type, size = key
+        frames = []
+        for frame in sorted((self.root / enemy_type).iterdir()):
+            # Load the frame
+            img: pygame.Surface = assets.load_image(frame)
+            # Scale it
+            img = pygame.transform.scale(img, size)
+            frames.append(img)
+
+        if not frames:
+            raise Exception(f"No animation frames found for enemy type '{enemy_type}' in {self.root}")
+
+        self._animations[key] = tuple(frames)
+        return self._animations[key]
+
+    @property
+    def resident_bytes(self) -> int:
+        """ How many bytes of pixel data are currently held by the registry. """
+        frames = [frame for frames in self._animations.values() for frame in frames]
+        frames += [flipped for pairs in self._mirrored.values() for _, flipped in pairs]
+        return sum(frame.get_pitch() * frame.get_height() for frame in frames)
+
+    def stats(self) -> dict[str, int]:
+        """ Returns hit/miss counts, how many animations are loaded, and how much memory they use. """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "animations": len(self._animations) + len(self._mirrored),
+            "resident_bytes": self.resident_bytes,
+        }
+
+    def clear(self) -> None:
+        """ Forgets every loaded animation and resets the counters. """
+        self._animations.clear()
+        self._mirrored.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Convenience bindings to make using this class/module easier
+registry = AnimationRegistry()
+get = registry.get
+get_mirrored = registry.get_mirrored
+stats = registry.stats
+clear = registry.clear
@@ -1,24 +1,27 @@
 import random
-from collections import defaultdict
 from datetime import timedelta
-from pathlib import Path
 
 import pygame
 import pymunk
 
 from scripts import body, collision_types
+from scripts.enemy import animation_registry
+from scripts.leveldesigner.walkable_spans import WalkableSpans
 from scripts.ui.healthbar import Healthbar
 from scripts.util import game_time
 
 
 class BasicEnemy:
-    def __init__(self, enemy_type: str, rect: pygame.rect.Rect, world: pymunk.Space):
+    def __init__(self, enemy_type: str, rect: pygame.rect.Rect, world: pymunk.Space,
+                 walkable: WalkableSpans = None):
         """
         Creates a basic enemy at a certain position that patrols on a platform.
 
         :param enemy_type: denotes what image/animations to use for this enemy.
         :param rect: denotes the location and size of the enemy
         :param world: A pymunk Space, to which the enemy will be added and will interact with other objects
+        :param walkable: the level's walkable spans, used to know when to turn around while patrolling. If None, the
+        enemy looks at its physics contacts instead, which is much slower.
         """
 
         # Save the world. Needed for spawning bullets
@@ -27,7 +30,7 @@ class BasicEnemy:
         # Enemy visuals
         enemy_types = ["frog", "slime", "scorpion"]
         self.enemy_type = enemy_type if enemy_type in enemy_types else random.choice(enemy_types)
-        self.animations: dict[str, list] = self.load_animations(size=(rect.w, rect.h))
+        self.animations: dict[str, tuple] = self.load_animations(enemy_type=self.enemy_type, size=(rect.w, rect.h))
         self.current_animation_frame = [self.enemy_type, 0]
         game_time.schedule(self.update_animation, 0.1, repeating=True)
 
@@ -46,17 +49,59 @@ class BasicEnemy:
         self.enabled: bool = True
         self.speed: float = 50.0
         self.direction = pymunk.Vec2d(-1, 0)
-        self.healthbar = Healthbar()
+        self.healthbar = Healthbar(hide_when_full=True)
         self._is_grounded: bool = True
         self._can_turn: bool = True
         self._can_turn_timeout: float = timedelta(milliseconds=100).total_seconds()
 
+        # Patrolling
+        self.walkable: WalkableSpans = walkable
+        self._half_width: float = rect.w / 2
+        # Down to the bottom of the hitbox, including its rounded edge
+        self._half_height: float = rect.h / 2 + self.shape.radius
+        self._surface_speed: float = None
+
     def __str__(self):
         health_percent = round(self.healthbar.health / self.healthbar.maximum_health * 100, 2)
         return f"BasicEnemy({self.body.position=}, {self.body.velocity=}, " \
                f"health={self.healthbar.health}/{self.healthbar.maximum_health} ({health_percent}%))"
 
     def update(self) -> None:
+        # Enemies made without a walkable span index find platform edges from their physics contacts instead
+        if self.walkable is None:
+            self._update_from_contacts()
+            return
+
+        # Find the stretch of ground underneath, if any
+        x, y = self.body.position
+        span = self.walkable.span_under(x, y - self._half_height)
+        self._is_grounded = span is not None
+
+        # Move forward if the enemy is grounded on something (to the right if facing right, and vice versa)
+        surface_speed = 0.0
+        if self._is_grounded:
+            surface_speed = -self.speed if self.direction.x > 0 else self.speed
+        if surface_speed != self._surface_speed:
+            self._surface_speed = surface_speed
+            self.shape.surface_velocity = (surface_speed, 0)
+
+        # Turn around if reached either end of the ground it's on
+        if self._can_turn and span is not None:
+            if self.direction.x < 0 and x - self._half_width < span[0] or \
+                    self.direction.x > 0 and x + self._half_width > span[1]:
+                self._turn()
+
+    def _turn(self) -> None:
+        """ Turns the enemy around, and disables turning for some time. """
+        self.direction *= -1
+        self.body.velocity = (0, 0)
+        self._can_turn = False
+        game_time.schedule(self._enable_turn, self._can_turn_timeout)
+
+    def _enable_turn(self) -> None:
+        self._can_turn = True
+
+    def _update_from_contacts(self) -> None:
         def check_if_grounded(arbiter: pymunk.Arbiter):
             if arbiter.normal.y == -1:
                 self._is_grounded = True
@@ -66,6 +111,7 @@ class BasicEnemy:
         self.body.each_arbiter(check_if_grounded)
 
         # Move forward if the enemy is grounded on something
+        self._surface_speed = None
         self.shape.surface_velocity = (0, 0)
         if self._is_grounded:
             # Move to the right
@@ -91,16 +137,8 @@ class BasicEnemy:
                     at_edge = True
                     break
 
-            if at_edge:
-                # Turn and disable turning for some time
-                self.direction *= -1
-                self.body.velocity = (0, 0)
-                self._can_turn = False
-
-                def enable_turn():
-                    self._can_turn = True
-
-                game_time.schedule(enable_turn, self._can_turn_timeout)
+            if at_edge and self._can_turn:
+                self._turn()
 
         # Turn around if reached the edge of current platform
         if self._can_turn:
@@ -119,10 +157,15 @@ class BasicEnemy:
     def w(self) -> float:
         return self.shape.bb.right - self.shape.bb.left
 
+    @property
+    def facing_left(self) -> bool:
+        return self.direction.x < 0
+
     @property
     def image(self):
-        image: pygame.Surface = self.animations[self.current_animation_frame[0]][self.current_animation_frame[1]]
-        return pygame.transform.flip(image, self.direction.x < 0, False)
+        # Each frame is a (right-facing, left-facing) pair
+        frames = self.animations[self.current_animation_frame[0]][self.current_animation_frame[1]]
+        return frames[self.facing_left]
 
     def update_animation(self):
         """ Advances the current animation to the next frame, looping back to the beginning if necessary. """
@@ -138,34 +181,21 @@ class BasicEnemy:
 
         # Adjust for pygame screen and camera location
         on_screen_destination = self.image.get_rect()
-        on_screen_destination.center = (self.body.position.x, screen.get_height() - self.body.position.y)
+        position = self.body.render_position
+        on_screen_destination.center = (position.x, screen.get_height() - position.y)
         on_screen_destination.move_ip(camera_offset)
 
         # Draw image
         screen.blit(self.image, dest=on_screen_destination)
-        # Draw healthbar
-        screen.blit(self.healthbar.render(int(self.w)), dest=on_screen_destination.move(0, -12))
+        # Draw healthbar, once the enemy has taken damage
+        if not self.healthbar.hidden:
+            screen.blit(self.healthbar.render(int(self.w)), dest=on_screen_destination.move(0, -12))
 
         # Draw hitbox
         if show_bounding_box:
             pygame.draw.rect(surface=screen, color=(255, 0, 0), rect=on_screen_destination, width=1)
 
     @staticmethod
-    def load_animations(size: tuple) -> dict[str, list]:
-        # Create container for animations
-        animations: dict[str, list] = defaultdict(lambda: list())
-        # Start at content root for this enemy type
-        root_animations_dir = Path(f"assets/enemy")
-
-        # Iterate through animation types
-        for enemy_type_dir in root_animations_dir.iterdir():
-            # Iterate through contents of animation type folder
-            for frame in enemy_type_dir.iterdir():
-                # Load the frame
-                img: pygame.Surface = pygame.image.load(frame).convert_alpha()
-                # Scale it
-                img = pygame.transform.scale(img, size)
-                # Add it to big animation dictionary
-                animations[enemy_type_dir.name].append(img)
-
-        return animations
+    def load_animations(enemy_type: str, size: tuple) -> dict[str, tuple]:
+        # Frames are shared by every enemy of the same type and size, so they are only loaded once
+        return {enemy_type: animation_registry.get_mirrored(enemy_type, size)}
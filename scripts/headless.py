@@ -0,0 +1,162 @@
+"""
+Runs level one without a window and without waiting between frames, so it can be tested or benchmarked as fast as
+the CPU allows.
+
+The keyboard is replaced by a ScriptedInput, and rendering is optional (frames are drawn to the dummy display's
+surface, which is never shown). The level is loaded exactly as the game loads it, from the same manifest and assets,
+so the timings are representative of the real thing.
+
+Runs can also be recorded, and recordings replayed, in which case the state the level ends in is checked against
+the recording's (see scripts/util/replay.py).
+
+example usage:
+    python main.py --headless --seconds 60 --render
+    python main.py --headless --record session.rec
+    python main.py --replay session.rec
+    python main.py --headless --level big.lvl
+"""
+
+import os
+import time
+
+import pygame
+
+from scripts.scenes.level_one import LevelOneScene
+from scripts.scenes.scene_manager import SceneManager
+from scripts.util import frame_profiler, game_time, input_source
+from scripts.util.asset_loader import AssetLoader
+from scripts.util.input_source import InputSource, ScriptedInput
+from scripts.util.replay import InputRecorder, InputReplay, Recording, state_checksum
+
+# Walks right, jumping and shooting every so often, then turns back for a bit. Loops forever
+DEFAULT_SCRIPT: list[tuple] = [
+    (45, [pygame.K_d]),
+    (1, [pygame.K_d], [pygame.K_w]),
+    (30, [pygame.K_d]),
+    (1, [pygame.K_d], [pygame.K_SPACE]),
+    (60, [pygame.K_d]),
+    (1, [], [pygame.K_w, pygame.K_SPACE]),
+    (40, [pygame.K_a]),
+    (20, []),
+]
+
+
+def use_dummy_drivers() -> None:
+    """ Makes SDL open no window and play no sound. Must be called before pygame.init(). """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+def run(seconds: float = 60.0, render: bool = False, script: list[tuple] = None, source: InputSource = None,
+        seed: int = None, record: str = None, level=None, component_store: bool = None) -> dict:
+    """
+    Plays level one for a number of simulated seconds, one fixed timestep after another with no waiting in between.
+    Stops early if the level ends (e.g. the player dies).
+
+    The display must already have been created with pygame.display.set_mode(), since images are converted for it.
+
+    :param seconds: how much game time to simulate.
+    :param render: if True, every step is also drawn to the display surface (without flipping it).
+    :param script: the input to play, see ScriptedInput. Defaults to DEFAULT_SCRIPT.
+    :param source: if given, the input to play instead of a script.
+    :param seed: the random seed to build the level with. Default is None, meaning a new one is picked.
+    :param record: if given, the path of a file to record the run to.
+    :param level: if given, the layout to play instead of level one's, as anything LevelDesigner accepts.
+    :param component_store: whether to keep enemies and bullets in a ComponentStore. Default is None, meaning
+    LevelOneScene.USE_COMPONENT_STORE decides.
+    :return: a dict with the number of steps run, simulated and real seconds, the simulation speed (simulated seconds
+    per real second), how long loading took (overall, and for assets as reported by AssetLoader), how much merging
+    the terrain's collision shapes saved, and the seed and checksum of the level's final state.
+    """
+
+    screen = pygame.display.get_surface()
+    if screen is None:
+        raise Exception("The display must be created before running headless")
+
+    if source is None:
+        source = ScriptedInput(DEFAULT_SCRIPT if script is None else script)
+    if record is not None:
+        source = InputRecorder(source, record)
+    previous_source = input_source.use(source)
+    try:
+        # Load the level the same way the game does
+        load_start = time.perf_counter()
+        loader = AssetLoader(LevelOneScene.manifest())
+        loader.wait()
+        scene = LevelOneScene(seed=seed, level=level, component_store=component_store)
+        scene_manager = SceneManager(initial_scene=scene)
+        load_time = time.perf_counter() - load_start
+
+        # Run it, for as long as it is the current scene
+        total_steps = round(seconds / game_time.FIXED_TIMESTEP)
+        steps = 0
+        start = time.perf_counter()
+        while steps < total_steps and scene_manager.current_scene is scene:
+            frame_profiler.begin_frame()
+            with frame_profiler.section("handle_events"):
+                input_source.advance()
+                scene.handle_events(input_source.get_events())
+            with frame_profiler.section("update"):
+                scene.update()
+            if render:
+                with frame_profiler.section("render"):
+                    scene.render(screen)
+            frame_profiler.end_frame()
+            steps += 1
+        wall_time = time.perf_counter() - start
+        source.close()
+    finally:
+        input_source.use(previous_source)
+
+    simulated_time = steps * game_time.FIXED_TIMESTEP
+    return {
+        "steps": steps,
+        "simulated_seconds": simulated_time,
+        "wall_seconds": wall_time,
+        "speed": simulated_time / wall_time if wall_time > 0 else float("inf"),
+        "load_seconds": load_time,
+        "assets": loader.report(),
+        "terrain": scene.level_designer.terrain_report,
+        "rendered": render,
+        "finished": scene_manager.current_scene is scene,
+        "seed": scene.seed,
+        "checksum": state_checksum(scene),
+    }
+
+
+def replay(path: str, render: bool = False, level=None, component_store: bool = None) -> dict:
+    """
+    Plays back a recording made with run(record=...) or with main.py --record, one recorded step per update.
+
+    :param path: the recording's file.
+    :param render: if True, every step is also drawn to the display surface (without flipping it).
+    :param level: the layout the recording was made on, if it wasn't level one's.
+    :param component_store: whether to keep enemies and bullets in a ComponentStore, see run().
+    :return: the same as run(), plus the checksum the recording expects the level to end with.
+    """
+
+    recording = Recording.load(path)
+    result = run(seconds=len(recording) * game_time.FIXED_TIMESTEP, render=render, source=InputReplay(recording),
+                 seed=recording.seed, level=level, component_store=component_store)
+    result["expected_checksum"] = recording.checksum
+    return result
+
+
+def print_report(result: dict) -> None:
+    """ Prints the result of run() in a readable form. """
+
+    ending = "" if result["finished"] else " (the level ended early)"
+    print(f"Loaded level in {result['load_seconds'] * 1000:.0f} ms (terrain collision: {result['terrain']})")
+    assets = result["assets"]
+    print(f"Assets: {assets['files']} files in {assets['wall_seconds'] * 1000:.0f} ms, "
+          f"{assets['decode_seconds'] * 1000:.0f} ms spent decoding (summed over every thread)")
+    print(f"Simulated {result['simulated_seconds']:.2f} s ({result['steps']} steps"
+          f"{', rendered' if result['rendered'] else ''}) in {result['wall_seconds']:.2f} s{ending}")
+    print(f"Speed: {result['speed']:.1f} simulated seconds per second "
+          f"({result['steps'] / max(result['wall_seconds'], 1e-9):.0f} steps per second)")
+    print(f"Seed: {result['seed']}, final state checksum: {result['checksum']}")
+    if "expected_checksum" in result:
+        if result["checksum"] == result["expected_checksum"]:
+            print("Replay matches the recording")
+        else:
+            print(f"Replay does NOT match the recording, which ended with checksum {result['expected_checksum']}")
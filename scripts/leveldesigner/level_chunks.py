@@ -0,0 +1,168 @@
+import pygame
+import pymunk
+
+from scripts.enemy.basic_enemy import BasicEnemy
+from scripts.leveldesigner import terrain_compiler
+from scripts.leveldesigner.walkable_spans import WalkableSpans
+from scripts.util import game_time
+
+
+class LevelChunks:
+    def __init__(self, world: pymunk.Space, cols: int, tile_size: int, chunk_columns: int = 16, margin: float = 640,
+                 walkable: WalkableSpans = None):
+        """
+        Splits a level into chunks of columns, and only keeps the platforms and enemies of the chunks near the camera
+        in the physics world. Everything else waits outside it, so loading a level and stepping its physics cost
+        depend on how much of it is around the camera rather than on how big it is.
+
+        Platforms are created when the first chunk they overlap becomes active, and removed when the last one stops
+        being active. Enemies are created the first time their chunk becomes active. When a chunk stops being active,
+        the enemies standing in it are taken out of the world as they are (position, velocity, health, direction), and
+        put back when it becomes active again. Enemies that walk out of the active chunks are put to sleep the same way,
+        in the chunk they walked into.
+
+        example usage:
+            chunks = LevelChunks(world=world, cols=level_designer.cols, tile_size=64)
+            chunks.add_platform(rect)
+            chunks.add_enemy(rect)
+            chunks.update(view_left=camera_x, view_right=camera_x + 1280)   # every step
+
+        :param world: the pymunk Space that active platforms and enemies are added to.
+        :param cols: how many columns the level has.
+        :param tile_size: width and height of one tile, in pixels.
+        :param chunk_columns: how many columns each chunk holds.
+        :param margin: how far (in pixels) beyond either side of the view chunks are still kept active, so that
+        platforms and enemies are in place before they come into view.
+        :param walkable: the level's walkable spans, which enemies patrol along.
+        """
+
+        if chunk_columns < 1:
+            raise Exception(f"Chunks must hold at least one column, not {chunk_columns}")
+
+        self.world: pymunk.Space = world
+        self.tile_size: int = tile_size
+        self.chunk_columns: int = chunk_columns
+        self.chunk_width: int = chunk_columns * tile_size
+        self.chunk_count: int = max(-(-cols // chunk_columns), 1)
+        self.margin: float = margin
+        self.walkable: WalkableSpans = walkable
+
+        # Enemies that are in the world. Enemies that die are removed from this by whoever kills them
+        self.enemies: list[BasicEnemy] = []
+        # Terrain collision shapes that are in the world, all attached to its static body
+        self.platforms: dict[int, pymunk.Poly] = dict()
+        # If set, a ComponentStore that active enemies are kept in
+        self.store = None
+        # Every enemy created so far, in the order they were created
+        self._created: list[BasicEnemy] = []
+
+        # What belongs to each chunk: the platforms overlapping it (by index into _platform_rects), the enemies not
+        # created yet, and the enemies asleep in it
+        self._platform_rects: list[pygame.Rect] = []
+        self._platform_chunks: list[range] = []
+        self._platform_refs: list[int] = []
+        self._chunk_platforms: list[list[int]] = [[] for _ in range(self.chunk_count)]
+        self._pending: list[list[pygame.Rect]] = [[] for _ in range(self.chunk_count)]
+        self._sleeping: list[list[BasicEnemy]] = [[] for _ in range(self.chunk_count)]
+
+        # Chunks in the world, as a range of chunk indices
+        self.active: range = range(0)
+
+    def __len__(self):
+        return self.chunk_count
+
+    def chunk_at(self, x: float) -> int:
+        """ Returns the index of the chunk a world x coordinate is in, clamped to the level. """
+        return min(max(int(x // self.chunk_width), 0), self.chunk_count - 1)
+
+    def add_platform(self, rect: pygame.Rect) -> None:
+        """ Adds a box of terrain, in world coordinates, to every chunk it overlaps. """
+
+        chunks = range(self.chunk_at(rect.left), self.chunk_at(rect.right - 1) + 1)
+        index = len(self._platform_rects)
+        self._platform_rects.append(rect)
+        self._platform_chunks.append(chunks)
+        self._platform_refs.append(0)
+        for chunk in chunks:
+            self._chunk_platforms[chunk].append(index)
+
+    def add_enemy(self, rect: pygame.Rect) -> None:
+        """ Adds an enemy, in world coordinates, to the chunk its center is in. It is created once that is active. """
+        self._pending[self.chunk_at(rect.centerx)].append(rect)
+
+    def all_enemies(self):
+        """ Yields every living enemy created so far, active or asleep, in the order they were created. """
+        return (enemy for enemy in self._created if enemy.enabled)
+
+    def pending_count(self) -> int:
+        """ Returns how many enemies have not been created yet, because their chunk has never been active. """
+        return sum(len(pending) for pending in self._pending)
+
+    def update(self, view_left: float, view_right: float) -> None:
+        """
+        Makes the chunks within the margin of the view active, and every other chunk inactive.
+
+        :param view_left: the world x coordinate of the left edge of the view.
+        :param view_right: the world x coordinate of the right edge of the view.
+        """
+
+        active = range(self.chunk_at(view_left - self.margin), self.chunk_at(view_right + self.margin) + 1)
+        if active != self.active:
+            for chunk in self.active:
+                if chunk not in active:
+                    self._deactivate(chunk)
+            previous, self.active = self.active, active
+            for chunk in active:
+                if chunk not in previous:
+                    self._activate(chunk)
+
+        # Enemies that wandered off into an inactive chunk go to sleep there
+        for enemy in [enemy for enemy in self.enemies if self.chunk_at(enemy.body.position.x) not in self.active]:
+            self._sleep(enemy, self.chunk_at(enemy.body.position.x))
+
+    def _activate(self, chunk: int) -> None:
+        for index in self._chunk_platforms[chunk]:
+            self._platform_refs[index] += 1
+            if self._platform_refs[index] == 1:
+                self.platforms[index] = terrain_compiler.add_shape(self.world, self._platform_rects[index])
+
+        for rect in self._pending[chunk]:
+            enemy = BasicEnemy(enemy_type='', rect=rect, world=self.world, walkable=self.walkable)
+            self.enemies.append(enemy)
+            self._created.append(enemy)
+            if self.store is not None:
+                self.store.add(enemy, frames=enemy.animations[enemy.enemy_type], healthbar=enemy.healthbar)
+        self._pending[chunk] = []
+
+        for enemy in self._sleeping[chunk]:
+            self._wake(enemy)
+        self._sleeping[chunk] = []
+
+    def _deactivate(self, chunk: int) -> None:
+        for index in self._chunk_platforms[chunk]:
+            self._platform_refs[index] -= 1
+            if self._platform_refs[index] == 0:
+                self.world.remove(self.platforms.pop(index))
+
+        for enemy in [enemy for enemy in self.enemies if self.chunk_at(enemy.body.position.x) == chunk]:
+            self._sleep(enemy, chunk)
+
+    def _sleep(self, enemy: BasicEnemy, chunk: int) -> None:
+        """ Takes an enemy out of the world, as it is, until a chunk becomes active. """
+
+        self.enemies.remove(enemy)
+        self.world.remove(enemy.body, enemy.shape)
+        game_time.unschedule(enemy.update_animation)
+        if self.store is not None:
+            self.store.remove(enemy)
+        self._sleeping[chunk].append(enemy)
+
+    def _wake(self, enemy: BasicEnemy) -> None:
+        """ Puts a sleeping enemy back into the world, where it left it. """
+
+        self.world.add(enemy.body, enemy.shape)
+        enemy.body.save_position()
+        game_time.schedule(enemy.update_animation, 0.1, repeating=True)
+        self.enemies.append(enemy)
+        if self.store is not None:
+            self.store.add(enemy, frames=enemy.animations[enemy.enemy_type], healthbar=enemy.healthbar)
@@ -0,0 +1,207 @@
+"""
+Compiles the level layouts in level_data.xlsx into small binary files that load without pandas or openpyxl.
+
+Each compiled level is a single file laid out as:
+    header      magic, format version, number of tile codes, rows, cols, source digest, grid checksum
+    code table  one length-prefixed utf-8 string per tile code ("a", "b", "e", ...)
+    grid        rows * cols uint8 indices into the code table, row by row
+
+The grid is memory-mapped at runtime, so loading a level costs a single array read no matter its size.
+
+Run this after editing level_data.xlsx:
+    python -m scripts.leveldesigner.level_compiler
+"""
+
+import argparse
+import hashlib
+import struct
+import zlib
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+LEVEL_SOURCE = Path("scripts/leveldesigner/level_data.xlsx")
+COMPILED_DIR = Path("scripts/leveldesigner/compiled")
+
+# Bump this whenever the layout of a compiled file changes
+FORMAT_VERSION = 1
+
+_MAGIC = b"TLVL"
+_HEADER = struct.Struct("<4sHHII20sI")
+
+
+class CompiledLevel(NamedTuple):
+    grid: np.ndarray  # 2D uint8 array of indices into codes
+    codes: list[str]  # tile code for each index used in the grid
+    source_digest: bytes  # sha1 of the file the level was compiled from
+
+
+def compiled_path(level: int) -> Path:
+    """ Where the compiled file for a level number lives. """
+    return COMPILED_DIR / f"level{level}.lvl"
+
+
+def source_digest(path: Path = LEVEL_SOURCE) -> bytes:
+    """ Returns the sha1 of a source file, or 20 zero bytes if it does not exist. """
+    if not path.exists():
+        return bytes(20)
+    return hashlib.sha1(path.read_bytes()).digest()
+
+
+def compile_grid(rows: list[list[str]], digest: bytes = bytes(20)) -> CompiledLevel:
+    """
+    Turns rows of tile code strings into a compact uint8 grid plus a table of codes.
+
+    Ragged rows are padded with empty tiles so the grid is rectangular.
+
+    :param rows: a list of rows, each a list of tile codes.
+    :param digest: the source digest to record alongside the grid.
+    :return: a CompiledLevel.
+    """
+
+    codes: list[str] = []
+    code_ids: dict[str, int] = dict()
+    cols = max((len(row) for row in rows), default=0)
+    grid = np.zeros((len(rows), cols), dtype=np.uint8)
+
+    for y, row in enumerate(rows):
+        for x, tile in enumerate(list(row) + [""] * (cols - len(row))):
+            if tile not in code_ids:
+                if len(codes) > np.iinfo(np.uint8).max:
+                    raise Exception("Levels cannot use more than 256 different tile codes.")
+                code_ids[tile] = len(codes)
+                codes.append(tile)
+            grid[y, x] = code_ids[tile]
+
+    return CompiledLevel(grid=grid, codes=codes, source_digest=digest)
+
+
+def write_level(path: Path, level: CompiledLevel) -> None:
+    """ Writes a compiled level to disk in the format described at the top of this module. """
+
+    grid = np.ascontiguousarray(level.grid, dtype=np.uint8)
+    code_table = b"".join(struct.pack("<B", len(code.encode())) + code.encode() for code in level.codes)
+    header = _HEADER.pack(_MAGIC, FORMAT_VERSION, len(level.codes), grid.shape[0], grid.shape[1],
+                          level.source_digest, zlib.crc32(grid))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(header + code_table + grid.tobytes())
+
+
+def read_level(path: Path) -> CompiledLevel:
+    """
+    Reads a compiled level, memory-mapping its grid.
+
+    :param path: path of the compiled file.
+    :return: a CompiledLevel whose grid is a read-only memory map.
+    """
+
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise Exception(f"{path} is not a compiled level (or was compiled by another version).")
+        magic, version, code_count, rows, cols, digest, checksum = _HEADER.unpack(header)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            raise Exception(f"{path} is not a compiled level (or was compiled by another version).")
+
+        codes = []
+        for _ in range(code_count):
+            length = f.read(1)
+            code = f.read(length[0]) if length else None
+            if code is None or len(code) != length[0]:
+                raise Exception(f"{path} is corrupt (truncated code table). Recompile the levels.")
+            codes.append(code.decode())
+        offset = f.tell()
+
+    # A truncated or padded file would otherwise fail to map, or map the wrong bytes
+    if path.stat().st_size - offset != rows * cols:
+        raise Exception(f"{path} is corrupt (wrong size). Recompile the levels.")
+
+    grid = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=(rows, cols))
+    if zlib.crc32(grid) != checksum:
+        raise Exception(f"{path} is corrupt (checksum mismatch). Recompile the levels.")
+
+    return CompiledLevel(grid=grid, codes=codes, source_digest=digest)
+
+
+def read_sheets(path: Path = LEVEL_SOURCE) -> dict[str, list[list[str]]]:
+    """
+    Reads every sheet of the level spreadsheet as rows of tile code strings. Empty cells become "".
+
+    openpyxl is imported here so that only compiling needs it, never loading.
+    """
+
+    import openpyxl
+
+    def as_code(value) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        return {sheet.title: [[as_code(value) for value in row] for row in sheet.iter_rows(values_only=True)]
+                for sheet in workbook.worksheets}
+    finally:
+        workbook.close()
+
+
+def compile_levels(source: Path = LEVEL_SOURCE, out_dir: Path = COMPILED_DIR) -> list[Path]:
+    """
+    Compiles every "level<N>_data" sheet in the spreadsheet to out_dir/level<N>.lvl.
+
+    :return: the paths written.
+    """
+
+    digest = source_digest(source)
+    written = []
+    for title, rows in read_sheets(source).items():
+        if not (title.startswith("level") and title.endswith("_data")):
+            continue
+        path = out_dir / f"{title[:-len('_data')]}.lvl"
+        write_level(path, compile_grid(rows, digest=digest))
+        written.append(path)
+    return written
+
+
+def load_level(level: int) -> CompiledLevel:
+    """
+    Loads a level, preferring its compiled file.
+
+    If the compiled file is missing or older than the spreadsheet, the level is compiled in memory instead
+    (nothing is written). Run this module to bring the compiled files up to date.
+
+    :param level: the level number.
+    :return: a CompiledLevel.
+    """
+
+    path = compiled_path(level)
+    if path.exists():
+        compiled = read_level(path)
+        if not LEVEL_SOURCE.exists() or compiled.source_digest == source_digest(LEVEL_SOURCE):
+            return compiled
+
+    # Quietly: the game still works, only slower to start (see the --profile-startup report)
+    sheets = read_sheets(LEVEL_SOURCE)
+    if f"level{level}_data" not in sheets:
+        raise Exception(f"No sheet named 'level{level}_data' in {LEVEL_SOURCE}")
+    return compile_grid(sheets[f"level{level}_data"], digest=source_digest(LEVEL_SOURCE))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="compile-levels", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", type=Path, default=LEVEL_SOURCE, help="spreadsheet to compile")
+    parser.add_argument("--out-dir", type=Path, default=COMPILED_DIR, help="folder to write compiled levels to")
+    args = parser.parse_args()
+
+    from scripts.leveldesigner import terrain_compiler
+
+    for compiled_file in compile_levels(source=args.source, out_dir=args.out_dir):
+        level_data = read_level(compiled_file)
+        print(f"{compiled_file}: {level_data.grid.shape[0]} rows x {level_data.grid.shape[1]} cols, "
+              f"tile codes {level_data.codes}")
+        solid = terrain_compiler.solid_mask(level_data.grid, level_data.codes)
+        print(f"    terrain collision: {terrain_compiler.report(level_data.grid, solid)}")
@@ -1,54 +1,71 @@
-import csv
 from pathlib import Path
+from typing import Union
 
-import pandas as pd
+import numpy as np
 import pygame
 import pymunk
 
 from scripts.enemy.basic_enemy import BasicEnemy
+from scripts.leveldesigner import level_compiler, terrain_compiler
+from scripts.leveldesigner.level_chunks import LevelChunks
+from scripts.leveldesigner.terrain_cache import TerrainChunkCache
+from scripts.leveldesigner.walkable_spans import WalkableSpans
 from scripts.scenes.exit import Exit
-from scripts.scenes.simple_platform import Platform
+from scripts.util import assets
 
 
 class LevelDesigner:
-    def __init__(self, world: pymunk.Space, level: int = 1):
+    def __init__(self, world: pymunk.Space, level: Union[int, str, Path, level_compiler.CompiledLevel, list] = 1,
+                 chunk_columns: int = None, activation_margin: float = 640):
         """
-        Collects data from csv files to display objects and obstacles in the level.
-
-        :param level: Current level csv file to display.
+        Collects data from compiled level files to display objects and obstacles in the level.
+
+        :param world: a pymunk Space to which the level will be added.
+        :param level: Current level number to display. Can also be the path of a compiled level file, a
+        CompiledLevel (e.g. from level_generator.py), or rows of tile codes.
+        :param chunk_columns: if given, the level is split into chunks this many columns wide, and platforms and
+        enemies are only added to the world once chunks.update() makes their chunk active (see LevelChunks).
+        Default is None, meaning everything is added to the world right away.
+        :param activation_margin: when streaming chunks, how far beyond the view (in pixels) they are kept active.
         """
 
         self.level = level
         self.world = world
 
-        # Level layout File resources
-        self.level_file_xlsx = pd.read_excel(Path("scripts/leveldesigner/level_data.xlsx"),
-                                             sheet_name=f"level{self.level}_data", header=None)
-        self.level_file_xlsx.to_csv(f"scripts/leveldesigner/level{self.level}_data.csv", index=False,
-                                    header=False)
-        self.level_file_csv = Path(f"scripts/leveldesigner/level{self.level}_data.csv")
+        # Level layout, from the compiled level file (see level_compiler.py)
+        if isinstance(level, level_compiler.CompiledLevel):
+            compiled_level = level
+        elif isinstance(level, (str, Path)):
+            compiled_level = level_compiler.read_level(Path(level))
+        elif isinstance(level, int):
+            compiled_level = level_compiler.load_level(level)
+        else:
+            compiled_level = level_compiler.compile_grid(level)
+        self.tiles: np.ndarray = compiled_level.grid
+        self.tile_codes: list[str] = compiled_level.codes
 
         # Level layout initialization
-        self.rows: int = len(pd.read_csv(self.level_file_csv).axes[0]) + 1
-        self.cols: int = len(pd.read_csv(self.level_file_csv).axes[1])
+        self.rows, self.cols = self.tiles.shape
         self.tile_size: int = 64
-        self.level_data: list = [[-1] * self.cols for row in range(self.rows)]
+        self.level_data: list = np.array(self.tile_codes, dtype=object)[self.tiles].tolist()
         self.max_y = self.tile_size * len(self.level_data)
         self.max_x = self.tile_size * len(self.level_data[0])
 
         # Preparing ground assets
-        self.top_ground_img: pygame.Surface = pygame.image.load(
-            Path("assets/platforms/Textures-16.png")).convert_alpha().subsurface((32, 0, 16, 16))
+        self.top_ground_img: pygame.Surface = assets.load_image(
+            Path("assets/platforms/Textures-16.png")).subsurface((32, 0, 16, 16))
         self.top_ground_img = pygame.transform.scale(self.top_ground_img, (self.tile_size, self.tile_size))
 
-        self.ground_img: pygame.Surface = pygame.image.load(
-            Path("assets/platforms/Textures-16.png")).convert_alpha().subsurface((32, 16, 16, 16))
+        self.ground_img: pygame.Surface = assets.load_image(
+            Path("assets/platforms/Textures-16.png")).subsurface((32, 16, 16, 16))
         self.ground_img = pygame.transform.scale(self.ground_img, (self.tile_size, self.tile_size))
 
-        # Completed entities
-        self.platforms: list = []
+        # Completed entities. Platforms are the terrain's collision shapes. When streaming chunks, they are kept by
+        # the chunks instead, and enemies only holds the ones in the world
+        self.platforms: list[pymunk.Poly] = []
         self.enemies: list = []
         self.exit: Exit = None
+        self.terrain_report: terrain_compiler.TerrainReport = None
 
         # Enter new letter for each image in sprite sheet
         # Compared to assets/platforms directory.
@@ -57,81 +74,52 @@ class LevelDesigner:
             "b": self.top_ground_img
         }
 
-        with open(self.level_file_csv, newline="") as csvfile:
-            reader = csv.reader(csvfile, delimiter=',')
-            for i, row in enumerate(reader):
-                for j, tile in enumerate(row):
-                    self.level_data[i][j] = tile
+        # Stretches of ground that enemies patrol along
+        self.walkable = WalkableSpans(level_data=self.level_data, solid_tiles=self.tilesheet.keys(),
+                                      tile_size=self.tile_size)
+
+        # Terrain is drawn from pre-rendered chunks, rather than by each platform
+        self.terrain = TerrainChunkCache(level_data=self.level_data, tilesheet=self.tilesheet,
+                                         tile_size=self.tile_size)
+
+        # Chunks of the level that are added to the world only as they come near, if streaming
+        self.chunks: LevelChunks = None
+        if chunk_columns is not None:
+            self.chunks = LevelChunks(world=self.world, cols=self.cols, tile_size=self.tile_size,
+                                      chunk_columns=chunk_columns, margin=activation_margin, walkable=self.walkable)
+            self.enemies = self.chunks.enemies
 
         self.build_level()
 
     def build_level(self):
         """
-        Calculates x and y position of platform from level data file.
-        Processes data to calculate platform length and tile type.
-        Creates all the platforms needed in the game of correct tile type and length.
-        """
-
-        for y, row in enumerate(self.level_data):
-            platform_length = 1
-            for x, tile in enumerate(row):
-                # If the current tile is some sort of ground block
-                if tile in self.tilesheet.keys():
-                    if x + 1 < len(row):
-                        # If the next tile is the same, extend length
-                        if self.level_data[y][x] == self.level_data[y][x + 1]:
-                            platform_length += 1
-                        # Otherwise, create a platform of recorded length so far
-                        else:
-                            self.make_platform(tile, platform_length, x - (platform_length - 1), y, self.world)
-                            platform_length = 1
-                    # Otherwise, create platform here if no next tile exists
-                    else:
-                        self.make_platform(tile, platform_length, x - (platform_length - 1), y, self.world)
-
-                # Otherwise, if the current tile is some sort of ground block
-                elif tile == 'e':
-                    self.enemies.append(BasicEnemy(
-                        enemy_type='',
-                        rect=pygame.Rect(x * self.tile_size, (len(self.level_data) - y) * self.tile_size, 48, 48),
-                        world=self.world
-                    ))
-
-                elif tile == 'p':
-                    self.exit = Exit(
-                        rect=pygame.Rect(x * self.tile_size, (len(self.level_data) - y) * self.tile_size, 128, 128),
-                        world=self.world
-                    )
-
-    def make_platform(self, tile_type: str, pl: int, x: int, y: int, world: pymunk.Space):
-        """
-        Creates a platform derived from the simple_platform class from the data
-        generated in the level data file.
-
-        NOTE: THIS VERSION WORKS AND I AM NOT FIXING IT IF IT BREAKS. - JARED
+        Creates the level's terrain collision, enemies and exit from the level data.
 
-        :param tile_type: Tile string from tile sheet to display
-        :param pl: Platform length to make rect hit box
-        :param x: Position of platform along the x-axis
-        :param y: Position of platform along the y-axis
-        :param world: a pymunk Space to which platforms will be added
+        Solid tiles of any kind are merged into as few boxes as possible, all attached to the world's static body (see
+        terrain_compiler.py). How many shapes and bodies that saves is kept in terrain_report.
         """
 
-        if tile_type in self.tilesheet:
-            # Create new surface of correct dimensions
-            new_surface = pygame.Surface((self.tilesheet[tile_type].get_width() * pl,
-                                          self.tilesheet[tile_type].get_height()))
-            # Create a sequence of images to display on new surface
-            seq = [(self.tilesheet[tile_type], (self.tilesheet[tile_type].get_width() * offset, 0))
-                   for offset in range(pl)]
-            # Blit sequence to new surface
-            new_surface.blits(blit_sequence=seq)
-
-            # Compute rect of the platform in standard x/y grid (not pygame's inverted y-axis)
-            rect = pygame.Rect(x * self.tilesheet[tile_type].get_width(),
-                               self.tile_size * len(self.level_data) - y * self.tilesheet[tile_type].get_height(),
-                               new_surface.get_width(),
-                               new_surface.get_height())
-
-            # Add new surface to platforms and create new platform with new surface image
-            self.platforms.append(Platform(rect=rect, image=new_surface, world=world))
+        # Terrain collision. Only hitboxes are added to the terrain cache; it draws the tiles themselves
+        solid = terrain_compiler.solid_mask(self.tiles, self.tile_codes, solid_tiles=self.tilesheet.keys())
+        rects = terrain_compiler.merge_rectangles(solid)
+        self.terrain_report = terrain_compiler.report(self.tiles, solid, rects)
+        for col, row, width, height in rects:
+            rect = terrain_compiler.tile_rect((col, row, width, height), tile_size=self.tile_size, rows=self.rows)
+            if self.chunks is not None:
+                self.chunks.add_platform(rect)
+            else:
+                self.platforms.append(terrain_compiler.add_shape(self.world, rect))
+            self.terrain.add_hitbox(pygame.Rect(col * self.tile_size, row * self.tile_size, rect.w, rect.h))
+
+        # Enemies and the exit, row by row
+        for y, x in zip(*np.nonzero(np.isin(self.tiles, [self.tile_codes.index(code) for code in ("e", "p")
+                                                          if code in self.tile_codes]))):
+            rect = pygame.Rect(x * self.tile_size, (self.rows - y) * self.tile_size, 48, 48)
+            if self.level_data[y][x] == 'e':
+                if self.chunks is not None:
+                    self.chunks.add_enemy(rect)
+                else:
+                    self.enemies.append(BasicEnemy(enemy_type='', rect=rect, world=self.world,
+                                                   walkable=self.walkable))
+            else:
+                self.exit = Exit(rect=pygame.Rect(rect.topleft, (128, 128)), world=self.world)
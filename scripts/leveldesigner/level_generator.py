@@ -0,0 +1,126 @@
+"""
+Generates random levels in the compiled format LevelDesigner loads, so it and the level scene can be tried on levels
+far bigger than the hand-made ones (say 10,000 columns with thousands of enemies).
+
+A generated level is laid out like level one: walls down both sides, a floor along the bottom, rows of floating
+platforms three tiles apart (so the player can jump from one to the next), enemies standing on top of the platforms,
+and the exit at the far right. The same parameters and seed always produce the same level.
+
+example usage:
+    python -m scripts.leveldesigner.level_generator big.lvl --width 10000 --enemies 2000 --seed 0
+    python main.py --headless --level big.lvl
+
+    level = generate_level(width=10000, enemies=2000, seed=0)
+    level_designer = LevelDesigner(world=pymunk.Space(), level=level)
+"""
+
+import argparse
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+from scripts.leveldesigner import level_compiler, terrain_compiler
+from scripts.leveldesigner.level_compiler import CompiledLevel
+
+# Tile codes a generated level uses, in the order of its code table
+CODES: list[str] = ["z", "a", "b", "e", "p"]
+EMPTY, GROUND, TOP_GROUND, ENEMY, EXIT = range(len(CODES))
+
+# Rows between one row of platforms and the next, and columns at each end kept free for the player and the exit
+PLATFORM_SPACING = 3
+CLEAR_COLUMNS = 5
+
+
+def generate_grid(width: int = 1000, height: int = 20, density: float = 0.3, run_length: tuple[int, int] = (2, 8),
+                  enemies: int = 100, seed: int = None) -> np.ndarray:
+    """
+    Generates a random level layout.
+
+    :param width: number of columns. Must be at least 2 * CLEAR_COLUMNS + 2.
+    :param height: number of rows. Must be at least 8.
+    :param density: the fraction of each platform row covered by platforms, between 0 and 1.
+    :param run_length: the shortest and longest a platform can be, in tiles. Lengths are picked uniformly in between.
+    :param enemies: how many enemies to put on top of platforms (never on the floor).
+    :param seed: the random seed. Default is None, meaning a new one is picked.
+    :return: a 2D uint8 array of indices into CODES.
+    """
+
+    if width < 2 * CLEAR_COLUMNS + 2 or height < 8:
+        raise Exception(f"Levels must be at least {2 * CLEAR_COLUMNS + 2} columns wide and 8 rows high, "
+                        f"not {width} x {height}")
+    if not 0 < density < 1:
+        raise Exception(f"density must be between 0 and 1, not {density}")
+    shortest, longest = run_length
+    if not 1 <= shortest <= longest:
+        raise Exception(f"run_length must be a (shortest, longest) pair with 1 <= shortest <= longest, "
+                        f"not {run_length}")
+
+    rng = np.random.default_rng(seed)
+    grid = np.full((height, width), EMPTY, dtype=np.uint8)
+
+    # Walls on both sides, and a floor with a top layer of grass
+    grid[:, 0] = grid[:, -1] = GROUND
+    grid[-1, :] = GROUND
+    grid[-2, 1:-1] = TOP_GROUND
+
+    # Rows of platforms, alternating runs of platform and gaps. Gaps are sized so that, on average, the requested
+    # fraction of the row ends up covered
+    mean_run = (shortest + longest) / 2
+    mean_gap = mean_run * (1 - density) / density
+    floor = height - 2
+    for y in range(floor - PLATFORM_SPACING, 1, -PLATFORM_SPACING):
+        x = CLEAR_COLUMNS + int(rng.integers(0, max(round(mean_gap), 1) + 1))
+        while x < width - CLEAR_COLUMNS:
+            length = int(rng.integers(shortest, longest + 1))
+            grid[y, x:min(x + length, width - CLEAR_COLUMNS)] = TOP_GROUND
+            x += length + 1 + int(rng.integers(0, max(round(2 * mean_gap) - 2, 0) + 1))
+
+    # Enemies stand on empty tiles directly above a platform, away from where the player starts
+    above = (grid[1:floor - 1] == EMPTY) & (grid[2:floor] == TOP_GROUND)
+    above[:, :CLEAR_COLUMNS] = False
+    rows, cols = np.nonzero(above)
+    if enemies > len(rows):
+        raise Exception(f"There is only room for {len(rows)} enemies on the platforms, not {enemies}. "
+                        f"Make the level bigger or denser")
+    chosen = rng.choice(len(rows), size=enemies, replace=False)
+    grid[rows[chosen] + 1, cols[chosen]] = ENEMY
+
+    # The exit stands on the floor, in the free columns at the right end. Its tile is its bottom-left corner
+    grid[floor - 1, width - CLEAR_COLUMNS + 1] = EXIT
+
+    return grid
+
+
+def generate_level(width: int = 1000, height: int = 20, density: float = 0.3, run_length: tuple[int, int] = (2, 8),
+                   enemies: int = 100, seed: int = None) -> CompiledLevel:
+    """
+    Generates a random level, ready for LevelDesigner or level_compiler.write_level(). Takes the same parameters as
+    generate_grid(). The level's source digest is a hash of them, so two files made the same way can be recognized.
+    """
+
+    grid = generate_grid(width=width, height=height, density=density, run_length=run_length, enemies=enemies,
+                         seed=seed)
+    parameters = f"{width},{height},{density},{tuple(run_length)},{enemies},{seed}"
+    return CompiledLevel(grid=grid, codes=list(CODES), source_digest=hashlib.sha1(parameters.encode()).digest())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="generate-level", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("out", type=Path, help="file to write the compiled level to")
+    parser.add_argument("--width", type=int, default=1000, help="number of columns")
+    parser.add_argument("--height", type=int, default=20, help="number of rows")
+    parser.add_argument("--density", type=float, default=0.3, help="fraction of each platform row covered")
+    parser.add_argument("--run-length", type=int, nargs=2, default=(2, 8), metavar=("SHORTEST", "LONGEST"),
+                        help="range of platform lengths, in tiles")
+    parser.add_argument("--enemies", type=int, default=100, help="number of enemies")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    args = parser.parse_args()
+
+    level_data = generate_level(width=args.width, height=args.height, density=args.density,
+                                run_length=tuple(args.run_length), enemies=args.enemies, seed=args.seed)
+    level_compiler.write_level(args.out, level_data)
+    print(f"{args.out}: {level_data.grid.shape[0]} rows x {level_data.grid.shape[1]} cols, "
+          f"{int(np.count_nonzero(level_data.grid == ENEMY))} enemies")
+    solid = terrain_compiler.solid_mask(level_data.grid, level_data.codes)
+    print(f"    terrain collision: {terrain_compiler.report(level_data.grid, solid)}")
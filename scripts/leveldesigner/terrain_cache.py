@@ -0,0 +1,121 @@
+import math
+from collections import OrderedDict
+
+import pygame
+
+
+class TerrainChunkCache:
+    def __init__(self, level_data: list[list[str]], tilesheet: dict[str, pygame.Surface], tile_size: int,
+                 chunk_size: int = 512, max_chunks: int = 48):
+        """
+        Draws a level's static terrain from pre-rendered square chunks, instead of from every platform separately.
+
+        Positions here are in "level pixels": x grows to the right and y grows downwards from the top-left corner
+        of the level's tile grid, so tile (column, row) starts at (column * tile_size, row * tile_size).
+
+        Which chunks contain any terrain is worked out up front. Chunk images are only rendered the first time they
+        come on screen, and the least recently drawn ones are thrown away once more than max_chunks exist.
+
+        :param level_data: rows of tile codes, as in LevelDesigner.level_data.
+        :param tilesheet: image for each tile code that counts as terrain.
+        :param tile_size: width and height of one tile, in pixels.
+        :param chunk_size: width and height of one chunk, in pixels.
+        :param max_chunks: how many rendered chunks to keep at most.
+        """
+
+        self.level_data = level_data
+        self.tilesheet = tilesheet
+        self.tile_size = tile_size
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.rows = len(level_data)
+
+        # Which chunks have any terrain in them at all, and the hitboxes overlapping each one
+        self._tiles_per_chunk = math.ceil(chunk_size / tile_size)
+        self.occupied: set[tuple[int, int]] = set()
+        for row, tiles in enumerate(level_data):
+            for col, tile in enumerate(tiles):
+                if tile in tilesheet:
+                    self.occupied.add((col * tile_size // chunk_size, row * tile_size // chunk_size))
+        self._hitboxes: dict[tuple[int, int], list[pygame.Rect]] = dict()
+
+        # Rendered chunks, least recently drawn first
+        self._chunks: OrderedDict[tuple[int, int], pygame.Surface] = OrderedDict()
+        self.chunks_built: int = 0
+
+    def add_hitbox(self, rect: pygame.Rect) -> None:
+        """ Remembers a terrain hitbox (in level pixels) so it can be outlined when bounding boxes are shown. """
+        for cx in range(rect.left // self.chunk_size, (rect.right - 1) // self.chunk_size + 1):
+            for cy in range(rect.top // self.chunk_size, (rect.bottom - 1) // self.chunk_size + 1):
+                self._hitboxes.setdefault((cx, cy), []).append(rect)
+
+    def _build_chunk(self, cx: int, cy: int) -> pygame.Surface:
+        """ Renders every terrain tile overlapping a chunk onto a new transparent surface. """
+
+        chunk = pygame.Surface((self.chunk_size, self.chunk_size), pygame.SRCALPHA)
+        first_col = cx * self.chunk_size // self.tile_size
+        first_row = cy * self.chunk_size // self.tile_size
+        seq = []
+        for row in range(first_row, min(first_row + self._tiles_per_chunk + 1, self.rows)):
+            tiles = self.level_data[row]
+            for col in range(first_col, min(first_col + self._tiles_per_chunk + 1, len(tiles))):
+                if tiles[col] in self.tilesheet:
+                    seq.append((self.tilesheet[tiles[col]], (col * self.tile_size - cx * self.chunk_size,
+                                                             row * self.tile_size - cy * self.chunk_size)))
+        chunk.blits(blit_sequence=seq, doreturn=False)
+        self.chunks_built += 1
+        return chunk
+
+    def _get_chunk(self, key: tuple[int, int]) -> pygame.Surface:
+        """ Returns a chunk's image, rendering it if needed, and marks it as the most recently used. """
+
+        if key in self._chunks:
+            self._chunks.move_to_end(key)
+            return self._chunks[key]
+
+        self._chunks[key] = self._build_chunk(*key)
+        while len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+        return self._chunks[key]
+
+    def draw(self, screen: pygame.Surface, camera_offset: pygame.math.Vector2 = None,
+             show_bounding_box: bool = False):
+        """
+        Draws the terrain that is on screen.
+
+        :param screen: the Surface to draw onto.
+        :param camera_offset: the same (negated) camera offset given to every other draw() method.
+        :param show_bounding_box: if True, terrain hitboxes are outlined too.
+        """
+
+        if camera_offset is None:
+            camera_offset = pygame.math.Vector2(0, 0)
+
+        # Screen position of the level's top-left corner. Other objects put world y = 0 at the bottom of the screen,
+        # and the top of the tile grid sits at world y = (rows + 1) * tile_size
+        origin_x = int(camera_offset.x)
+        origin_y = int(screen.get_height() - (self.rows + 1) * self.tile_size + camera_offset.y)
+
+        # Range of chunks that overlap the screen
+        first_cx = -origin_x // self.chunk_size
+        last_cx = (screen.get_width() - origin_x - 1) // self.chunk_size
+        first_cy = -origin_y // self.chunk_size
+        last_cy = (screen.get_height() - origin_y - 1) // self.chunk_size
+
+        for cx in range(first_cx, last_cx + 1):
+            for cy in range(first_cy, last_cy + 1):
+                if (cx, cy) not in self.occupied:
+                    continue
+                screen.blit(self._get_chunk((cx, cy)),
+                            (origin_x + cx * self.chunk_size, origin_y + cy * self.chunk_size))
+
+                # Draw hitboxes, clipped to this chunk so boxes spanning several chunks are drawn only once per pixel
+                if show_bounding_box:
+                    clip = pygame.Rect(origin_x + cx * self.chunk_size, origin_y + cy * self.chunk_size,
+                                       self.chunk_size, self.chunk_size)
+                    old_clip = screen.get_clip()
+                    screen.set_clip(clip.clip(old_clip))
+                    for rect in self._hitboxes.get((cx, cy), ()):
+                        pygame.draw.rect(surface=screen, color=(255, 0, 0), rect=rect.move(origin_x, origin_y),
+                                         width=1)
+                    screen.set_clip(old_clip)
@@ -0,0 +1,136 @@
+"""
+Compiles a level's solid tiles into as few collision shapes as possible.
+
+Every solid tile, whatever its code, collides the same way, so the grid of solid tiles is covered with rectangles:
+each one grown as far right as it can go, then as far down as the whole width allows. A wall of stacked tiles, or a
+floor two tiles thick, becomes a single box. Every box is attached to the space's static body rather than getting a
+body of its own. Fewer shapes means a cheaper broadphase and fewer arbiters in every physics step.
+
+This only concerns collision. The tiles are still drawn one by one, from the level data (see TerrainChunkCache).
+
+example usage:
+    rects = merge_rectangles(solid_mask(tiles, codes))
+    shapes = [add_shape(world, tile_rect(rect, tile_size, rows)) for rect in rects]
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pygame
+import pymunk
+
+from scripts import collision_types
+
+# Tile codes that are solid ground (the ones LevelDesigner has images for)
+SOLID_TILES: tuple[str, ...] = ("a", "b")
+
+
+class TerrainReport(NamedTuple):
+    bodies_before: int  # bodies when every horizontal run of the same tile was its own platform
+    shapes_before: int  # shapes, likewise
+    bodies_after: int  # bodies with merged rectangles: only the space's static body
+    shapes_after: int  # merged rectangles
+
+    def __str__(self):
+        return f"{self.shapes_before} shapes on {self.bodies_before} bodies -> " \
+               f"{self.shapes_after} shapes on {self.bodies_after} body"
+
+
+def solid_mask(tiles: np.ndarray, codes: list[str], solid_tiles=SOLID_TILES) -> np.ndarray:
+    """
+    Returns which tiles of a level are solid.
+
+    :param tiles: a 2D array of indices into codes, as in LevelDesigner.tiles.
+    :param codes: the tile code for each index.
+    :param solid_tiles: the tile codes that are solid.
+    :return: a 2D bool array.
+    """
+    return np.isin(tiles, [i for i, code in enumerate(codes) if code in solid_tiles])
+
+
+def merge_rectangles(solid: np.ndarray) -> list[tuple[int, int, int, int]]:
+    """
+    Greedily covers the solid tiles of a grid with rectangles that don't overlap. Going row by row, each run of solid
+    tiles that aren't covered yet starts a rectangle, which grows down while the whole row underneath is solid and
+    uncovered too.
+
+    :param solid: a 2D array, True wherever a tile is solid.
+    :return: one (column, row, width, height) tuple per rectangle, in tiles.
+    """
+
+    remaining = np.array(solid, dtype=bool)
+    rows, cols = remaining.shape
+    rects = []
+    for row in range(rows):
+        # Rectangles only ever grow downwards, so this row's uncovered runs are known by now. Find where each starts
+        # and ends
+        edges = np.flatnonzero(np.diff(remaining[row].astype(np.int8), prepend=0, append=0))
+        for col, end in zip(edges[::2], edges[1::2]):
+            # Grow down as far as the whole width allows
+            height = 1
+            while row + height < rows and remaining[row + height, col:end].all():
+                height += 1
+
+            remaining[row:row + height, col:end] = False
+            rects.append((int(col), row, int(end - col), height))
+    return rects
+
+
+def count_runs(tiles: np.ndarray, solid: np.ndarray) -> int:
+    """
+    Counts the horizontal runs of the same solid tile code in each row, i.e. how many platforms the level had when
+    each run got its own.
+
+    :param tiles: a 2D array of tile code indices, as in LevelDesigner.tiles.
+    :param solid: a 2D array, True wherever a tile is solid.
+    """
+
+    # A run starts at every solid tile that doesn't continue the same solid tile to its left
+    starts = solid.copy()
+    starts[:, 1:] &= ~(solid[:, :-1] & (tiles[:, 1:] == tiles[:, :-1]))
+    return int(np.count_nonzero(starts))
+
+
+def report(tiles: np.ndarray, solid: np.ndarray, rects: list = None) -> TerrainReport:
+    """
+    Compares the collision shapes and bodies of separate platforms with those of merged rectangles.
+
+    :param tiles: a 2D array of tile code indices, as in LevelDesigner.tiles.
+    :param solid: a 2D array, True wherever a tile is solid.
+    :param rects: the merged rectangles, if already worked out.
+    """
+
+    runs = count_runs(tiles, solid)
+    rects = merge_rectangles(solid) if rects is None else rects
+    return TerrainReport(bodies_before=runs, shapes_before=runs, bodies_after=1, shapes_after=len(rects))
+
+
+def tile_rect(rect: tuple[int, int, int, int], tile_size: int, rows: int) -> pygame.Rect:
+    """
+    Converts a (column, row, width, height) rectangle of tiles to world coordinates, where y grows upwards. As with
+    platforms, the Rect's top is its lowest world y.
+
+    :param rect: the rectangle, in tiles.
+    :param tile_size: width and height of one tile, in pixels.
+    :param rows: how many rows the level has.
+    """
+
+    col, row, width, height = rect
+    return pygame.Rect(col * tile_size, (rows - row - height + 1) * tile_size, width * tile_size, height * tile_size)
+
+
+def add_shape(world: pymunk.Space, rect: pygame.Rect) -> pymunk.Poly:
+    """
+    Adds a solid box of terrain to the world, attached to its static body.
+
+    :param world: the pymunk Space to add it to.
+    :param rect: where the box is, in world coordinates.
+    :return: the shape added.
+    """
+
+    shape = pymunk.Poly(world.static_body, [rect.topleft, rect.topright, rect.bottomright, rect.bottomleft], radius=1)
+    shape.collision_type = collision_types.TERRAIN
+    shape.elasticity = 0.1
+    shape.friction = 0.9
+    world.add(shape)
+    return shape
@@ -0,0 +1,64 @@
+class WalkableSpans:
+    def __init__(self, level_data: list[list[str]], solid_tiles, tile_size: int, tolerance: float = 3):
+        """
+        An index of every stretch of ground that can be walked along: runs of solid tiles in a row with nothing solid
+        directly on top of them. A run ends at a gap (a ledge) or where a solid tile sits on top of the row (a wall).
+
+        Enemies use this to patrol: they find the stretch they stand on in constant time, and turn around when they
+        reach either end of it.
+
+        :param level_data: rows of tile codes, as in LevelDesigner.level_data.
+        :param solid_tiles: the tile codes that are solid ground.
+        :param tile_size: width and height of one tile, in pixels.
+        :param tolerance: how far (in pixels) something's feet can be from the top of a stretch and still count as
+        standing on it. Shapes have rounded edges and sink in slightly, so this shouldn't be 0.
+        """
+
+        solid_tiles = set(solid_tiles)
+        self.tile_size: int = tile_size
+        self.rows: int = len(level_data)
+        self.cols: int = len(level_data[0]) if level_data else 0
+        self.tolerance: float = tolerance
+
+        # Every stretch as (left x, right x, top y) in world coordinates, and the stretch each tile belongs to
+        self.spans: list[tuple[int, int, int]] = []
+        self._span_at: list[list[tuple[int, int, int]]] = []
+        for y, row in enumerate(level_data):
+            span_row = [None] * len(row)
+            start = None
+            for x in range(len(row) + 1):
+                # A tile can be walked on if it is solid and the one above it isn't. One past the end never can
+                walkable = x < len(row) and row[x] in solid_tiles
+                if walkable and y > 0:
+                    walkable = level_data[y - 1][x] not in solid_tiles
+                if walkable and start is None:
+                    start = x
+                elif not walkable and start is not None:
+                    # Tile row y occupies world y from tile_size * (rows - y) up to tile_size * (rows - y + 1)
+                    span = (start * tile_size, x * tile_size, (self.rows - y + 1) * tile_size)
+                    self.spans.append(span)
+                    span_row[start:x] = [span] * (x - start)
+                    start = None
+            self._span_at.append(span_row)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def span_under(self, x: float, feet_y: float):
+        """
+        Returns the stretch of ground something is standing on.
+
+        :param x: the world x coordinate of its center.
+        :param feet_y: the world y coordinate of its lowest point.
+        :return: a (left x, right x, top y) tuple, or None if it is not standing on any.
+        """
+
+        row = self.rows + 1 - round(feet_y / self.tile_size)
+        col = int(x // self.tile_size)
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return None
+
+        span = self._span_at[row][col]
+        if span is None or abs(feet_y - span[2]) > self.tolerance:
+            return None
+        return span
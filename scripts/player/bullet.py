@@ -2,62 +2,94 @@ import pygame
 import pymunk
 
 from scripts import body, collision_types
-from scripts.util.image_utils import auto_crop
+from scripts.util import assets
+from scripts.util.image_utils import auto_crop, mirror
 
 
 class Bullet:
-    def __init__(self, location: pymunk.Vec2d, direction: pymunk.Vec2d, damage: int, world: pymunk.Space):
+    # (right-facing, left-facing) images shared by every bullet, made when the first bullet is created
+    _images: tuple[pygame.Surface, pygame.Surface] = None
+
+    def __init__(self, world: pymunk.Space, pool: "BulletPool" = None):
         """
-        Creates a bullet that spawns in a particular location and travels in a particular direction.
+        Creates a bullet, which does nothing until it is fired with spawn().
 
-        :param location: A tuple containing the starting x and y coordinates of the center of the bullet.
-        :param direction: A Vector2 indicating at what angle the bullet should travel.
+        The bullet's physics body and shape are made once and kept, so the same bullet can be fired again
+        after it despawns.
+
+        :param world: A pymunk Space, to which the bullet is added while it is flying.
+        :param pool: The BulletPool this bullet belongs to, if any. It is told when the bullet despawns.
         """
 
         super().__init__()
 
         # Save the world. Needed for spawning bullets
         self.world: pymunk.Space = world
+        self.pool: BulletPool = pool
 
-        # Create physics body for platform and position it
+        # Create physics body for bullet
         self.body = body.Body(body_type=pymunk.Body.KINEMATIC, obj=self)
-        self.body.position = location
 
         # Create physics shape/hitbox
         self.shape = pymunk.Poly.create_box(body=self.body, size=(100, 50), radius=1)
         self.shape.collision_type = collision_types.BULLET
+        # Bullets pass through each other, so pymunk doesn't need to check pairs of bullets for collisions at all
+        self.shape.filter = pymunk.ShapeFilter(categories=1 << collision_types.BULLET,
+                                               mask=pymunk.ShapeFilter.ALL_MASKS() ^ (1 << collision_types.BULLET))
 
         # Graphics assets
-        self._image: pygame.Surface = pygame.image.load("assets/bullet/bullet.png").convert_alpha()
-        # Automatically crop and scale them to just the occupied pixel portion
-        self._image: pygame.Surface = auto_crop(images=[self._image], size=(100, 50))[0]
-
-        # Behavioral attributes
-        self.body.velocity = tuple(direction.normalized() * 1250)
+        if Bullet._images is None:
+            image: pygame.Surface = assets.load_image("assets/bullet/bullet.png")
+            # Automatically crop and scale them to just the occupied pixel portion
+            image: pygame.Surface = auto_crop(images=[image], size=(100, 50))[0]
+            Bullet._images = mirror([image])[0]
 
         # Other attributes
-        self.damage: int = damage
-        self.enabled: bool = True
-
-        # Add to world
-        self.world.add(self.body, self.shape)
+        self.damage: int = 0
+        self.enabled: bool = False
 
     def __str__(self):
         return f"Bullet({self.body.position=}, {self.body.velocity=}, {self.damage=})"
 
+    def spawn(self, location: pymunk.Vec2d, direction: pymunk.Vec2d, damage: int):
+        """
+        Fires the bullet from a particular location in a particular direction.
+
+        :param location: A tuple containing the starting x and y coordinates of the center of the bullet.
+        :param direction: A Vector2 indicating at what angle the bullet should travel.
+        :param damage: How much damage the bullet deals to whatever it hits.
+        """
+
+        # Position and behavioral attributes
+        self.body.position = location
+        # Don't draw it sliding over from wherever it was last fired from
+        self.body.save_position()
+        self.body.velocity = tuple(direction.normalized() * 1250)
+        self.damage = damage
+        self.enabled = True
+
+        # Add to world
+        self.world.add(self.body, self.shape)
+
     # should a bullet disappear going off-screen?
     # technically it still physically exists, allowing us to shoot off-screen enemies or obstacles...
     def update(self, right_bound, left_bound):
-        if not (left_bound <= self.body.position.x <= right_bound):
-            self.world.remove(self.body, self.shape)
+        if self.enabled and not (left_bound <= self.body.position.x <= right_bound):
+            self.despawn()
+
+    @property
+    def facing_left(self) -> bool:
+        return self.body.velocity.x < 0
 
     @property
     def image(self):
-        return pygame.transform.flip(self._image, self.body.velocity.x < 0, False)
+        return self._images[self.facing_left]
 
     def despawn(self):
         self.enabled = False
         self.world.remove(self.body, self.shape)
+        if self.pool is not None:
+            self.pool.release(self)
 
     def draw(self, screen: pygame.Surface, camera_offset: pygame.math.Vector2 = None, show_bounding_box: bool = False):
         # Update hitbox based on camera offset
@@ -66,7 +98,8 @@ class Bullet:
 
         # Adjust for pygame screen and camera location
         on_screen_destination = self.image.get_rect()
-        on_screen_destination.center = (self.body.position.x, screen.get_height() - self.body.position.y)
+        position = self.body.render_position
+        on_screen_destination.center = (position.x, screen.get_height() - position.y)
         on_screen_destination.move_ip(camera_offset)
 
         # Draw image
@@ -75,3 +108,77 @@ class Bullet:
         # Draw hitbox
         if show_bounding_box:
             pygame.draw.rect(surface=screen, color=(255, 0, 0), rect=on_screen_destination, width=1)
+
+
+class BulletPool:
+    def __init__(self, world: pymunk.Space, size: int = 8):
+        """
+        Keeps a supply of bullets to fire, so shooting never has to create a new one.
+
+        Bullets are created up front. A fired bullet is added to the world, and when it despawns it is removed
+        from the world and returned to the pool to be fired again. If every bullet is in flight, the pool grows.
+
+        example usage:
+            pool = BulletPool(world)
+            pool.acquire(location, direction, damage=50)
+            for bullet in pool.active:
+                bullet.draw(screen)
+
+        :param world: A pymunk Space, to which bullets are added while they are flying.
+        :param size: How many bullets to create up front.
+        """
+
+        self.world: pymunk.Space = world
+
+        # Bullets in flight, and bullets ready to be fired
+        self.active: list[Bullet] = []
+        self.free: list[Bullet] = [Bullet(world=world, pool=self) for _ in range(size)]
+
+        # If set, bullets in flight are also kept in this ComponentStore (see LevelOneScene.USE_COMPONENT_STORE)
+        self.store = None
+
+        # Statistics
+        self.allocated: int = size
+        self.high_water_mark: int = 0
+
+    def __len__(self):
+        return self.allocated
+
+    def acquire(self, location: pymunk.Vec2d, direction: pymunk.Vec2d, damage: int) -> Bullet:
+        """
+        Fires a bullet from the pool, creating a new one only if all of them are already in flight.
+
+        :param location: A tuple containing the starting x and y coordinates of the center of the bullet.
+        :param direction: A Vector2 indicating at what angle the bullet should travel.
+        :param damage: How much damage the bullet deals to whatever it hits.
+        :return: the fired bullet.
+        """
+
+        if self.free:
+            bullet = self.free.pop()
+        else:
+            bullet = Bullet(world=self.world, pool=self)
+            self.allocated += 1
+
+        bullet.spawn(location=location, direction=direction, damage=damage)
+        self.active.append(bullet)
+        if self.store is not None:
+            self.store.add(bullet, frames=(Bullet._images,), faces_velocity=True)
+        self.high_water_mark = max(self.high_water_mark, len(self.active))
+        return bullet
+
+    def release(self, bullet: Bullet) -> None:
+        """ Returns a despawned bullet to the pool. Called by Bullet.despawn(). """
+        self.active.remove(bullet)
+        self.free.append(bullet)
+        if self.store is not None:
+            self.store.remove(bullet)
+
+    def stats(self) -> dict[str, int]:
+        """ Returns how many bullets exist, how many are in flight or ready, and the most ever in flight at once. """
+        return {
+            "allocated": self.allocated,
+            "active": len(self.active),
+            "free": len(self.free),
+            "high_water_mark": self.high_water_mark,
+        }
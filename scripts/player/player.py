@@ -5,11 +5,11 @@ import pygame.mask
 import pymunk
 
 from scripts import body, collision_types
-from scripts.player.bullet import Bullet
+from scripts.player.bullet import BulletPool
 from scripts.player.sword import Sword
 from scripts.ui.healthbar import Healthbar
-from scripts.util import coloring, game_time
-from scripts.util.image_utils import auto_crop
+from scripts.util import assets, bake_cache, coloring, game_time, input_source
+from scripts.util.image_utils import auto_crop, mirror
 from scripts.util.sound import *
 
 
@@ -59,7 +59,9 @@ class Player:
             #     "hair": (39, 22, 19)
             # }
         }
-        self.animations: dict[str, list] = self.load_animations(size=(rect.w, rect.h))
+        # Every frame is stored as a (right-facing, left-facing) pair, so turning around never flips an image
+        self.animations: dict[str, list] = {name: mirror(frames)
+                                            for name, frames in self.load_animations(size=(rect.w, rect.h)).items()}
         self.direction = pymunk.Vec2d(1, 0)
 
         # Create physics body with (infinite moment of inertia to disable rotation)
@@ -115,7 +117,9 @@ class Player:
         self.is_sprinting: bool = False
         self.current_animation_frame = ["idle", 0]
 
-        self.bullets: list = []
+        # Bullets are reused rather than created per shot. The ones in flight are kept in self.bullets
+        self.bullet_pool = BulletPool(world=self.world)
+        self.bullets: list = self.bullet_pool.active
         self.sword_sprite = Sword(location=(self.body.position.x + 24, self.body.position.y - 18))
 
         self.set_animation("jump")
@@ -163,7 +167,7 @@ class Player:
                 #     self._sprint()
 
     def update(self) -> None:
-        keys = pygame.key.get_pressed()
+        keys = input_source.get_pressed()
 
         pressing_key_right: bool = any(keys[key] for key in self.input["movement"]["right"])
         pressing_key_left: bool = any(keys[key] for key in self.input["movement"]["left"])
@@ -245,14 +249,12 @@ class Player:
         self.can_shoot = not self.can_shoot if override is None else override
 
     def _shoot(self):
-        """ Creates a bullet with correct direction/positioning. """
+        """ Fires a bullet with correct direction/positioning. """
 
-        new_bullet = Bullet(
+        self.bullet_pool.acquire(
             location=self.body.position + tuple(self.direction.normalized() * self.w / 2),
             direction=self.direction,
-            damage=50,
-            world=self.world)
-        self.bullets.append(new_bullet)
+            damage=50)
 
         # Play sound
         play_sound("laser")
@@ -281,37 +283,48 @@ class Player:
             self.current_animation_frame[1] = 0
 
     def load_animations(self, size: tuple) -> dict[str, list]:
-        # Create container for animations
-        animations: dict[str, list] = defaultdict(lambda: list())
         # Start at content root for this character type
         root_animations_dir = Path(f"assets/player/animations")
 
+        # Reuse the baked result of a previous run if no frame, size, outfit color or recoloring code has changed since
+        bake_name = f"player_{self.char_type}_{size[0]}x{size[1]}"
+        bake_key = bake_cache.fingerprint(root_animations_dir.glob("*/*"), self.char_type, tuple(size),
+                                          sorted((char, sorted(colors.items())) for char, colors in
+                                                 self.outfits.items()), coloring.VERSION)
+        animations = bake_cache.load(bake_name, bake_key)
+        if animations is not None:
+            # The same kind of dict as a fresh bake, so a missing animation behaves the same either way
+            return defaultdict(lambda: list(), animations)
+
+        # Create container for animations
+        animations: dict[str, list] = defaultdict(lambda: list())
+        # Colors of the default outfit that need to change to become the selected outfit
+        palette = {self.outfits["default"][color_name]: color_value
+                   for color_name, color_value in self.outfits[self.char_type].items()}
+
         # Iterate through animation types. TODO: overlay all animations together before cropping/scaling
         for animation_type_dir in root_animations_dir.iterdir():
             # Load all frames in the folder
-            frames: list[pygame.Surface] = [pygame.image.load(frame).convert_alpha() for frame in
+            frames: list[pygame.Surface] = [assets.load_image(frame) for frame in
                                             animation_type_dir.iterdir()]
             # Automatically crop and scale them to just the occupied pixel portion
             frames: list[pygame.Surface] = auto_crop(images=frames, size=size)
 
-            # Recolor
-            for frame in frames:
-                # Shift color values of image
-                # self.shift_color(img=img, color_shift=0)
-                for char, colors in self.outfits.items():
-                    for color_name, color_value in colors.items():
-                        coloring.recolor(frame, self.outfits["default"][color_name],
-                                         self.outfits[self.char_type][color_name])
+            # Recolor all frames into the selected outfit at once
+            frames = coloring.palette_swap(frames, palette)
 
             # Assign frames to animation
             animations[animation_type_dir.name] = frames
 
+        # Save the result so the next player can skip all of the above
+        bake_cache.save(bake_name, bake_key, animations)
+
         return animations
 
     @property
     def image(self):
-        image: pygame.Surface = self.animations[self.current_animation_frame[0]][self.current_animation_frame[1]]
-        return pygame.transform.flip(image, self.direction.x == -1, False)
+        frames = self.animations[self.current_animation_frame[0]][self.current_animation_frame[1]]
+        return frames[self.direction.x == -1]
 
     def draw(self, screen: pygame.Surface, camera_offset: pygame.math.Vector2 = None, show_bounding_box: bool = False):
         # Update hitbox based on camera offset
@@ -320,7 +333,8 @@ class Player:
 
         # Adjust for pygame screen and camera location
         on_screen_destination = self.image.get_rect()
-        on_screen_destination.center = (self.body.position.x, screen.get_height() - self.body.position.y)
+        position = self.body.render_position
+        on_screen_destination.center = (position.x, screen.get_height() - position.y)
         on_screen_destination.move_ip(camera_offset)
 
         # Draw image, if vulnerable and/or during flash-on while invulnerable
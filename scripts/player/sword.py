@@ -1,5 +1,8 @@
 import pygame
 
+from scripts.util import assets
+from scripts.util.image_utils import mirror
+
 
 class Sword:
     def __init__(self, location: tuple):
@@ -10,17 +13,27 @@ class Sword:
         """
 
         super().__init__()
-        self._image: pygame.Surface = pygame.image.load("assets/sword/cyberSword.png").convert_alpha()
+        # The sword is not swung yet, so don't read its image from disk until it is actually drawn
+        self._image: assets.LazyImage = assets.LazyImage("assets/sword/cyberSword.png")
+        self._images: tuple[pygame.Surface, pygame.Surface] = None
         # self.image = pygame.transform.scale(self.image, (100, 100))
         # self.image = pygame.transform.rotate(self.image, 90)
-        self.rect: pygame.rect.Rect = self._image.get_rect()
-        self.rect.center = location
+        self.location: tuple = location
         self.sword_swing = False
         self.sword_direction = 1
 
+    @property
+    def rect(self) -> pygame.rect.Rect:
+        rect = self._image.get().get_rect()
+        rect.center = self.location
+        return rect
+
     @property
     def image(self):
-        return pygame.transform.flip(self._image, self.sword_direction == 1, False)
+        # The (unflipped, flipped) pair is made the first time the sword is drawn
+        if self._images is None:
+            self._images = mirror([self._image.get()])[0]
+        return self._images[self.sword_direction == 1]
 
     def draw(self, screen: pygame.Surface, camera_offset: pygame.math.Vector2 = None, show_bounding_box: bool = False):
         if not self.sword_swing:
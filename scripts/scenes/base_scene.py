@@ -2,6 +2,8 @@ import abc
 
 import pygame
 
+from scripts.util.asset_loader import AssetManifest
+
 
 class BaseScene(abc.ABC):
     def __init__(self):
@@ -10,6 +12,21 @@ class BaseScene(abc.ABC):
         """
         self.scene_manager = None
 
+        # Screen areas changed by the most recent render(), so only those need to be sent to the display.
+        # None (the default) means the whole screen changed
+        self.dirty_rects: list[pygame.Rect] = None
+
+    @staticmethod
+    def manifest() -> AssetManifest:
+        """
+        Lists the image and sound files this scene needs, so they can be loaded ahead of time (and in parallel)
+        by an AssetLoader before the scene is created.
+
+        :return: an AssetManifest. Empty by default.
+        """
+
+        return AssetManifest()
+
     @abc.abstractmethod
     def handle_events(self, events: list[pygame.event.Event]):
         """
@@ -40,8 +57,23 @@ class BaseScene(abc.ABC):
 
         You should consider beginning this function by getting the dimensions
         of the screen and/or by filling it with a color to use as the background.
+
+        Scenes that only change small parts of the screen can set self.dirty_rects to the list of
+        rectangles they drew onto (or an empty list, if nothing changed), instead of leaving it None.
         :param screen: the pygame Surface object that will be shown to the player
         :return: None
         """
 
         pass
+
+    def invalidate_area(self, area: pygame.Rect) -> None:
+        """
+        Asks the scene to draw an area of the screen again on its next render(), even if nothing in it changed (e.g.
+        because something else was drawn over it). Only scenes that set dirty_rects need to do anything: the others
+        draw the whole screen every time anyway.
+
+        :param area: the area of the screen to draw again.
+        :return: None
+        """
+
+        pass
@@ -1,18 +1,22 @@
+from typing import Union
+
 import pygame
 import pymunk
 
 from scripts import body, collision_types
+from scripts.util import assets
 
 
 class Exit:
     def __init__(self, rect: pygame.rect.Rect, world: pymunk.Space,
-                 image: pygame.Surface = pygame.image.load('assets/portal.png')):
+                 image: Union[pygame.Surface, assets.LazyImage] = assets.LazyImage('assets/portal.png')):
         """
         Creates a platform occupying the world at the given rectangle and looks like the image given when rendered.
 
         :param rect: a Rect that specifies where in the world this platform is.
         :param world: a pymunk Space to which this platform will be added
-        :param image: a Surface that the platform will look like. If None, a solid black square is used.
+        :param image: a Surface (or LazyImage, loaded on first draw) that the platform will look like.
+        If None, a solid black square is used.
         """
 
         super().__init__()
@@ -27,16 +31,23 @@ class Exit:
         self.shape.elasticity = 0
         self.shape.friction = 0
 
-        # Save image for this platform
-        self.image: pygame.Surface = image
-        if self.image is None:
-            self.image = pygame.Surface(size=(10, 10))
-        if self.image.get_size() != rect.size:
-            self.image = pygame.transform.scale(self.image, rect.size)
+        # Save image for this platform. It is only decoded and scaled once it is first drawn
+        self._image: Union[pygame.Surface, assets.LazyImage] = image
+        self._size: tuple = rect.size
+        if self._image is None:
+            self._image = pygame.Surface(size=(10, 10))
 
         # Add platform into the world
         world.add(self.body, self.shape)
 
+    @property
+    def image(self) -> pygame.Surface:
+        if isinstance(self._image, assets.LazyImage):
+            self._image = self._image.get()
+        if self._image.get_size() != self._size:
+            self._image = pygame.transform.scale(self._image, self._size)
+        return self._image
+
     def __str__(self):
         return f"Exit({self.body.position=}, {self.shape.bb=})"
 
@@ -1,5 +1,7 @@
 from scripts.scenes.base_scene import BaseScene
 from scripts.ui.button import Button
+from scripts.ui.text import get_font
+from scripts.ui.widgets import Container, Label
 from scripts.util.sound import *
 
 
@@ -9,6 +11,7 @@ class GameOverScene(BaseScene):
 
         # Load LevelOneScene (done here to avoid circular import issue)
         from scripts.scenes.level_one import LevelOneScene
+        from scripts.scenes.loading_scene import LoadingScene
 
         # Color shared by game over text and buttons
         self.game_over_theme_color = (200, 0, 0)
@@ -19,14 +22,17 @@ class GameOverScene(BaseScene):
             stop_sound("gameOverTheme")
 
             # Create level one scene
-            level_one = LevelOneScene()
+            def create_level_one():
+                level_one = LevelOneScene()
 
-            # Make sure level one's sound setting matches game over scene's sound setting
-            level_one.sound_enabled = self.sound_enabled
-            level_one.update_sounds()
+                # Make sure level one's sound setting matches game over scene's sound setting
+                level_one.sound_enabled = self.sound_enabled
+                level_one.update_sounds()
+                return level_one
 
-            # Transition to level 1      
-            self.scene_manager.go_to(level_one)
+            # Transition to level 1, once its assets are loaded (usually instant, since they are still cached)
+            self.scene_manager.go_to(LoadingScene(manifest=LevelOneScene.manifest(), create_scene=create_level_one,
+                                                  color=self.game_over_theme_color))
 
         self.try_again_button = Button(
             text="Try Again?",
@@ -37,6 +43,12 @@ class GameOverScene(BaseScene):
             hover_color=(50, 50, 50)
         )
 
+        # Title, centered a quarter of the way down the screen, with the button below it
+        screen_w, screen_h = pygame.display.get_surface().get_size()
+        self.game_over_label = Label(text="GAME OVER", pos=(screen_w / 2, screen_h / 4),
+                                     color=self.game_over_theme_color, font=get_font(48), anchor="center")
+        self.menu = Container(background=(0, 0, 0)).add(self.game_over_label, self.try_again_button)
+
         # Load and play game over theme song
         load_sound("gameOverTheme", "assets/sounds/wavFiles/game_over_theme_2.wav", volume=30)
         play_sound("gameOverTheme")
@@ -58,31 +70,50 @@ class GameOverScene(BaseScene):
         # Ensure sounds are properly muted or muted when this scene loads ... probably unnecessary but sanity check
         self.update_sounds()
 
+        # Nothing on this screen moves, so after the first frame only widgets whose look changed are redrawn, and any
+        # areas something else drew over
+        self._needs_full_redraw = True
+        self._stale_areas: list[pygame.Rect] = []
+
     def handle_events(self, events: list[pygame.event.Event]):
-        self.try_again_button.handle_events(events)
+        self.menu.handle_events(events)
 
         # handle keys
         for event in events:
             if event.type == pygame.KEYDOWN and event.key == pygame.K_m:
                 self.sound_enabled = not self.sound_enabled
                 self.update_sounds()
+            # The window was covered up or restored, so its contents need to be drawn again
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self._needs_full_redraw = True
 
     def update(self):
         pass
 
+    def invalidate_area(self, area: pygame.Rect):
+        self._stale_areas.append(pygame.Rect(area))
+
     def render(self, screen: pygame.Surface):
+        # Only redraw areas something else drew over, and widgets whose look changed (e.g. the button being hovered)
+        if not self._needs_full_redraw:
+            for area in self._stale_areas:
+                screen.set_clip(area)
+                screen.fill((0, 0, 0))
+                self.menu.draw(screen)
+                screen.set_clip(None)
+            self.dirty_rects = self._stale_areas + self.menu.draw(screen, only_changed=True)
+            self._stale_areas = []
+            return
+
+        self._needs_full_redraw = False
+        self._stale_areas = []
+        self.dirty_rects = [screen.get_rect()]
+
         # Black background
         screen.fill((0, 0, 0))
 
-        # Title
-        game_over_font = pygame.font.Font("assets/dogicapixelbold.ttf", 48)
-        game_over_text = game_over_font.render("GAME OVER", True, self.game_over_theme_color)
-        screen.blit(game_over_text, dest=(
-            screen.get_width() / 2 - game_over_text.get_width() / 2,
-            screen.get_height() / 4 - game_over_text.get_height() / 2))
-
-        # Buttons
-        screen.blit(self.try_again_button.render(), dest=self.try_again_button.rect)
+        # Title and buttons
+        self.menu.draw(screen)
 
     # Updates sound effects according to whether or not sound is enabled for this scene
     def update_sounds(self):
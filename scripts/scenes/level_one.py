@@ -1,3 +1,4 @@
+import random
 from pathlib import Path
 
 import pygame
@@ -13,18 +14,51 @@ from scripts.scenes.base_scene import BaseScene
 from scripts.scenes.exit import Exit
 from scripts.scenes.game_over import GameOverScene
 from scripts.ui.ui import UI
-from scripts.util import game_time
+from scripts.util import assets, frame_profiler, game_time, input_source
+from scripts.util.asset_loader import AssetManifest
 from scripts.util.camera import Camera, BoundedFollowTarget
+from scripts.util.component_store import ComponentStore
+from scripts.util.culling import ViewportCuller
+from scripts.util.parallax import ParallaxRenderer
 from scripts.util.sound import load_sound, sounds, unmute_sound, mute_sound, stop_sound
 
 
 class LevelOneScene(BaseScene):
-    def __init__(self):
+    # Size every scenery layer is scaled to
+    SCENERY_SIZE = (1280, 2880)
+
+    # If True, enemies and bullets are also kept in a ComponentStore, so they are culled and drawn in bulk with NumPy
+    # instead of one by one. Only drawing changes: they are still updated one by one. Worth it when thousands of them
+    # are on screen. This is the default for every level; the component_store argument overrides it for one
+    # (main.py --component-store sets it)
+    USE_COMPONENT_STORE: bool = False
+
+    # Width, in columns, of the chunks the level is streamed in, and how far (in pixels) past either side of the
+    # view chunks are kept in the physics world (see LevelChunks)
+    CHUNK_COLUMNS: int = 16
+    ACTIVATION_MARGIN: float = 640
+
+    def __init__(self, seed: int = None, level=None, streamed: bool = True, component_store: bool = None):
+        """
+        :param seed: the random seed to build the level with (e.g. to replay a recording). Default is None, meaning
+        a new one is picked.
+        :param level: a layout to play instead of level one's, as anything LevelDesigner accepts (e.g. the path of a
+        generated level). Default is None, meaning level one's.
+        :param streamed: if True, only the chunks of the level near the camera are in the physics world. Otherwise
+        the whole level is, all the time.
+        :param component_store: if True, enemies and bullets are also kept in a ComponentStore (see
+        USE_COMPONENT_STORE). Default is None, meaning USE_COMPONENT_STORE decides.
+        """
+
         super().__init__()
 
         # Reset game clock
         game_time.reset()
 
+        # Everything random about the level comes from this seed, so a recorded session can be played back exactly
+        self.seed: int = random.randrange(2 ** 32) if seed is None else seed
+        random.seed(self.seed)
+
         # Define identity of this level
         self.level_id = 1
 
@@ -34,8 +68,11 @@ class LevelOneScene(BaseScene):
         pymunk.pygame_util.positive_y_is_up = True
 
         # Build/populate level
-        self.level_designer = LevelDesigner(world=self.world, level=self.level_id)
+        self.level_designer = LevelDesigner(world=self.world, level=self.level_id if level is None else level,
+                                            chunk_columns=self.CHUNK_COLUMNS if streamed else None,
+                                            activation_margin=self.ACTIVATION_MARGIN)
         self.platforms: list = self.level_designer.platforms
+        self.terrain = self.level_designer.terrain
         self.enemies: list = self.level_designer.enemies
         self.exit: Exit = self.level_designer.exit
 
@@ -43,6 +80,16 @@ class LevelOneScene(BaseScene):
         self.player = Player("default", rect=pygame.rect.Rect(100, 350, 50, 100), world=self.world)
         self.ui = UI(player=self.player)
 
+        # Optional bulk storage for enemies and bullets
+        self.entities: ComponentStore = None
+        if self.USE_COMPONENT_STORE if component_store is None else component_store:
+            self.entities = ComponentStore()
+            for enemy in self.enemies:
+                self.entities.add(enemy, frames=enemy.animations[enemy.enemy_type], healthbar=enemy.healthbar)
+            self.player.bullet_pool.store = self.entities
+            if self.level_designer.chunks is not None:
+                self.level_designer.chunks.store = self.entities
+
         # Attach camera to player TODO: compensate for weirdness with bottom being cut-off on Macs
         self.camera = Camera(
             behavior=BoundedFollowTarget(
@@ -51,8 +98,15 @@ class LevelOneScene(BaseScene):
                 vertical_limits=(-self.level_designer.max_y / 2 + 15, self.level_designer.max_y / 2 + 15))
         )
 
+        # Bring in the chunks of the level around where the player starts
+        self.stream_level()
+
+        # Only objects on screen are drawn
+        self.culler = ViewportCuller(world=self.world)
+
         # Store all layers in a dict with the delta scroll for each layer
         self.scenery: dict[pygame.Surface, float] = self.load_scenery(level=self.level_id)
+        self.scenery_renderer = ParallaxRenderer(layers=self.scenery.items())
 
         # Sounds
         self.sound_enabled = None
@@ -71,17 +125,22 @@ class LevelOneScene(BaseScene):
             enemy: BasicEnemy = arbiter.shapes[0].body.obj
             bullet: Bullet = arbiter.shapes[1].body.obj
 
+            # Another bullet may have already killed the enemy during this same physics step
+            if not enemy.enabled:
+                return False
+
             # Apply damage
             enemy.take_damage(bullet.damage)
 
             # Remove enemy if needed
             if not enemy.enabled:
                 self.enemies.remove(enemy)
+                if self.entities is not None:
+                    self.entities.remove(enemy)
 
-            # Remove bullet if needed
+            # Remove bullet if needed (which also returns it to the player's bullet pool)
             if bullet.enabled:
                 bullet.despawn()
-                self.player.bullets.remove(bullet)
 
             # Do not collide
             return False
@@ -92,7 +151,6 @@ class LevelOneScene(BaseScene):
             bullet = arbiter.shapes[1].body.obj
             if bullet.enabled:
                 bullet.despawn()
-                self.player.bullets.remove(bullet)
 
             # Do not collide
             return False
@@ -120,6 +178,9 @@ class LevelOneScene(BaseScene):
         self.world.add_collision_handler(coll_types.PLAYER, coll_types.ENEMY).pre_solve = player_enemy_collision
         self.world.add_collision_handler(coll_types.PLAYER, coll_types.EXIT).pre_solve = player_exit_collision
 
+        # Let the input source know the level has started (e.g. so it can start recording)
+        input_source.start_level(self)
+
     def handle_events(self, events: list[pygame.event.Event]):
         """
         Allows the player to move up and down, to help test the camera system.
@@ -146,16 +207,36 @@ class LevelOneScene(BaseScene):
         Allows everything in the world to have a chance to update. Also checks if player has died.
         """
 
+        # Bring in the chunks of the level the camera is coming up to, and drop the ones it has left behind
+        with frame_profiler.section("level streaming"):
+            self.stream_level()
+
         # Update player
-        self.player.update()
+        with frame_profiler.section("player update"):
+            self.player.update()
 
         # Update enemies
+        with frame_profiler.section("enemy updates"):
+            for enemy in self.enemies:
+                enemy.update()
+
+        # Bullets that fly out of the level can't hit anything anymore, so they go back to the player's bullet pool
+        with frame_profiler.section("bullet updates"):
+            for bullet in list(self.player.bullets):
+                bullet.update(right_bound=self.level_designer.max_x, left_bound=0)
+
+        # Remember where everything that moves was, so render() can draw it between this step and the next
+        self.player.body.save_position()
         for enemy in self.enemies:
-            enemy.update()
+            enemy.body.save_position()
+        for bullet in self.player.bullets:
+            bullet.body.save_position()
 
-        # Tick time and physics
-        game_time.tick()
-        self.world.step(1.0 / 60)
+        # Tick time and physics, by exactly one step (the main loop decides how many steps to run per frame)
+        with frame_profiler.section("game_time.tick"):
+            game_time.tick(game_time.FIXED_TIMESTEP)
+        with frame_profiler.section("world.step"):
+            self.world.step(game_time.FIXED_TIMESTEP)
 
         # Game over if the player falls out the bottom of the world
         if self.player.body.position.y <= 0:
@@ -164,6 +245,33 @@ class LevelOneScene(BaseScene):
         elif self.player.health <= 0:
             self.fail_level()
 
+    def stream_level(self):
+        """
+        Makes the chunks of the level around the camera active, if the level is streamed. Works out where the camera
+        will be from the player's position rather than asking it, since the camera only moves when drawing (which a
+        headless run may never do) and the physics world must not depend on that.
+        """
+
+        if self.level_designer.chunks is None:
+            return
+        view_left = self.player.body.position.x - self.camera.DISPLAY_W / 2
+        view_left = min(max(view_left, 0), self.level_designer.max_x - self.camera.DISPLAY_W)
+        self.level_designer.chunks.update(view_left=view_left, view_right=view_left + self.camera.DISPLAY_W)
+
+    @staticmethod
+    def manifest() -> AssetManifest:
+        # Player frames are not listed; they normally come straight from the bake cache instead (see Player)
+        return AssetManifest() \
+            .add_dir("assets/scenery/level1", size=LevelOneScene.SCENERY_SIZE) \
+            .add("assets/platforms/Textures-16.png") \
+            .add_dir("assets/enemy", "*/*") \
+            .add("assets/bullet/bullet.png") \
+            .add("assets/portal.png") \
+            .add_dir("assets/keys", "*/*") \
+            .add("assets/sounds/sfx/laser.wav") \
+            .add("assets/sounds/sfx/metroid_jump.wav") \
+            .add("assets/sounds/wavFiles/metroid_brinstar_theme.wav")
+
     @staticmethod
     def load_scenery(level: int) -> dict[pygame.Surface, float]:
         # Create container for scenery
@@ -176,10 +284,8 @@ class LevelOneScene(BaseScene):
         ds = 0.5
 
         for layer in root_scenery_dir:
-            # Load the image
-            img: pygame.Surface = pygame.image.load(layer).convert_alpha()
-            # Scale it
-            img = pygame.transform.scale(img, size=(1280, 2880))
+            # Load the image, scaled
+            img: pygame.Surface = assets.load_image(layer, size=LevelOneScene.SCENERY_SIZE)
             # Create img layer key and assign ds value
             scenery[img] = round(ds, 1)
             # Increment by 0.1 for each layer
@@ -188,14 +294,8 @@ class LevelOneScene(BaseScene):
         return scenery
 
     def render_scenery(self, screen: pygame.Surface):
-        # Iterate through scenery dict and display
-        for x in range(5):
-            for layer, ds in self.scenery.items():
-                # In order to account for vertical parallax, the layers have to be displayed at a negative offset
-                # Calculate this offset by multiplying the delta scroll by the player height and subtract the
-                # difference between the camera offset y times the delta scroll and the player height
-                screen.blit(layer, ((x * self.camera.DISPLAY_W) - self.camera.offset.x * ds,
-                                    (self.player.h * ds) - 640 - self.camera.offset.y * ds - self.player.h))
+        # In order to account for vertical parallax, the layers are lined up with the player's height
+        self.scenery_renderer.render(screen=screen, camera_offset=self.camera.offset, anchor_height=self.player.h)
 
     def render(self, screen: pygame.Surface):
         """
@@ -209,32 +309,78 @@ class LevelOneScene(BaseScene):
         """
 
         # White background
-        screen.fill((255, 255, 255))
-        self.render_scenery(screen=screen)
+        with frame_profiler.section("scenery"):
+            screen.fill((255, 255, 255))
+            self.render_scenery(screen=screen)
 
         # Move the camera
         self.camera.constant = pygame.Vector2(-screen.get_width() / 2, screen.get_height() / 2)
         self.camera.scroll()
 
-        # Draw level elements first
-        self.exit.draw(screen=screen, camera_offset=-self.camera.offset, show_bounding_box=self.show_hitboxes)
-        for platform in self.platforms:
-            platform.draw(screen=screen, camera_offset=-self.camera.offset, show_bounding_box=self.show_hitboxes)
-
-        # Draw enemies
-        for enemy in self.enemies:
-            enemy.draw(screen=screen, camera_offset=-self.camera.offset, show_bounding_box=self.show_hitboxes)
+        # Find what is on screen. The component store (if there is one) does this itself for enemies and bullets,
+        # and then asking pymunk just to find the exit isn't worth it
+        with frame_profiler.section("culling"):
+            if self.entities is None:
+                visible = self.culler.visible(camera_offset=self.camera.offset, screen_size=screen.get_size(),
+                                              collision_types=(coll_types.EXIT, coll_types.ENEMY, coll_types.BULLET),
+                                              total=len(self.enemies) + len(self.player.bullets) + 1)
+            else:
+                visible = {coll_types.EXIT: [self.exit]}
 
-        # Draw bullets
-        for bullet in self.player.bullets:
-            bullet.draw(screen, camera_offset=-self.camera.offset, show_bounding_box=self.show_hitboxes)
+        # Draw level elements first
+        with frame_profiler.section("terrain"):
+            for level_exit in visible[coll_types.EXIT]:
+                level_exit.draw(screen=screen, camera_offset=-self.camera.offset,
+                                show_bounding_box=self.show_hitboxes)
+            self.terrain.draw(screen=screen, camera_offset=-self.camera.offset, show_bounding_box=self.show_hitboxes)
+
+        # Draw enemies, then bullets
+        if self.entities is None:
+            with frame_profiler.section("enemies"):
+                for enemy in visible[coll_types.ENEMY]:
+                    enemy.draw(screen=screen, camera_offset=-self.camera.offset,
+                               show_bounding_box=self.show_hitboxes)
+            with frame_profiler.section("bullets"):
+                for bullet in visible[coll_types.BULLET]:
+                    bullet.draw(screen, camera_offset=-self.camera.offset, show_bounding_box=self.show_hitboxes)
+        else:
+            with frame_profiler.section("enemies and bullets"):
+                self.render_entities(screen=screen)
 
         # Draw player and update sprite animation
-        self.player.draw(screen=screen, camera_offset=-self.camera.offset, show_bounding_box=self.show_hitboxes)
-        self.player.sword_sprite.draw(screen, camera_offset=-self.camera.offset, show_bounding_box=self.show_hitboxes)
+        with frame_profiler.section("player"):
+            self.player.draw(screen=screen, camera_offset=-self.camera.offset, show_bounding_box=self.show_hitboxes)
+            self.player.sword_sprite.draw(screen, camera_offset=-self.camera.offset,
+                                          show_bounding_box=self.show_hitboxes)
 
         # Draw UI last
-        self.ui.draw(screen, show_controls=self.show_controls_help)
+        with frame_profiler.section("UI"):
+            self.ui.draw(screen, show_controls=self.show_controls_help)
+
+    def render_entities(self, screen: pygame.Surface):
+        """ Draws every enemy and bullet on screen from the component store, the same way their draw() methods do. """
+
+        # Copy where everything ended up after the latest physics step. Only drawing reads the store, so this happens
+        # once per frame however many steps ran
+        self.entities.pull()
+        self.entities.interpolate(game_time.main_timestep.alpha)
+        slots = self.entities.visible(camera_offset=self.camera.offset, screen_size=screen.get_size())
+        positions = self.entities.screen_positions(slots, camera_offset=self.camera.offset,
+                                                   screen_height=screen.get_height())
+
+        # Every image in one call
+        screen.blits(self.entities.draw_list(slots, positions), doreturn=False)
+
+        # Healthbars (only enemies that took damage show one) and hitboxes are rare enough to draw one by one
+        bar_slots = self.entities.healthbar_slots(slots)
+        bar_positions = self.entities.screen_positions(bar_slots, camera_offset=self.camera.offset,
+                                                       screen_height=screen.get_height())
+        for slot, (x, y) in zip(bar_slots.tolist(), bar_positions.tolist()):
+            enemy = self.entities.objects[slot]
+            screen.blit(enemy.healthbar.render(int(enemy.w)), dest=(x, y - 12))
+        if self.show_hitboxes:
+            for position, size in zip(positions.tolist(), self.entities.size[slots].tolist()):
+                pygame.draw.rect(surface=screen, color=(255, 0, 0), rect=(position, size), width=1)
 
     def update_sounds(self):
         """ Updates sound effects according to whether or not sound is enabled for this scene. """
@@ -0,0 +1,45 @@
+from typing import Callable
+
+import pygame
+
+from scripts.scenes.base_scene import BaseScene
+from scripts.util.asset_loader import AssetLoader, AssetManifest
+
+
+class LoadingScene(BaseScene):
+    def __init__(self, manifest: AssetManifest, create_scene: Callable[[], BaseScene], color: tuple = None):
+        """
+        Shows a progress bar while the assets of the next scene load in the background, then switches to it.
+
+        :param manifest: the assets to load, usually the next scene's manifest().
+        :param create_scene: a function that creates the next scene. Called once everything is loaded.
+        :param color: the color of the progress bar.
+        """
+
+        super().__init__()
+
+        self.create_scene = create_scene
+        self.color = (255, 255, 255) if color is None else color
+        self.loader = AssetLoader(manifest).start()
+
+    def handle_events(self, events: list[pygame.event.Event]):
+        pass
+
+    def update(self):
+        if self.loader.done:
+            self.scene_manager.go_to(self.create_scene())
+
+    def render(self, screen: pygame.Surface):
+        # Finish decoded assets for a few milliseconds per frame so the progress bar keeps moving. This is done here
+        # rather than in update(), which may run several times per frame or not at all
+        self.loader.poll(time_budget=0.008)
+
+        # Black background
+        screen.fill((0, 0, 0))
+
+        # Progress bar, centered
+        bar = pygame.Rect(0, 0, screen.get_width() / 2, 24)
+        bar.center = (screen.get_width() / 2, screen.get_height() / 2)
+        pygame.draw.rect(surface=screen, color=self.color, rect=bar, width=2)
+        pygame.draw.rect(surface=screen, color=self.color, rect=(
+            bar.x + 4, bar.y + 4, (bar.w - 8) * self.loader.progress, bar.h - 8))
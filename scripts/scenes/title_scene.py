@@ -1,7 +1,12 @@
 from scripts.scenes.base_scene import BaseScene
 from scripts.scenes.level_one import LevelOneScene
+from scripts.scenes.loading_scene import LoadingScene
 from scripts.ui.button import Button
+from scripts.ui.text import get_font
+from scripts.ui.widgets import Container, Label
+from scripts.util.asset_loader import AssetLoader, AssetManifest
 from scripts.util.camera import Camera, AutoScroll
+from scripts.util.parallax import ParallaxRenderer
 from scripts.util.sound import *
 
 
@@ -12,22 +17,29 @@ class TitleScene(BaseScene):
         # Color shared by title text and buttons
         self.title_theme_color = (0, 200, 0)
 
-        # Create scene on initialization to render background as well.
-        # Is this bad practice? I know ideally we would not want to render the whole scene
-        # until we click play. But this helps us with background on title screen.
-        self.level_one = LevelOneScene()
+        # Load everything this scene needs in parallel
+        AssetLoader(self.manifest()).wait()
+
+        # Only level one's scenery is needed for the background; the level itself is built when play is clicked
+        self.scenery_renderer = ParallaxRenderer(layers=LevelOneScene.load_scenery(level=1).items())
 
         # Processes transition from title to level 1
         def on_play_clicked():
             # Stop title theme
             stop_sound("titleTheme")
 
-            # Make sure level one's sound setting matches title's sound setting
-            self.level_one.sound_enabled = self.sound_enabled
-            self.level_one.update_sounds()
+            # Create level one scene
+            def create_level_one():
+                level_one = LevelOneScene()
+
+                # Make sure level one's sound setting matches title's sound setting
+                level_one.sound_enabled = self.sound_enabled
+                level_one.update_sounds()
+                return level_one
 
-            # Transition to level 1      
-            self.scene_manager.go_to(self.level_one)
+            # Transition to level 1, once its assets are loaded
+            self.scene_manager.go_to(LoadingScene(manifest=LevelOneScene.manifest(), create_scene=create_level_one,
+                                                  color=self.title_theme_color))
 
         self.play_button = Button(
             text="Play",
@@ -46,6 +58,12 @@ class TitleScene(BaseScene):
             hover_color=(50, 50, 50)
         )
 
+        # Title, centered a quarter of the way down the screen, with the buttons below it
+        screen_w, screen_h = pygame.display.get_surface().get_size()
+        self.title_label = Label(text="Lost in Cyberspace", pos=(screen_w / 2, screen_h / 4),
+                                 color=self.title_theme_color, font=get_font(48), anchor="center")
+        self.menu = Container().add(self.title_label, self.play_button, self.quit_button)
+
         # Load and play title theme song
         load_sound("titleTheme", "assets/sounds/wavFiles/metroid_title_theme.wav", volume=50)
         play_sound("titleTheme")
@@ -53,56 +71,56 @@ class TitleScene(BaseScene):
         # Load camera for title scene (used for auto scrolling)
         self.camera = Camera(behavior=AutoScroll(speed=1))
 
-        # Length of level used in render method (for scenery layers)
-        self.length = 5
-
         # If is enabled for title scene
         self.sound_enabled = True
 
         # Ensure sounds are properly muted or muted when this scene loads ... probably unnecessary but sanity check
         self.update_sounds()
 
+        # The whole screen is only sent to the display on the first frame (see render)
+        self._needs_full_redraw = True
+
+    @staticmethod
+    def manifest() -> AssetManifest:
+        return AssetManifest() \
+            .add_dir("assets/scenery/level1", size=LevelOneScene.SCENERY_SIZE) \
+            .add("assets/sounds/wavFiles/metroid_title_theme.wav")
+
     def handle_events(self, events: list[pygame.event.Event]):
-        self.play_button.handle_events(events)
-        self.quit_button.handle_events(events)
+        self.menu.handle_events(events)
 
         # handle keys
         for event in events:
             if event.type == pygame.KEYDOWN and event.key == pygame.K_m:
                 self.sound_enabled = not self.sound_enabled
                 self.update_sounds()
+            # The window was covered up or restored, so its contents need to be drawn again
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self._needs_full_redraw = True
 
     def update(self):
-        pass
+        # Scroll the background at the same speed however often frames are drawn
+        self.camera.scroll()
 
     def render(self, screen: pygame.Surface):
         # White background
         screen.fill((255, 255, 255))
 
-        # Just realized doing it this way stops the title screen scrolling...
-        self.level_one.render_scenery(screen)
+        # Background scrolls through level one's scenery, lined up as if next to a player 100px tall.
+        # Layers wrap around on their own, so the camera never needs to be reset
+        scenery_rects = self.scenery_renderer.render(screen=screen, camera_offset=self.camera.offset,
+                                                     anchor_height=100)
 
-        # Move the camera
-        self.camera.scroll()
+        # Title and buttons
+        menu_rects = self.menu.draw(screen)
 
-        # Reset the camera back to beginning position if it has gone too far
-        # With enough "length" for this title "level", the player should rarely see the title screen camera reset
-        # WARNING: This is spaghetti code! This is using a hard-coded value.
-        #          Not sure if the value we check here should be based off the shortest layer's length or what.
-        #          I am not sure what would accomplish the smoothest "camera reset" across all layers.
-        if self.camera.offset.x >= 2400:
-            self.camera.offset.x = 0
-
-        # Title
-        title_font = pygame.font.Font("assets/dogicapixelbold.ttf", 48)
-        title_text = title_font.render("Lost in Cyberspace", True, self.title_theme_color)
-        screen.blit(title_text, dest=(
-            screen.get_width() / 2 - title_text.get_width() / 2,
-            screen.get_height() / 4 - title_text.get_height() / 2))
-
-        # Buttons
-        screen.blit(self.play_button.render(), dest=self.play_button.rect)
-        screen.blit(self.quit_button.render(), dest=self.quit_button.rect)
+        # After the first frame, only the scrolling scenery band and the menu on top of it change
+        if self._needs_full_redraw:
+            self._needs_full_redraw = False
+            self.dirty_rects = None
+        else:
+            band = scenery_rects[0].unionall(scenery_rects[1:]) if scenery_rects else pygame.Rect(0, 0, 0, 0)
+            self.dirty_rects = [band] + menu_rects
 
     # Updates sound effects according to whether or not sound is enabled for this scene
     def update_sounds(self):
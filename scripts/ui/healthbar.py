@@ -1,8 +1,13 @@
 import pygame
 
+# Rendered healthbars, shared by every Healthbar. Keyed by (width, height, outline width, green width in pixels),
+# since two bars that look the same can use the same Surface no matter what their actual health values are
+_rendered: dict[tuple[int, int, int, int], pygame.Surface] = dict()
+
 
 class Healthbar:
-    def __init__(self, minimum_health: int = 0, maximum_health: int = 100, initial_health: int = None):
+    def __init__(self, minimum_health: int = 0, maximum_health: int = 100, initial_health: int = None,
+                 hide_when_full: bool = False):
         """
         Creates a healthbar, which ensures current health will always be within an intended minimum
         and maximum value, and provides a flexible Surface for rendering purposes.
@@ -10,11 +15,17 @@ class Healthbar:
         :param minimum_health: The minimum possible health value.
         :param maximum_health: The maximum possible health value.
         :param initial_health: The amount of health to begin with. If None, defaults to maximum_health.
+        :param hide_when_full: If True, the healthbar is not drawn while health is at its maximum.
         """
 
         self._minimum_health: int = minimum_health
         self._maximum_health: int = maximum_health
         self._current_health: int = self._maximum_health if initial_health is None else initial_health
+        self.hide_when_full: bool = hide_when_full
+
+        # The most recently rendered image, and the (width, height, outline width, health) it was rendered for
+        self._image: pygame.Surface = None
+        self._image_key: tuple = None
 
         if self._maximum_health <= self._minimum_health:
             raise Exception("Maximum health must be greater than minimum health.")
@@ -43,6 +54,11 @@ class Healthbar:
     def maximum_health(self):
         return self._maximum_health
 
+    @property
+    def hidden(self) -> bool:
+        """ True if the healthbar should not be drawn right now. """
+        return self.hide_when_full and self._current_health == self._maximum_health
+
     def render(self, width: int, height: int = 12, outline_width: int = 2) -> pygame.Surface:
         """
         Returns an image of the healthbar, with a black outline and a left-aligned green portion
@@ -51,20 +67,39 @@ class Healthbar:
         :param width: How wide in pixels the healthbar should be.
         :param height: How tall in pixels the healthbar should be.
         :param outline_width: How many pixels should be used for the outline.
-        :return: a pygame.Surface of the specified width and height.
+        :return: a pygame.Surface of the specified width and height. It is shared, so do not draw onto it.
         """
 
-        img = pygame.Surface((width, height))
+        # Nothing to do if health hasn't changed since last time
+        key = (width, height, outline_width, self._current_health)
+        if key == self._image_key:
+            return self._image
+
+        # Calculate how much should be green. Health values that come out to the same number of green pixels
+        # look identical, so they share one image
+        green_percent = (self._current_health - self._minimum_health) / (self._maximum_health - self._minimum_health)
+        green_width = int((width - outline_width * 2) * green_percent)
+        shared_key = (width, height, outline_width, green_width)
+        if shared_key not in _rendered:
+            _rendered[shared_key] = self._draw(width, height, outline_width, green_width)
+
+        self._image, self._image_key = _rendered[shared_key], key
+        return self._image
+
+    @staticmethod
+    def _draw(width: int, height: int, outline_width: int, green_width: int) -> pygame.Surface:
+        """ Draws a healthbar image with the given number of pixels of green. """
+
+        img = pygame.Surface((width, height)).convert()
 
         # Fill in red background
         pygame.draw.rect(surface=img, color=(210, 40, 0), rect=(
             outline_width, outline_width, (width - outline_width * 2), (height - outline_width * 2)
         ))
 
-        # Calculate how much should be green
-        green_percent = (self._current_health - self._minimum_health) / (self._maximum_health - self._minimum_health)
+        # Fill in green portion
         pygame.draw.rect(surface=img, color=(100, 230, 0), rect=(
-            outline_width, outline_width, (width - outline_width * 2) * green_percent, (height - outline_width * 2)
+            outline_width, outline_width, green_width, (height - outline_width * 2)
         ))
 
         return img
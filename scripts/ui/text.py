@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Union
+
+import pygame
+
+# The game's one and only typeface
+DEFAULT_FONT = "assets/dogicapixelbold.ttf"
+
+# Fonts that have already been opened, by (path, size), so each TTF file is only read once per size
+_fonts: dict[tuple[str, int], pygame.font.Font] = dict()
+
+
+def get_font(size: int, path: Union[str, Path] = DEFAULT_FONT) -> pygame.font.Font:
+    """
+    Returns the font at the given path and size, opening it the first time it is asked for.
+
+    :param size: the font size, in points.
+    :param path: the path of the font file. Defaults to the game's font.
+    :return: the pygame Font. It is shared, so do not change its style (bold, underline, etc.).
+    """
+
+    key = (Path(path).as_posix(), size)
+    if key not in _fonts:
+        _fonts[key] = pygame.font.Font(path, size)
+    return _fonts[key]
+
+
+class TextCache:
+    def __init__(self, max_entries: int = 256):
+        """
+        Keeps recently rendered pieces of text, so text drawn every frame is only rasterized once.
+
+        :param max_entries: how many rendered surfaces to keep. The least recently used ones are thrown away first.
+        """
+
+        self.max_entries: int = max_entries
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, font: pygame.font.Font, text: str, color, antialias: bool = True) -> pygame.Surface:
+        """
+        Same as font.render(text, antialias, color), but cached.
+
+        :param font: the font to render with, ideally one from get_font().
+        :param text: the text to render.
+        :param color: the text color.
+        :param antialias: if True (default), the text has smooth edges.
+        :return: the rendered Surface. It is shared, so do not draw onto it.
+        """
+
+        key = (font, text, tuple(color), antialias)
+        if key in self._surfaces:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return self._surfaces[key]
+
+        self.misses += 1
+        self._surfaces[key] = font.render(text, antialias, color)
+        while len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return self._surfaces[key]
+
+    def clear(self) -> None:
+        """ Throws away every rendered surface. """
+        self._surfaces.clear()
+
+
+# Single cache shared by every scene and UI element
+text_cache = TextCache()
+render_text = text_cache.render
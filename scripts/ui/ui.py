@@ -2,6 +2,9 @@ from pathlib import Path
 
 import pygame
 
+from scripts.ui.text import get_font, render_text
+from scripts.util import assets
+
 
 class UI:
     def __init__(self, player):
@@ -10,7 +13,19 @@ class UI:
         """
         self.x = 25
         self.y = 25
-        self.input_keys: dict[pygame.Surface, str] = self.find_binds(player)
+        self.player = player
+        self.input_keys: dict[pygame.Surface, str] = dict()
+
+        # The whole controls panel, drawn once into a single surface, and the key binds it was drawn for
+        self._panel: pygame.Surface = None
+        self._panel_pos: tuple[int, int] = (0, 0)
+        self._panel_binds: tuple = None
+
+    @staticmethod
+    def binds_signature(player) -> tuple:
+        """ Returns a snapshot of the player's key binds, which changes whenever any of them is remapped. """
+        return tuple((input_type, action, tuple(keys))
+                     for input_type, actions in player.input.items() for action, keys in actions.items())
 
     # TODO: ErrorHandling to make sure only images that are also input binds are in each directory
     @staticmethod
@@ -32,7 +47,7 @@ class UI:
             action_path_dir = Path(f"assets/keys/{input_type}")
             # Iterate through each key in each input type folder
             for key_image_dir in sorted(action_path_dir.iterdir()):
-                img: pygame.Surface = pygame.image.load(key_image_dir).convert_alpha()
+                img: pygame.Surface = assets.load_image(key_image_dir)
                 # Create image from image file name in each input type
                 img = pygame.transform.scale(img, (img.get_width(), img.get_height()))
                 # Add image and description from player input to main dict
@@ -41,16 +56,31 @@ class UI:
 
         return input_keys
 
+    def build_panel(self) -> None:
+        """ Draws the image and description of every key bind into one surface, so a frame only needs one blit. """
+
+        self.input_keys = self.find_binds(self.player)
+        self._panel_binds = self.binds_signature(self.player)
+
+        # Lay out every image and text exactly where draw() used to put them, one row per key
+        font = get_font(12)
+        placed: list[tuple[pygame.Surface, tuple[float, float]]] = []
+        for i, (image, desc) in enumerate(self.input_keys.items(), start=1):
+            placed.append((image, (self.x, i * self.y)))
+            text = render_text(font, desc, (255, 255, 255))
+            # To make more even maybe push from the largest image rect.right instead of all same?
+            placed.append((text, (image.get_rect().right + 50, i * self.y + text.get_height() / 2)))
+
+        # Draw it all onto a transparent surface just big enough to hold it
+        bounds = [pygame.Rect(pos, surf.get_size()) for surf, pos in placed]
+        area = bounds[0].unionall(bounds[1:]) if bounds else pygame.Rect(0, 0, 0, 0)
+        self._panel = pygame.Surface(area.size, pygame.SRCALPHA)
+        self._panel.blits([(surf, (x - area.x, y - area.y)) for surf, (x, y) in placed], doreturn=False)
+        self._panel_pos = area.topleft
+
     def draw(self, screen, show_controls: bool = True):
-        # Iterate through items in input keys dict
-        # Blit image at corresponding iteration of loop
-        # Blit text at same y additive x value of image
+        # Blit the pre-drawn controls panel, redrawing it first if the player's key binds changed
         if show_controls:
-            for i, (image, desc) in enumerate(self.input_keys.items(), start=1):
-                screen.blit(image, (self.x, i * self.y))
-                font = pygame.font.Font("assets/dogicapixelbold.ttf", 12)
-                text = font.render(desc, True, (255, 255, 255))
-                # To make more even maybe push from the largest image rect.right instead of all same?
-                screen.blit(text, dest=(
-                    image.get_rect().right + 50,
-                    i * self.y + text.get_height() / 2))
+            if self._panel is None or self.binds_signature(self.player) != self._panel_binds:
+                self.build_panel()
+            screen.blit(self._panel, self._panel_pos)
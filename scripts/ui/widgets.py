@@ -0,0 +1,327 @@
+import abc
+from typing import Hashable, Union
+
+import pygame
+
+from scripts.ui.text import get_font, render_text
+
+
+class Widget(abc.ABC):
+    # Whether the widget reacts to the mouse. Only interactive widgets take part in hit-testing, so e.g. a label
+    # drawn on top of a button does not block clicks to it
+    interactive: bool = False
+
+    # Attributes that change how the widget looks. Giving any of them a new value calls appearance_changed()
+    APPEARANCE: tuple[str, ...] = ()
+
+    def __init__(self, rect: Union[pygame.Rect, tuple]):
+        """
+        Base class of every retained-mode UI element.
+
+        A widget renders itself once per visual state (see state) and keeps the result, so drawing it again in the
+        same state is a single blit. Subclasses implement render_state(), and list everything else that changes how
+        they look (like their text or colors) in APPEARANCE, so their cached images are thrown away when it changes.
+
+        :param rect: where the widget is on screen.
+        """
+
+        self.rect: pygame.Rect = pygame.Rect(rect)
+        self.parent: "Container" = None
+        self._visible: bool = True
+        self._hovered: bool = False
+        self._surfaces: dict[Hashable, pygame.Surface] = dict()
+
+    def __setattr__(self, name: str, value):
+        changed = name in self.APPEARANCE and name in self.__dict__ and self.__dict__[name] != value
+        super().__setattr__(name, value)
+        if changed:
+            self.appearance_changed()
+
+    def appearance_changed(self) -> None:
+        """ Called when one of the APPEARANCE attributes gets a new value. Throws away every cached image. """
+        self.invalidate()
+
+    def resized(self) -> None:
+        """ Call this after changing the widget's rect, so the container it is in can update its layout. """
+        if self.parent is not None:
+            self.parent.invalidate_layout()
+
+    @property
+    def visible(self) -> bool:
+        """ Whether the widget is drawn and can be interacted with. """
+        return self._visible
+
+    @visible.setter
+    def visible(self, visible: bool):
+        if visible != self._visible:
+            self._visible = visible
+            if self.parent is not None:
+                self.parent.invalidate_layout()
+
+    @property
+    def is_hovered(self) -> bool:
+        """ Returns True if the mouse is currently over the widget. """
+        return self._hovered
+
+    def set_hovered(self, hovered: bool) -> None:
+        """ Called by the widget's container when the mouse enters or leaves it. """
+        self._hovered = hovered
+
+    def on_click(self) -> None:
+        """ Called by the widget's container when the widget is clicked. """
+        pass
+
+    @property
+    def state(self) -> Hashable:
+        """ Everything that changes how the widget looks from one frame to the next. """
+        return None
+
+    @abc.abstractmethod
+    def render_state(self, state: Hashable) -> pygame.Surface:
+        """ Draws the widget in the given state. Only called when no image for that state is cached yet. """
+        pass
+
+    def render(self) -> pygame.Surface:
+        """ Returns the widget's image for its current state, rendering it only if it isn't cached yet. """
+
+        state = self.state
+        if state not in self._surfaces:
+            self._surfaces[state] = self.render_state(state)
+        return self._surfaces[state]
+
+    def invalidate(self) -> None:
+        """ Throws away every cached image, so they are rendered again when next needed. """
+        self._surfaces.clear()
+
+
+class Label(Widget):
+    APPEARANCE = ("text", "color", "font", "pos", "anchor")
+
+    def __init__(self, text: str, pos: tuple, color: tuple = None, font: pygame.font.Font = None,
+                 anchor: str = "topleft"):
+        """
+        A single line of text.
+
+        :param text: the text to show.
+        :param pos: where to put the label, see anchor.
+        :param color: the text color. Defaults to black.
+        :param font: the font to use. Defaults to the game's font at size 24.
+        :param anchor: which point of the label pos refers to, as the name of a pygame.Rect attribute
+        (e.g. "center" or "midtop").
+        """
+
+        super().__init__(rect=(0, 0, 0, 0))
+        self.text = text
+        self.color = (0, 0, 0) if color is None else color
+        self.font = get_font(24) if font is None else font
+        self.pos = pos
+        self.anchor = anchor
+        self._fit()
+
+    def _fit(self) -> None:
+        """ Resizes the label around its text, keeping its anchor point where it is. """
+        self.rect.size = self.render().get_size()
+        setattr(self.rect, self.anchor, self.pos)
+
+    def appearance_changed(self) -> None:
+        # New text, a new font or a new position can all move or resize the label
+        super().appearance_changed()
+        self._fit()
+        self.resized()
+
+    def render_state(self, state: Hashable) -> pygame.Surface:
+        return render_text(self.font, self.text, self.color)
+
+
+class Image(Widget):
+    def __init__(self, image: pygame.Surface, pos: tuple, anchor: str = "topleft"):
+        """
+        A fixed picture.
+
+        :param image: the Surface to show. It is only ever blitted, never drawn onto.
+        :param pos: where to put the image, see anchor.
+        :param anchor: which point of the image pos refers to, as the name of a pygame.Rect attribute.
+        """
+
+        super().__init__(rect=image.get_rect())
+        setattr(self.rect, anchor, pos)
+        self.image = image
+
+    def render_state(self, state: Hashable) -> pygame.Surface:
+        return self.image
+
+
+class Container(Widget):
+    def __init__(self, children: list[Widget] = None, background: tuple = None):
+        """
+        Holds other widgets (including other containers), draws them in order, and routes mouse events to them.
+
+        Hit-testing uses a list of the interactive widgets' rects, topmost first, so finding the widget under the
+        mouse is a single pygame.Rect.collidelist() call however many widgets there are.
+
+        example usage:
+            menu = Container(background=(0, 0, 0)).add(play_button, quit_button)
+            menu.handle_events(events)
+            menu.draw(screen)
+
+        :param children: widgets to start with, bottom to top.
+        :param background: if given, the color behind the widgets. Only used by draw(only_changed=True), to clear a
+        widget's area before it is redrawn.
+        """
+
+        super().__init__(rect=(0, 0, 0, 0))
+        self.children: list[Widget] = []
+        self.background = background
+        self._hovered_widget: Widget = None
+
+        # Hit-test index, rebuilt only when widgets are added, removed, hidden, shown or resized
+        self._index_rects: list[pygame.Rect] = None
+        self._index_widgets: list[Widget] = None
+
+        # The image each widget had the last time it was drawn, and where it was drawn
+        self._drawn: dict[Widget, tuple[pygame.Surface, pygame.Rect]] = dict()
+
+        self.add(*(children or []))
+
+    def add(self, *widgets: Widget) -> "Container":
+        """ Adds widgets on top of the existing ones. Returns the container itself, so calls can be chained. """
+
+        for widget in widgets:
+            widget.parent = self
+            self.children.append(widget)
+        self.invalidate_layout()
+        return self
+
+    def remove(self, widget: Widget) -> None:
+        """ Takes a widget out of the container. """
+
+        self.children.remove(widget)
+        widget.parent = None
+        self._drawn.pop(widget, None)
+        if self._hovered_widget is widget:
+            self._hovered_widget = None
+        self.invalidate_layout()
+
+    def invalidate_layout(self) -> None:
+        """
+        Called when a widget is added, removed, hidden, shown or resized. Fits the container's rect around its widgets
+        again and marks the hit-test index as out of date, here and in every container this one is part of.
+        """
+
+        self.rect = self.children[0].rect.unionall([child.rect for child in self.children[1:]]) \
+            if self.children else pygame.Rect(0, 0, 0, 0)
+        self._index_rects = None
+        self.resized()
+
+    def _interactive_widgets(self) -> list[Widget]:
+        """ Returns every visible interactive widget in this container and the containers inside it, bottom to top. """
+
+        found = []
+        for child in self.children:
+            if not child.visible:
+                continue
+            if isinstance(child, Container):
+                found.extend(child._interactive_widgets())
+            elif child.interactive:
+                found.append(child)
+        return found
+
+    def widget_at(self, pos: tuple) -> Union[Widget, None]:
+        """ Returns the topmost interactive widget at a screen position, or None if there isn't one. """
+
+        if self._index_rects is None:
+            self._index_widgets = self._interactive_widgets()[::-1]
+            self._index_rects = [widget.rect for widget in self._index_widgets]
+
+        i = pygame.Rect(pos, (1, 1)).collidelist(self._index_rects)
+        return None if i == -1 else self._index_widgets[i]
+
+    def _set_hovered_widget(self, widget: Union[Widget, None]) -> None:
+        """ Moves the hover state from the previously hovered widget to a new one. """
+
+        if widget is self._hovered_widget:
+            return
+        if self._hovered_widget is not None:
+            self._hovered_widget.set_hovered(False)
+        if widget is not None:
+            widget.set_hovered(True)
+        self._hovered_widget = widget
+
+    def handle_events(self, events: list[pygame.event.Event], consume_events=True):
+        """
+        Sends mouse movement and clicks to the topmost widget under the mouse.
+
+        :param events: a list of pygame events
+        :param consume_events: if True, mouse events that landed on a widget are removed from the event list,
+        preventing any future components from using those events. Enabled by default.
+        :return: None
+        """
+
+        consumed: list[pygame.event.Event] = []
+        for event in events:
+            if event.type not in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN):
+                continue
+
+            target = self.widget_at(event.pos)
+            self._set_hovered_widget(target)
+            if target is None:
+                continue
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                target.on_click()
+            consumed.append(event)
+
+        if consume_events and consumed:
+            consumed_ids = {id(event) for event in consumed}
+            events[:] = [event for event in events if id(event) not in consumed_ids]
+
+    def render_state(self, state: Hashable) -> pygame.Surface:
+        """ Draws every visible widget onto a single transparent image the size of the container. """
+
+        image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        for child in self.children:
+            if child.visible:
+                image.blit(child.render(), child.rect.move(-self.rect.x, -self.rect.y))
+        return image
+
+    def render(self) -> pygame.Surface:
+        """
+        Returns an image of every visible widget. It changes whenever any of theirs does, so it is drawn again every
+        time rather than cached. Use draw() to put the widgets on screen.
+        """
+        return self.render_state(self.state)
+
+    def draw(self, screen: pygame.Surface, only_changed: bool = False) -> list[pygame.Rect]:
+        """
+        Draws every visible widget, bottom to top.
+
+        :param screen: the Surface to draw onto.
+        :param only_changed: if True, only widgets whose image changed since they were last drawn are drawn again,
+        on top of the background color (if there is one).
+        :return: the screen rectangles that were drawn onto.
+        """
+
+        drawn: list[pygame.Rect] = []
+        for child in self.children:
+            if not child.visible:
+                # A widget that was just hidden has to be cleared away
+                previous = self._drawn.pop(child, None)
+                if only_changed and previous is not None and self.background is not None:
+                    drawn.append(screen.fill(self.background, previous[1]))
+                continue
+            if isinstance(child, Container):
+                drawn.extend(child.draw(screen, only_changed=only_changed))
+                continue
+
+            image = child.render()
+            if only_changed:
+                previous = self._drawn.get(child)
+                if previous is not None and previous[0] is image and previous[1] == child.rect:
+                    continue
+                # Clear where the widget was as well as where it is, in case it moved or shrank
+                if self.background is not None:
+                    area = child.rect if previous is None else child.rect.union(previous[1])
+                    drawn.append(screen.fill(self.background, area))
+            drawn.append(screen.blit(image, child.rect))
+            self._drawn[child] = (image, child.rect.copy())
+
+        return drawn
@@ -0,0 +1,198 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from pathlib import Path
+from typing import Union
+
+import pygame
+
+from scripts.util import assets, startup_profile
+
+# File extensions the loader knows how to decode
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".gif"}
+AUDIO_EXTENSIONS = {".wav", ".ogg", ".mp3"}
+
+
+class AssetManifest:
+    def __init__(self):
+        """
+        A list of every image and sound file a scene needs, so they can all be loaded ahead of time.
+
+        Images are listed with the size they will be scaled to (or None), matching how they are later
+        requested from assets.load_image().
+        """
+
+        self.images: list[tuple[Path, tuple]] = []
+        self.audio: list[Path] = []
+
+    def __len__(self):
+        return len(self.images) + len(self.audio)
+
+    def add(self, path: Union[str, Path], size: tuple = None) -> "AssetManifest":
+        """
+        Adds a file to the manifest. Whether it is an image or a sound is decided by its extension.
+
+        :param path: the path of the file.
+        :param size: for images only, a (width, height) tuple the image will be scaled to.
+        :return: the manifest itself, so calls can be chained.
+        """
+
+        path = Path(path)
+        if path.suffix.lower() in IMAGE_EXTENSIONS:
+            self.images.append((path, None if size is None else tuple(size)))
+        elif path.suffix.lower() in AUDIO_EXTENSIONS:
+            self.audio.append(path)
+        else:
+            raise Exception(f"Don't know how to load '{path}'. Supported: {IMAGE_EXTENSIONS | AUDIO_EXTENSIONS}")
+        return self
+
+    def add_dir(self, path: Union[str, Path], pattern: str = "*", size: tuple = None) -> "AssetManifest":
+        """ Adds every file in a folder (and its sub-folders, if the pattern says so) to the manifest. """
+        for file in sorted(Path(path).glob(pattern)):
+            if file.is_file():
+                self.add(file, size=size)
+        return self
+
+    def extend(self, other: "AssetManifest") -> "AssetManifest":
+        """ Adds everything in another manifest to this one. """
+        self.images.extend(other.images)
+        self.audio.extend(other.audio)
+        return self
+
+
+class AssetLoader:
+    def __init__(self, manifest: AssetManifest, max_workers: int = None):
+        """
+        Loads everything in a manifest using a pool of threads.
+
+        Decoding files happens on the worker threads (SDL releases the GIL while doing it). Converting and scaling
+        images needs the display, so that happens on the main thread, a few files at a time, in poll().
+        Finished assets are handed to the assets module, so later calls to assets.load_image() and
+        assets.load_audio() for them are free.
+
+        example usage:
+            loader = AssetLoader(manifest).start()
+            while not loader.done:
+                loader.poll()
+                draw_progress_bar(loader.progress)
+
+        :param manifest: the files to load.
+        :param max_workers: how many threads to use. Defaults to ThreadPoolExecutor's default.
+        """
+
+        self.manifest = manifest
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor = None
+        self._pending: list[tuple[Future, str, Path, tuple]] = []
+        self._finished: int = 0
+        self._start_time: float = None
+        self._end_time: float = None
+        self.decode_seconds: float = 0.0
+
+    @staticmethod
+    def _timed(fn, *args):
+        """ Runs fn(*args) on a worker thread, returning its result along with how long it took. """
+        start = time.perf_counter()
+        result = fn(*args)
+        return result, time.perf_counter() - start
+
+    def start(self) -> "AssetLoader":
+        """ Submits every file in the manifest to the thread pool. Returns immediately. """
+
+        if self._executor is not None:
+            return self
+        self._start_time = time.perf_counter()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="asset-loader")
+        for path, size in self.manifest.images:
+            if assets.is_cached(path, size=size):
+                self._finished += 1
+                continue
+            future = self._executor.submit(self._timed, pygame.image.load, path)
+            self._pending.append((future, "image", path, size))
+        for path in self.manifest.audio:
+            if assets.is_cached(path):
+                self._finished += 1
+                continue
+            future = self._executor.submit(self._timed, pygame.mixer.Sound, str(path))
+            self._pending.append((future, "audio", path, None))
+        if not self._pending:
+            self._finish()
+        return self
+
+    def poll(self, time_budget: float = None) -> float:
+        """
+        Finishes any decoded files on the main thread. Call this once per frame.
+
+        :param time_budget: seconds to spend finishing files before returning, or None to finish all decoded ones.
+        :return: the progress fraction, between 0 and 1.
+        """
+
+        self.start()
+        start = time.perf_counter()
+        still_pending = []
+        try:
+            for future, kind, path, size in self._pending:
+                out_of_time = time_budget is not None and time.perf_counter() - start >= time_budget
+                if out_of_time or not future.done():
+                    still_pending.append((future, kind, path, size))
+                    continue
+
+                # Re-raises any error from the worker thread, e.g. a missing file
+                result, seconds = future.result()
+                self.decode_seconds += seconds
+                startup_profile.record_asset(path, seconds)
+                if kind == "image":
+                    assets.store_image(path, result, size=size)
+                else:
+                    assets.store_audio(path, result)
+                self._finished += 1
+        except BaseException:
+            self._abort()
+            raise
+
+        self._pending = still_pending
+        if not self._pending:
+            self._finish()
+        return self.progress
+
+    def wait(self) -> None:
+        """ Blocks until everything in the manifest is loaded. """
+        self.start()
+        while not self.done:
+            self.poll()
+            if self._pending:
+                # Raises any error from the worker thread, which poll() handles the next time around
+                wait_futures([self._pending[0][0]])
+
+    def _finish(self):
+        if self._end_time is None:
+            self._end_time = time.perf_counter()
+            self._executor.shutdown(wait=False)
+            startup_profile.record_loader(self.report())
+
+    def _abort(self):
+        """ Stops loading after an error: drops every file not started yet and lets the threads go. """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending = []
+
+    @property
+    def done(self) -> bool:
+        """ Returns True once every file is loaded. """
+        return self._end_time is not None
+
+    @property
+    def progress(self) -> float:
+        """ Returns the fraction of files loaded so far, between 0 and 1. """
+        return 1.0 if len(self.manifest) == 0 else self._finished / len(self.manifest)
+
+    def report(self) -> dict[str, float]:
+        """
+        Returns how many files were loaded, the wall time it took, and the time spent decoding summed over every
+        thread. A decode time well above the wall time means the threads were actually working in parallel.
+        """
+
+        end = self._end_time if self._end_time is not None else time.perf_counter()
+        return {
+            "files": self._finished,
+            "wall_seconds": 0.0 if self._start_time is None else end - self._start_time,
+            "decode_seconds": self.decode_seconds,
+        }
@@ -0,0 +1,111 @@
+import time
+from pathlib import Path
+from typing import Union
+
+import pygame
+
+from scripts.util import startup_profile
+
+# Images and sounds that have already been loaded, so each file is only ever read from disk once.
+# Everything in here is shared, so callers must copy a surface before drawing onto it.
+_images: dict[tuple, pygame.Surface] = dict()
+_audio: dict[str, pygame.mixer.Sound] = dict()
+
+
+def _image_key(path: Union[str, Path], alpha: bool, size: tuple) -> tuple:
+    return Path(path).as_posix(), alpha, None if size is None else tuple(size)
+
+
+def load_image(path: Union[str, Path], alpha: bool = True, size: tuple = None) -> pygame.Surface:
+    """
+    Loads an image from disk and converts it to the display's pixel format for fast drawing.
+
+    Results are cached, so loading the same file again (or one preloaded by an AssetLoader) is free.
+    A display mode must already be set.
+
+    :param path: the path of the image file.
+    :param alpha: if True (default), per-pixel transparency is kept; otherwise the image is made opaque.
+    :param size: if given, a (width, height) tuple the image is scaled to.
+    :return: the loaded Surface. It is shared, so do not draw onto it.
+    """
+
+    key = _image_key(path, alpha, size)
+    if key in _images:
+        return _images[key]
+
+    start = time.perf_counter()
+    store_image(path, pygame.image.load(path), alpha=alpha, size=size)
+    startup_profile.record_asset(path, time.perf_counter() - start)
+    return _images[key]
+
+
+def store_image(path: Union[str, Path], img: pygame.Surface, alpha: bool = True, size: tuple = None) -> None:
+    """
+    Finishes an image freshly decoded from a file (converting and scaling it) and caches it for load_image().
+
+    Converting needs the display, so this must run on the main thread.
+    """
+
+    img = img.convert_alpha() if alpha else img.convert()
+    if size is not None and img.get_size() != tuple(size):
+        img = pygame.transform.scale(img, size)
+    _images[_image_key(path, alpha, size)] = img
+
+
+def is_cached(path: Union[str, Path], alpha: bool = True, size: tuple = None) -> bool:
+    """ Returns True if an image (with these options) or sound file has already been loaded. """
+    return _image_key(path, alpha, size) in _images or Path(path).as_posix() in _audio
+
+
+def load_audio(path: Union[str, Path]) -> pygame.mixer.Sound:
+    """
+    Loads a sound file from disk. Results are cached like load_image().
+
+    :param path: the path of the sound file.
+    :return: the loaded pygame Sound. It is shared, so changing its volume changes it for everyone.
+    """
+
+    key = Path(path).as_posix()
+    if key not in _audio:
+        start = time.perf_counter()
+        _audio[key] = pygame.mixer.Sound(str(path))
+        startup_profile.record_asset(path, time.perf_counter() - start)
+    return _audio[key]
+
+
+def store_audio(path: Union[str, Path], sound: pygame.mixer.Sound) -> None:
+    """ Caches a freshly decoded sound for load_audio(). """
+    _audio[Path(path).as_posix()] = sound
+
+
+class LazyImage:
+    def __init__(self, path: Union[str, Path], size: tuple = None, alpha: bool = True):
+        """
+        A handle to an image that is only read from disk the first time it is actually needed.
+
+        This makes it safe to create at import time (e.g. as a default argument) or in a constructor.
+
+        :param path: the path of the image file.
+        :param size: if given, a (width, height) tuple the image is scaled to once loaded.
+        :param alpha: if True (default), per-pixel transparency is kept.
+        """
+
+        self.path = path
+        self.size = size
+        self.alpha = alpha
+        self._surface: pygame.Surface = None
+
+    def __repr__(self):
+        return f"LazyImage({self.path!r}, size={self.size}, loaded={self.loaded})"
+
+    @property
+    def loaded(self) -> bool:
+        """ Returns True if the image has already been read from disk. """
+        return self._surface is not None
+
+    def get(self) -> pygame.Surface:
+        """ Returns the image, loading (and scaling) it first if this is the first call. """
+
+        if self._surface is None:
+            self._surface = load_image(self.path, alpha=self.alpha, size=self.size)
+        return self._surface
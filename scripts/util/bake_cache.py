@@ -0,0 +1,104 @@
+import hashlib
+import pickle
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pygame
+
+# Where baked files are stored. Everything in here can be deleted at any time; it will simply be rebuilt.
+CACHE_DIR = Path(".cache/bake")
+
+# Bump this whenever the layout of a baked file changes, so old files are ignored instead of misread. Changes to what
+# goes into a baked file (e.g. how it is recolored) belong in its key instead (see fingerprint())
+FORMAT_VERSION = 2
+
+# Every baked file starts with: magic bytes, format version, and the 40 character hex digest of its key
+_MAGIC = b"BAKE"
+_HEADER = struct.Struct("<4sH40s")
+
+
+def fingerprint(sources: Iterable[Path], *extra) -> str:
+    """
+    Computes a key that changes whenever any of the source files or any of the extra values change.
+
+    Source files are identified by their path, modification time and size, so they do not need to be read.
+
+    :param sources: the files that the baked result was built from.
+    :param extra: any other values the baked result depends on (sizes, color tables, ...). Must have a stable repr().
+    :return: a 40 character hex digest.
+    """
+
+    digest = hashlib.sha1()
+    digest.update(repr((FORMAT_VERSION, extra)).encode())
+    for source in sorted(Path(p) for p in sources):
+        stat = source.stat()
+        digest.update(f"{source.as_posix()}|{stat.st_mtime_ns}|{stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+def load(name: str, key: str) -> Optional[dict[str, list[pygame.Surface]]]:
+    """
+    Loads baked animations back from disk, in a single read.
+
+    :param name: the name the animations were saved under.
+    :param key: the key they are expected to have been saved with (see fingerprint()).
+    :return: a dict mapping animation names to lists of frames, or None if nothing valid is cached.
+    """
+
+    path = CACHE_DIR / f"{name}.bake"
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+
+    # Reject files from another format version, or that were baked from different sources
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, stored_key = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != FORMAT_VERSION or stored_key.decode() != key:
+        return None
+
+    # Turn raw pixel data back into surfaces. A truncated or corrupt file can fail in many ways (zlib.error,
+    # UnpicklingError, ValueError, struct.error, ...), all of which mean it has to be baked again
+    try:
+        baked: dict[str, list[tuple]] = pickle.loads(zlib.decompress(data[_HEADER.size:]))
+        return {
+            animation: [pygame.image.fromstring(pixels, size, "RGBA").convert_alpha() for size, pixels in frames]
+            for animation, frames in baked.items()
+        }
+    except Exception:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return None
+
+
+def save(name: str, key: str, animations: dict[str, list[pygame.Surface]]) -> None:
+    """
+    Saves animations to disk so load() can later skip all the work that went into making them.
+
+    Failing to write (read-only folder, full disk, ...) is not an error; the cache is simply skipped.
+
+    :param name: the name to save the animations under.
+    :param key: the key describing what the animations were built from (see fingerprint()).
+    :param animations: a dict mapping animation names to lists of frames.
+    """
+
+    baked = {
+        animation: [(frame.get_size(), pygame.image.tostring(frame, "RGBA")) for frame in frames]
+        for animation, frames in animations.items()
+    }
+    payload = _HEADER.pack(_MAGIC, FORMAT_VERSION, key.encode()) + \
+        zlib.compress(pickle.dumps(baked, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a half-written cache file behind
+        tmp_path = CACHE_DIR / f"{name}.bake.tmp"
+        tmp_path.write_bytes(payload)
+        tmp_path.replace(CACHE_DIR / f"{name}.bake")
+    except OSError:
+        pass
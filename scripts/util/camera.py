@@ -24,8 +24,10 @@ class FollowTarget(CameraBehavior):
         CameraBehavior.__init__(self, target)
 
     def scroll(self):
-        self.camera.offset.x = self.target.body.position.x + self.camera.constant.x
-        self.camera.offset.y = -self.target.body.position.y + self.camera.constant.y
+        # Follow where the target is drawn, which can be between two physics steps
+        position = self.target.body.render_position
+        self.camera.offset.x = position.x + self.camera.constant.x
+        self.camera.offset.y = -position.y + self.camera.constant.y
 
 
 class BoundedFollowTarget(CameraBehavior):
@@ -45,8 +47,10 @@ class BoundedFollowTarget(CameraBehavior):
 
     # Add dead zone for player x and y?
     def scroll(self):
-        self.camera.offset.x = self.target.body.position.x + self.camera.constant.x
-        self.camera.offset.y = -self.target.body.position.y + self.camera.constant.y
+        # Follow where the target is drawn, which can be between two physics steps
+        position = self.target.body.render_position
+        self.camera.offset.x = position.x + self.camera.constant.x
+        self.camera.offset.y = -position.y + self.camera.constant.y
 
         self.camera.offset.x = max(self.horizontal_limits[0], self.camera.offset.x)
         self.camera.offset.x = min(self.camera.offset.x, self.horizontal_limits[1] - self.camera.DISPLAY_W)
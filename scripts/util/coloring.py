@@ -1,26 +1,134 @@
+import weakref
+from typing import Callable
+
+import numpy as np
 import pygame
 
+# Bump this whenever palette_swap() starts producing different pixels, so images baked with an older
+# version (see bake_cache) are rebuilt
+VERSION = 2
+
+# Results of palette_swap(), keyed by (id of the source surface, operation, parameters).
+# Entries are dropped automatically when their source surface is garbage collected.
+_memo: dict[tuple, tuple[weakref.ref, pygame.Surface]] = dict()
+
 
 def shift_color(img: pygame.Surface = None, color_shift: int = 0):
-    # Get the pixels
-    pixels = pygame.PixelArray(img)
-    # Iterate over every pixel
-    for x in range(img.get_width()):
-        for y in range(img.get_height()):
-            # Turn the pixel data into an RGB tuple
-            rgb = img.unmap_rgb(pixels[x][y])
-            # Get a new color object using the RGB tuple and convert to HSLA
-            color = pygame.Color(*rgb)
-            h, s, l, a = color.hsla
-            # Add 120 to the hue (or however much you want) and wrap to under 360
-            color.hsla = (int(h) + color_shift) % 360, int(s), int(l), int(a)
-            # Assign directly to the pixel
-            pixels[x][y] = color
-    # The old way of closing a PixelArray object
+    """
+    Shifts the hue of every pixel of an image, in place.
+
+    :param img: the Surface to modify.
+    :param color_shift: how many degrees to rotate the hue by.
+    """
+
+    # Work on the pixels directly, as an array. The array must be released before the surface can be blitted
+    pixels = pygame.surfarray.pixels3d(img)
+    _hue_shift_kernel(pixels, color_shift)
     del pixels
 
 
-def recolor(img: pygame.Surface, old_color: tuple = None, new_color: tuple = None):
-    new_img = pygame.PixelArray(img)
-    new_img.replace(old_color, new_color)
-    del new_img
+def palette_swap(images: list[pygame.Surface], palette: dict[tuple, tuple]) -> list[pygame.Surface]:
+    """
+    Returns recolored copies of the images, where every pixel whose RGB color is a key of the palette is replaced
+    with the corresponding value. Alpha is left untouched. The originals are not modified.
+
+    All images are recolored together in a single vectorized pass, and results are remembered, so asking for the
+    same image and palette again costs nothing.
+
+    :param images: the Surfaces to recolor.
+    :param palette: a dict mapping old (r, g, b) colors to new (r, g, b) colors.
+    :return: a list of recolored Surfaces, in the same order as images.
+    """
+
+    # Only colors that actually change matter
+    palette = {tuple(old[:3]): tuple(new[:3]) for old, new in palette.items() if tuple(old[:3]) != tuple(new[:3])}
+    if not palette:
+        return list(images)
+
+    # Build the lookup table: sorted packed 0xRRGGBB keys, and the replacement color for each
+    old_colors = sorted(palette)
+    keys = np.array([_pack(*color) for color in old_colors], dtype=np.uint32)
+    values = np.array([palette[color] for color in old_colors], dtype=np.uint8)
+
+    def kernel(pixels: np.ndarray):
+        packed = _pack(pixels[..., 0].astype(np.uint32), pixels[..., 1].astype(np.uint32),
+                       pixels[..., 2].astype(np.uint32))
+        idx = np.minimum(np.searchsorted(keys, packed), len(keys) - 1)
+        matches = keys[idx] == packed
+        pixels[matches] = values[idx[matches]]
+
+    return _apply_memoized(images, ("palette", tuple(sorted(palette.items()))), kernel)
+
+
+def _pack(r, g, b):
+    """ Packs red, green and blue values (ints or arrays) into single 0xRRGGBB values. """
+    return (r << 16) | (g << 8) | b
+
+
+def _apply_memoized(images: list[pygame.Surface], operation: tuple,
+                    kernel: Callable[[np.ndarray], None]) -> list[pygame.Surface]:
+    """
+    Runs a kernel over copies of the images and returns them, reusing previous results where possible.
+
+    Images that have not been seen before are grouped by size and stacked into one (n, w, h, 3) array,
+    so the kernel runs once per size instead of once per image.
+    """
+
+    results: list[pygame.Surface] = [None] * len(images)
+    pending: dict[tuple, list[int]] = dict()
+
+    # Reuse remembered results; group everything else by size
+    for i, img in enumerate(images):
+        memo = _memo.get((id(img), operation))
+        if memo is not None and memo[0]() is img:
+            results[i] = memo[1]
+        else:
+            pending.setdefault(img.get_size(), []).append(i)
+
+    for indices in pending.values():
+        copies = [images[i].copy() for i in indices]
+        batch = np.stack([pygame.surfarray.array3d(img) for img in copies])
+        kernel(batch)
+
+        for i, img, pixels in zip(indices, copies, batch):
+            pygame.surfarray.pixels3d(img)[...] = pixels
+            results[i] = img
+
+            # Remember the result for as long as the source image is alive
+            key = (id(images[i]), operation)
+            _memo[key] = (weakref.ref(images[i], lambda _, k=key: _memo.pop(k, None)), img)
+
+    return results
+
+
+def _hue_shift_kernel(pixels: np.ndarray, degrees: float):
+    """ Rotates the hue of an (..., 3) uint8 RGB array in place, going through HSL. """
+
+    rgb = pixels.astype(np.float32) / 255
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+
+    # RGB -> HSL
+    c_max = rgb.max(axis=-1)
+    c_min = rgb.min(axis=-1)
+    delta = c_max - c_min
+    lightness = (c_max + c_min) / 2
+    saturation = np.where(delta == 0, 0, delta / np.maximum(1 - np.abs(2 * lightness - 1), 1e-6))
+
+    safe_delta = np.where(delta == 0, 1, delta)
+    hue = np.select(
+        [delta == 0, c_max == r, c_max == g],
+        [0, ((g - b) / safe_delta) % 6, (b - r) / safe_delta + 2],
+        default=(r - g) / safe_delta + 4)
+    hue = (hue * 60 + degrees) % 360
+
+    # HSL -> RGB
+    chroma = (1 - np.abs(2 * lightness - 1)) * saturation
+    x = chroma * (1 - np.abs((hue / 60) % 2 - 1))
+    m = lightness - chroma / 2
+    zero = np.zeros_like(hue)
+    sector = (hue // 60).astype(np.int8)
+    r = np.choose(sector, [chroma, x, zero, zero, x, chroma], mode="clip")
+    g = np.choose(sector, [x, chroma, chroma, x, zero, zero], mode="clip")
+    b = np.choose(sector, [zero, zero, x, chroma, chroma, x], mode="clip")
+
+    pixels[...] = np.clip(np.rint((np.stack([r, g, b], axis=-1) + m[..., None]) * 255), 0, 255).astype(np.uint8)
@@ -0,0 +1,236 @@
+from itertools import chain
+
+import numpy as np
+import pygame
+
+
+class ComponentStore:
+    # Names of the per-entity arrays
+    _COMPONENTS = ("position", "previous_position", "render_position", "velocity", "size", "kind", "facing_left",
+                   "faces_velocity", "frame", "health", "max_health", "shows_full_health", "enabled")
+
+    def __init__(self, capacity: int = 256):
+        """
+        Keeps what is needed to draw many similar entities (enemies, bullets, ...) in contiguous NumPy arrays, one
+        array per component, so they can be culled and turned into a draw list all at once instead of one Python
+        object at a time.
+
+        This is only a draw list. The entities themselves (and their pymunk bodies) are still the source of truth and
+        are still updated one by one: nothing is ever written back to them. pull() copies their state into the arrays
+        in a single pass, once per rendered frame, just before drawing. pymunk has no way to read or write many bodies
+        at once, so updating entities from the arrays would cost as much per entity as updating them directly.
+
+        Slots are kept packed: removing an entity moves the last one into its slot, so the live entities are always
+        the first len(store) rows of every array.
+
+        example usage:
+            store = ComponentStore()
+            store.add(enemy, frames=enemy.animations[enemy.enemy_type], healthbar=enemy.healthbar)
+            store.pull()
+            slots = store.visible(camera_offset, screen.get_size())
+            screen.blits(store.draw_list(slots, store.screen_positions(slots, camera_offset, screen.get_height())))
+
+        :param capacity: how many entities to make room for up front. The arrays double in size when full.
+        """
+
+        self.count: int = 0
+
+        # Components, one row per entity
+        self.position = np.zeros((capacity, 2))
+        self.previous_position = np.zeros((capacity, 2))
+        self.render_position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.size = np.zeros((capacity, 2), dtype=np.int32)
+        self.kind = np.zeros(capacity, dtype=np.int32)
+        self.facing_left = np.zeros(capacity, dtype=bool)
+        self.faces_velocity = np.zeros(capacity, dtype=bool)
+        self.frame = np.zeros(capacity, dtype=np.int32)
+        self.health = np.zeros(capacity)
+        self.max_health = np.zeros(capacity)
+        self.shows_full_health = np.zeros(capacity, dtype=bool)
+        self.enabled = np.zeros(capacity, dtype=bool)
+
+        # Things that can't go in an array: the entity, its (right-facing, left-facing) frame pairs, its healthbar
+        self.objects: list = []
+        self.frames: list[tuple] = []
+        self.healthbars: list = []
+        self._slots: dict[int, int] = dict()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, obj):
+        return id(obj) in self._slots
+
+    def _grow(self) -> None:
+        """ Doubles the size of every array. """
+        for name in self._COMPONENTS:
+            array = getattr(self, name)
+            grown = np.zeros((array.shape[0] * 2,) + array.shape[1:], dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            setattr(self, name, grown)
+
+    def add(self, obj, frames: tuple, healthbar=None, faces_velocity: bool = False) -> None:
+        """
+        Adds an entity to the store.
+
+        The entity needs a body and shape (pymunk), an enabled flag and a facing_left attribute. If it has more than
+        one frame it also needs a current_animation_frame, like Player and BasicEnemy. Its kind is the collision type
+        of its shape.
+
+        :param obj: the entity.
+        :param frames: the entity's (right-facing, left-facing) frame pairs (see image_utils.mirror()).
+        :param healthbar: the entity's Healthbar, if it has one.
+        :param faces_velocity: if True, the entity always faces the way it moves, so its facing_left is worked out
+        from its velocity instead of being asked for.
+        """
+
+        if id(obj) in self._slots:
+            return
+        if self.count == self.position.shape[0]:
+            self._grow()
+
+        slot = self.count
+        self.count += 1
+        self._slots[id(obj)] = slot
+        self.objects.append(obj)
+        self.frames.append(frames)
+        self.healthbars.append(healthbar)
+
+        self.size[slot] = frames[0][0].get_size()
+        self.kind[slot] = obj.shape.collision_type
+        self.faces_velocity[slot] = faces_velocity
+        self.max_health[slot] = 0 if healthbar is None else healthbar.maximum_health
+        self.shows_full_health[slot] = healthbar is not None and not healthbar.hide_when_full
+        self._pull_slot(slot)
+
+    def remove(self, obj) -> None:
+        """ Removes an entity from the store, moving the last entity into its slot. Does nothing if it isn't in it. """
+
+        slot = self._slots.pop(id(obj), None)
+        if slot is None:
+            return
+
+        last = self.count - 1
+        if slot != last:
+            for name in self._COMPONENTS:
+                array = getattr(self, name)
+                array[slot] = array[last]
+            self.objects[slot] = self.objects[last]
+            self.frames[slot] = self.frames[last]
+            self.healthbars[slot] = self.healthbars[last]
+            self._slots[id(self.objects[slot])] = slot
+        self.objects.pop()
+        self.frames.pop()
+        self.healthbars.pop()
+        self.count = last
+
+    def _pull_slot(self, slot: int) -> None:
+        """ Copies one entity's state into the arrays. """
+
+        obj = self.objects[slot]
+        self.position[slot] = obj.body.position
+        self.previous_position[slot] = obj.body.previous_position
+        self.render_position[slot] = self.position[slot]
+        self.velocity[slot] = obj.body.velocity
+        self.facing_left[slot] = obj.facing_left
+        self.frame[slot] = obj.current_animation_frame[1] if len(self.frames[slot]) > 1 else 0
+        self.health[slot] = 0 if self.healthbars[slot] is None else self.healthbars[slot].health
+        self.enabled[slot] = obj.enabled
+
+    def pull(self) -> None:
+        """ Copies every entity's current state (position, velocity, facing, animation frame, ...) into the arrays. """
+
+        n = self.count
+        if n == 0:
+            return
+
+        # Flattening (x, y) pairs into fromiter() is much faster than handing NumPy a list of Vec2d
+        objects, frames, healthbars = self.objects, self.frames, self.healthbars
+        self.position[:n] = np.fromiter(chain.from_iterable([obj.body.position for obj in objects]), float,
+                                        2 * n).reshape(n, 2)
+        self.previous_position[:n] = np.fromiter(chain.from_iterable([obj.body.previous_position for obj in objects]),
+                                                 float, 2 * n).reshape(n, 2)
+        self.render_position[:n] = self.position[:n]
+
+        # Only entities that face the way they move need their velocity
+        from_velocity = np.flatnonzero(self.faces_velocity[:n])
+        if len(from_velocity):
+            self.velocity[from_velocity] = [objects[slot].body.velocity for slot in from_velocity.tolist()]
+        self.facing_left[:n] = [False if by_velocity else obj.facing_left
+                                for obj, by_velocity in zip(objects, self.faces_velocity[:n].tolist())]
+        self.facing_left[from_velocity] = self.velocity[from_velocity, 0] < 0
+
+        self.frame[:n] = [obj.current_animation_frame[1] if len(f) > 1 else 0 for obj, f in zip(objects, frames)]
+        self.health[:n] = [0 if bar is None else bar.health for bar in healthbars]
+        self.enabled[:n] = [obj.enabled for obj in objects]
+
+    def interpolate(self, alpha: float) -> None:
+        """
+        Moves where every entity is drawn (see visible() and screen_positions()) to part of the way from its position
+        before the latest physics step to its current one.
+
+        :param alpha: how far between the two positions, from 0 to 1 (see game_time.FixedTimestep).
+        """
+
+        n = self.count
+        if alpha >= 1:
+            self.render_position[:n] = self.position[:n]
+        else:
+            previous = self.previous_position[:n]
+            self.render_position[:n] = previous + (self.position[:n] - previous) * alpha
+
+    def visible(self, camera_offset: pygame.math.Vector2, screen_size: tuple, margin: float = 64) -> np.ndarray:
+        """
+        Returns the slots of every enabled entity whose image overlaps the screen.
+
+        :param camera_offset: the camera's offset (not negated).
+        :param screen_size: a (width, height) tuple for the screen.
+        :param margin: extra pixels around the screen to include, for healthbars that stick out of the image.
+        :return: an array of slot numbers, ordered by kind (so e.g. bullets are drawn over enemies).
+        """
+
+        n = self.count
+        width, height = screen_size
+        x, y = self.render_position[:n, 0], self.render_position[:n, 1]
+        half_w, half_h = self.size[:n, 0] / 2 + margin, self.size[:n, 1] / 2 + margin
+
+        # Screen rectangle in world coordinates: screen x = world x - offset x, screen y = height - world y - offset y
+        on_screen = (x + half_w >= camera_offset.x) & (x - half_w <= camera_offset.x + width) & \
+                    (y + half_h >= -camera_offset.y) & (y - half_h <= height - camera_offset.y)
+        slots = np.flatnonzero(on_screen & self.enabled[:n])
+        return slots[np.argsort(self.kind[slots], kind="stable")]
+
+    def screen_positions(self, slots: np.ndarray, camera_offset: pygame.math.Vector2, screen_height: int) -> np.ndarray:
+        """
+        Returns where the top-left corner of each entity's image goes on screen, the same way the entities' own draw()
+        methods position them (image centered on the body, then moved by the negated camera offset).
+
+        :return: an (n, 2) integer array of screen coordinates, in the same order as slots.
+        """
+
+        # pygame rounds a float center to the nearest pixel, and truncates a float offset
+        center_x = self.render_position[slots, 0]
+        center_y = screen_height - self.render_position[slots, 1]
+        left = np.trunc(center_x + np.copysign(0.5, center_x)) - self.size[slots, 0] // 2
+        top = np.trunc(center_y + np.copysign(0.5, center_y)) - self.size[slots, 1] // 2
+        return np.stack((left + np.trunc(-camera_offset.x), top + np.trunc(-camera_offset.y)),
+                        axis=1).astype(np.int32)
+
+    def draw_list(self, slots: np.ndarray, positions: np.ndarray) -> list[tuple[pygame.Surface, tuple]]:
+        """
+        Returns a blit sequence (for Surface.blits()) that draws the given entities at the given screen positions.
+
+        :param slots: the slots to draw, e.g. from visible().
+        :param positions: their top-left screen positions, from screen_positions().
+        """
+
+        frames = self.frames
+        return [(frames[slot][frame][facing_left], tuple(position)) for slot, frame, facing_left, position in
+                zip(slots.tolist(), self.frame[slots].tolist(), self.facing_left[slots].tolist(), positions.tolist())]
+
+    def healthbar_slots(self, slots: np.ndarray) -> np.ndarray:
+        """ Returns which of the given slots have a healthbar that should be drawn. """
+
+        has_bar = self.max_health[slots] > 0
+        return slots[has_bar & (self.shows_full_health[slots] | (self.health[slots] < self.max_health[slots]))]
@@ -0,0 +1,46 @@
+import pygame
+import pymunk
+
+
+class ViewportCuller:
+    def __init__(self, world: pymunk.Space, margin: float = 64):
+        """
+        Finds which objects are on screen using the pymunk Space's own spatial index, so that only those get drawn.
+
+        :param world: the pymunk Space the objects live in.
+        :param margin: extra pixels around the screen to include, for sprites and healthbars that stick out of
+        their hitboxes.
+        """
+
+        self.world: pymunk.Space = world
+        self.margin: float = margin
+
+        # Counters for the most recent query
+        self.submitted: int = 0
+        self.culled: int = 0
+
+    def visible(self, camera_offset: pygame.math.Vector2, screen_size: tuple, collision_types: tuple,
+                total: int = None) -> dict[int, list]:
+        """
+        Returns the objects of the given collision types whose hitboxes overlap the screen.
+
+        :param camera_offset: the camera's offset (not negated).
+        :param screen_size: a (width, height) tuple for the screen.
+        :param collision_types: which collision types (see collision_types.py) to look for.
+        :param total: how many objects of those types exist in total, used to count how many were culled.
+        :return: a dict mapping each collision type to a list of the visible objects of that type.
+        """
+
+        # Screen rectangle in world coordinates: screen x = world x - offset x, screen y = height - world y - offset y
+        width, height = screen_size
+        bb = pymunk.BB(left=camera_offset.x - self.margin, bottom=-camera_offset.y - self.margin,
+                       right=camera_offset.x + width + self.margin, top=height - camera_offset.y + self.margin)
+
+        found: dict[int, list] = {collision_type: [] for collision_type in collision_types}
+        for shape in self.world.bb_query(bb, pymunk.ShapeFilter()):
+            if shape.collision_type in found:
+                found[shape.collision_type].append(shape.body.obj)
+
+        self.submitted = sum(len(objects) for objects in found.values())
+        self.culled = 0 if total is None else max(0, total - self.submitted)
+        return found
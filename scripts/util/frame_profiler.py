@@ -0,0 +1,231 @@
+"""
+Measures where the time goes in each frame: the main loop's phases (events, update, render, flip) and named sections
+inside them (player update, physics step, terrain, ...).
+
+The last few hundred frames are kept in a ring buffer. They can be shown on an overlay (a rolling graph of frame
+times, plus the 50th/95th/99th percentile of every section), or written out as a Chrome trace, which can be opened
+in chrome://tracing or https://ui.perfetto.dev.
+
+While disabled, section() hands back a shared do-nothing context manager, so instrumented code costs next to nothing.
+
+example usage:
+    frame_profiler.enable()
+    frame_profiler.begin_frame()
+    with frame_profiler.section("update"):
+        scene.update()
+    frame_profiler.end_frame()
+    frame_profiler.save_chrome_trace("trace.json")
+"""
+
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import pygame
+
+from scripts.ui.text import get_font
+
+# Handed out by section() while the profiler is disabled
+_NOOP = nullcontext()
+
+
+class _Section:
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start: float = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.profiler._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        profiler = self.profiler
+        profiler._depth -= 1
+        profiler._sections.append((self.name, profiler._depth, self.start, time.perf_counter() - self.start))
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, capacity: int = 300):
+        """
+        Times frames and the sections inside them, keeping the most recent ones.
+
+        :param capacity: how many frames to keep. Older ones are dropped as new ones come in.
+        """
+
+        self.enabled: bool = False
+        self.overlay_visible: bool = False
+
+        # One (start, duration, sections) entry per frame, where sections are (name, depth, start, duration) tuples
+        self.frames: deque[tuple[float, float, list[tuple[str, int, float, float]]]] = deque(maxlen=capacity)
+
+        # The frame being timed
+        self._frame_start: float = None
+        self._sections: list[tuple[str, int, float, float]] = []
+        self._depth: int = 0
+
+        # Rows of text for the overlay (a name, then one value per column). Only worked out every so often, since
+        # percentiles change slowly
+        self._overlay_text: list[list[pygame.Surface]] = []
+        self._overlay_frames: int = 0
+
+    def enable(self) -> None:
+        """ Starts timing frames. """
+        self.enabled = True
+
+    def disable(self) -> None:
+        """ Stops timing frames. What was already recorded is kept. """
+        self.enabled = False
+        self._frame_start = None
+
+    def toggle_overlay(self) -> None:
+        """ Shows or hides the overlay. Profiling is enabled while the overlay is showing. """
+
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.enable()
+
+    def section(self, name: str):
+        """
+        Returns a context manager that times the code inside it, as a section of the current frame.
+
+        :param name: what to call the section. Sections with the same name in a frame are added together.
+        """
+
+        if not self.enabled or self._frame_start is None:
+            return _NOOP
+        return _Section(self, name)
+
+    def begin_frame(self) -> None:
+        """ Starts timing a frame. """
+
+        if not self.enabled:
+            return
+        self._frame_start = time.perf_counter()
+        self._sections = []
+        self._depth = 0
+
+    def end_frame(self) -> None:
+        """ Finishes timing the current frame and adds it to the ring buffer. """
+
+        if not self.enabled or self._frame_start is None:
+            return
+        self.frames.append((self._frame_start, time.perf_counter() - self._frame_start, self._sections))
+        self._frame_start = None
+
+    def frame_times(self) -> np.ndarray:
+        """ Returns how long each recorded frame took, in seconds, oldest first. """
+        return np.array([duration for _, duration, _ in self.frames])
+
+    def section_times(self) -> dict[str, np.ndarray]:
+        """
+        Returns how long each section took in each recorded frame, in seconds, oldest first. Frames a section
+        didn't run in count as 0. Sections are listed in the order they first ran.
+        """
+
+        times: dict[str, np.ndarray] = dict()
+        for i, (_, _, sections) in enumerate(self.frames):
+            for name, _, _, duration in sections:
+                if name not in times:
+                    times[name] = np.zeros(len(self.frames))
+                times[name][i] += duration
+        return times
+
+    def percentiles(self, percentiles: tuple = (50, 95, 99)) -> dict[str, tuple]:
+        """
+        Returns percentiles of the frame time ("frame") and of every section's time, in seconds.
+
+        :param percentiles: which percentiles to compute.
+        :return: a dict mapping "frame" and each section name to a tuple with one value per percentile.
+        """
+
+        if not self.frames:
+            return dict()
+        result = {"frame": tuple(np.percentile(self.frame_times(), percentiles))}
+        for name, times in self.section_times().items():
+            result[name] = tuple(np.percentile(times, percentiles))
+        return result
+
+    def chrome_trace(self) -> dict:
+        """ Returns the recorded frames in Chrome's trace event format, with times in microseconds. """
+
+        events = []
+        for frame_start, duration, sections in self.frames:
+            events.append({"name": "frame", "ph": "X", "pid": 0, "tid": 0,
+                           "ts": frame_start * 1e6, "dur": duration * 1e6})
+            for name, depth, start, section_duration in sections:
+                events.append({"name": name, "ph": "X", "pid": 0, "tid": 0, "args": {"depth": depth},
+                               "ts": start * 1e6, "dur": section_duration * 1e6})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path: Union[str, Path]) -> None:
+        """ Writes the recorded frames to a JSON file that chrome://tracing (or Perfetto) can open. """
+        Path(path).write_text(json.dumps(self.chrome_trace()))
+
+    def draw_overlay(self, screen: pygame.Surface, graph_scale: float = 1 / 30) -> pygame.Rect:
+        """
+        Draws a rolling graph of frame times, and the percentiles of the outermost sections, in the top-right corner.
+
+        :param screen: the Surface to draw onto.
+        :param graph_scale: the frame time, in seconds, that fills the graph's height.
+        :return: the area of the screen that was drawn onto.
+        """
+
+        width, graph_height = self.frames.maxlen, 80
+        area = pygame.Rect(0, 0, width + 20, graph_height + 20)
+        area.topright = (screen.get_width() - 10, 10)
+
+        # Percentiles are only worked out again twice a second or so
+        if self._overlay_frames % 30 == 0:
+            font = get_font(8)
+            rows = [["ms", "p50", "p95", "p99"]]
+            depths = {name: depth for _, _, sections in self.frames for name, depth, _, _ in sections if depth <= 1}
+            for name, values in self.percentiles().items():
+                if name == "frame" or name in depths:
+                    rows.append(["  " * depths.get(name, 0) + name] + [f"{value * 1000:.2f}" for value in values])
+            self._overlay_text = [[font.render(cell, False, (255, 255, 255)) for cell in row] for row in rows]
+        self._overlay_frames += 1
+        area.height += sum(row[0].get_height() + 3 for row in self._overlay_text)
+
+        # Background
+        panel = pygame.Surface(area.size, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+
+        # Graph: one bar per frame, newest on the right, with a line at 60 FPS
+        bottom = 10 + graph_height
+        for x, duration in enumerate(self.frame_times(), start=10 + width - len(self.frames)):
+            height = min(duration / graph_scale, 1.0) * graph_height
+            color = (0, 220, 0) if duration <= 1 / 60 else (240, 60, 60)
+            pygame.draw.line(panel, color, (x, bottom), (x, bottom - height))
+        target = bottom - (1 / 60) / graph_scale * graph_height
+        pygame.draw.line(panel, (255, 255, 0), (10, target), (10 + width, target))
+
+        # Percentiles, in right-aligned columns
+        y = bottom + 8
+        for row in self._overlay_text:
+            panel.blit(row[0], (10, y))
+            for column, text in enumerate(reversed(row[1:])):
+                panel.blit(text, text.get_rect(topright=(area.width - 10 - column * 50, y)))
+            y += row[0].get_height() + 3
+
+        return screen.blit(panel, area)
+
+
+# Single profiler for the whole game
+main_profiler = FrameProfiler()
+
+
+# Convenience bindings to make using this module easier
+enable = main_profiler.enable
+section = main_profiler.section
+begin_frame = main_profiler.begin_frame
+end_frame = main_profiler.end_frame
+save_chrome_trace = main_profiler.save_chrome_trace
+toggle_overlay = main_profiler.toggle_overlay
+draw_overlay = main_profiler.draw_overlay
@@ -2,6 +2,9 @@ import heapq
 from datetime import datetime, timedelta
 from typing import Callable, Iterable, Union
 
+# Length of one simulation step, in seconds. Physics and game logic always advance by exactly this much at a time
+FIXED_TIMESTEP: float = 1.0 / 60
+
 
 class ScheduledEvent:
     def __init__(self, callback, timestamp, cb_args, delay):
@@ -120,13 +123,19 @@ class Clock:
         # Zero the time
         self._time = timedelta()
 
-    def tick(self) -> None:
-        """ Advances in time and processes any events that needed to occur. """
+    def tick(self, dt: float = None) -> None:
+        """
+        Advances in time and processes any events that needed to occur.
+
+        :param dt: how many seconds to advance by, e.g. FIXED_TIMESTEP. Default is None, meaning however much real
+        time has passed since the last tick.
+        :return: None
+        """
 
         # Update time
         now = datetime.now()
         if not self._paused:
-            self._time += now - self._last_sys_time
+            self._time += now - self._last_sys_time if dt is None else timedelta(seconds=dt)
         self._last_sys_time = now
 
         # Trigger any events
@@ -168,6 +177,7 @@ class Clock:
             for i in reversed(range(len(self._events))):
                 if self._events[i].callback == callback:
                     self._events.pop(i)
+            heapq.heapify(self._events)
 
         # Create/schedule the event
         se = ScheduledEvent(
@@ -175,10 +185,9 @@ class Clock:
             timestamp=self.elapsed + timedelta(seconds=delay),
             cb_args=cb_args,
             delay=timedelta(seconds=delay) if repeating else None)
-        self._events.append(se)
 
-        # Heapify the event heap
-        heapq.heapify(self._events)
+        # Add it to the event heap
+        heapq.heappush(self._events, se)
 
         return se
 
@@ -213,6 +222,66 @@ class Clock:
         return removals
 
 
+class FixedTimestep:
+    def __init__(self, step: float = FIXED_TIMESTEP, max_steps: int = 5):
+        """
+        Works out how many fixed-length simulation steps to run for each rendered frame, so the simulation keeps pace
+        with real time however fast or slow frames are drawn.
+
+        The real time each frame took is added to an accumulator, and one step is run for every whole step it holds.
+        Whatever is left over, as a fraction of a step (alpha), says how far the next frame is between the last two
+        steps, so positions can be drawn in between them.
+
+        If frames are so slow that more than max_steps are owed, the extra time is dropped instead of caught up on,
+        since catching up would only make the next frame slower still. The game then runs in slow motion.
+
+        example usage:
+            for _ in range(timestep.advance(frame_time)):
+                scene.update()
+            scene.render(screen)
+
+        :param step: the length of one step, in seconds.
+        :param max_steps: the most steps to run for a single frame.
+        """
+
+        self.step: float = step
+        self.max_steps: int = max_steps
+        self.accumulator: float = 0.0
+        self.alpha: float = 1.0
+
+        # Statistics
+        self.steps: int = 0
+        self.dropped_time: float = 0.0
+
+    def advance(self, frame_time: float) -> int:
+        """
+        Adds the real time that has passed since the last frame, and returns how many steps to run for it.
+
+        :param frame_time: seconds since the last frame.
+        :return: the number of steps to run, from 0 up to max_steps. Also updates alpha.
+        """
+
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.step)
+
+        # Drop whatever time is too much to catch up on
+        if steps > self.max_steps:
+            dropped = (steps - self.max_steps) * self.step
+            self.dropped_time += dropped
+            self.accumulator -= dropped
+            steps = self.max_steps
+
+        self.accumulator = max(self.accumulator - steps * self.step, 0.0)
+        self.alpha = min(self.accumulator / self.step, 1.0)
+        self.steps += steps
+        return steps
+
+    def reset(self) -> None:
+        """ Throws away any accumulated time, e.g. the time a new scene took to create. """
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+
 # Convenience bindings to make using this class/module easier
 main_clock = Clock()
 paused = main_clock.paused
@@ -222,3 +291,6 @@ tick = main_clock.tick
 schedule = main_clock.schedule
 unschedule = main_clock.unschedule
 get_time = main_clock.get_time
+
+# Steps for the main game loop. Its alpha is how far between physics steps things are drawn (see Body.render_position)
+main_timestep = FixedTimestep()
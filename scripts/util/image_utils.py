@@ -25,3 +25,15 @@ def auto_crop(images: list[pygame.Surface], size: tuple = None) -> list[pygame.S
         images: list[pygame.Surface] = [pygame.transform.scale(image, size) for image in images]
 
     return images
+
+
+def mirror(images: list[pygame.Surface]) -> list[tuple[pygame.Surface, pygame.Surface]]:
+    """
+    Pairs up every image with a horizontally flipped copy of itself, so sprites can face either way without
+    flipping anything while drawing.
+
+    :param images: the images, facing right.
+    :return: a list of (right-facing, left-facing) pairs, in the same order as the images.
+    """
+
+    return [(image, pygame.transform.flip(image, True, False)) for image in images]
@@ -0,0 +1,147 @@
+import abc
+from typing import Iterable
+
+import pygame
+
+
+class KeyState:
+    def __init__(self, held: Iterable[int] = ()):
+        """
+        Which keys are held down, indexable by key code like the sequence pygame.key.get_pressed() returns.
+
+        :param held: the key codes (e.g. pygame.K_d) that are held down.
+        """
+
+        self.held: frozenset[int] = frozenset(held)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.held
+
+
+class InputSource(abc.ABC):
+    """ Somewhere the game's keyboard input comes from: the real keyboard, or something standing in for it. """
+
+    def advance(self) -> None:
+        """ Moves on to the next frame's input. Called once per frame, before get_events(). """
+        pass
+
+    def start_level(self, scene) -> None:
+        """ Called by a level's scene once it has been created, before its first update. """
+        pass
+
+    def close(self) -> None:
+        """ Called once the game is over, to finish up anything the source still has to do. """
+        pass
+
+    @abc.abstractmethod
+    def get_events(self) -> list[pygame.event.Event]:
+        """ Returns the events that happened since the last frame, like pygame.event.get(). """
+        pass
+
+    @abc.abstractmethod
+    def get_pressed(self):
+        """ Returns which keys are held down, like pygame.key.get_pressed(). """
+        pass
+
+
+class KeyboardInput(InputSource):
+    """ Input straight from pygame: the real keyboard and window. """
+
+    def get_events(self) -> list[pygame.event.Event]:
+        return pygame.event.get()
+
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+
+class ScriptedInput(InputSource):
+    def __init__(self, script: list[tuple], loop: bool = True):
+        """
+        Plays back a fixed sequence of key presses, one frame at a time, so the game can be run without anyone
+        at the keyboard.
+
+        example usage (walk right for a second, then jump and shoot while still walking right):
+            ScriptedInput([
+                (60, [pygame.K_d]),
+                (1, [pygame.K_d], [pygame.K_w, pygame.K_SPACE]),
+            ])
+
+        :param script: a list of (frames, held keys) or (frames, held keys, tapped keys) entries. The held keys are
+        held down for that many frames; the tapped keys get a KEYDOWN event on the first of them.
+        :param loop: if True, the script starts over when it runs out. Otherwise no keys are held after the end.
+        """
+
+        if not script:
+            raise Exception("A scripted input needs at least one entry")
+
+        self.script: list[tuple] = script
+        self.loop: bool = loop
+        self.frame: int = -1
+
+        # Position in the script: which entry, and how many of its frames have been played
+        self._entry: int = 0
+        self._entry_frame: int = -1
+        self._finished: bool = False
+        self._keys: KeyState = KeyState()
+        self._events: list[pygame.event.Event] = []
+
+    def advance(self) -> None:
+        self.frame += 1
+        self._events = []
+        if self._finished:
+            return
+
+        # Move to the next entry once this one's frames are used up
+        self._entry_frame += 1
+        while self._entry_frame >= self.script[self._entry][0]:
+            self._entry_frame = 0
+            self._entry += 1
+            if self._entry == len(self.script):
+                if not self.loop:
+                    self._finished = True
+                    self._keys = KeyState()
+                    return
+                self._entry = 0
+
+        entry = self.script[self._entry]
+        self._keys = KeyState(entry[1])
+        if self._entry_frame == 0 and len(entry) > 2:
+            self._events = [pygame.event.Event(pygame.KEYDOWN, key=key) for key in entry[2]]
+
+    def get_events(self) -> list[pygame.event.Event]:
+        return self._events
+
+    def get_pressed(self) -> KeyState:
+        return self._keys
+
+
+# The source all game input is read from. Something else, like a scripted input, can be swapped in with use()
+current: InputSource = KeyboardInput()
+
+
+def use(source: InputSource) -> InputSource:
+    """ Makes all game input come from the given source. Returns the source that was being used before. """
+    global current
+    previous, current = current, source
+    return previous
+
+
+# Convenience bindings to make using this module easier
+def advance() -> None:
+    current.advance()
+
+
+def start_level(scene) -> None:
+    current.start_level(scene)
+
+
+def close() -> None:
+    current.close()
+
+
+def get_events() -> list[pygame.event.Event]:
+    return current.get_events()
+
+
+def get_pressed():
+    return current.get_pressed()
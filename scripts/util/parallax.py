@@ -0,0 +1,55 @@
+import pygame
+
+
+class ParallaxRenderer:
+    def __init__(self, layers, base_y: float = -640):
+        """
+        Draws scrolling background layers, each moving at its own fraction of the camera's speed.
+
+        Layers repeat forever horizontally. Only the part of each layer that is actually on screen is drawn,
+        which takes at most two blits per layer (one more for each time a layer is narrower than the screen).
+
+        :param layers: (Surface, delta scroll) pairs, back to front. A delta scroll of 1 moves with the camera,
+        0.5 moves at half its speed, and so on.
+        :param base_y: screen y coordinate of the top of every layer when the camera is at the origin.
+        """
+
+        self.layers: list[tuple[pygame.Surface, float]] = list(layers)
+        self.base_y: float = base_y
+
+    def render(self, screen: pygame.Surface, camera_offset: pygame.math.Vector2,
+               anchor_height: float = 0) -> list[pygame.Rect]:
+        """
+        Draws every layer for the given camera position.
+
+        :param screen: the Surface to draw onto.
+        :param camera_offset: the camera's offset (not negated).
+        :param anchor_height: height of whatever the camera follows. Layers are shifted down by
+        (1 - delta scroll) times this, so they line up with it vertically.
+        :return: the screen rectangles that were drawn onto.
+        """
+
+        screen_w, screen_h = screen.get_size()
+        drawn: list[pygame.Rect] = []
+
+        for layer, ds in self.layers:
+            layer_w, layer_h = layer.get_size()
+
+            # Where the top of the layer lands on screen, and which of its rows are visible
+            dest_y = int(anchor_height * ds + self.base_y - camera_offset.y * ds - anchor_height)
+            src_y = max(0, -dest_y)
+            dest_y = max(0, dest_y)
+            h = min(layer_h - src_y, screen_h - dest_y)
+            if h <= 0:
+                continue
+
+            # Which column of the layer is at the left edge of the screen, wrapping around the layer's width
+            src_x = int(camera_offset.x * ds) % layer_w
+            dest_x = 0
+            while dest_x < screen_w:
+                w = min(layer_w - src_x, screen_w - dest_x)
+                drawn.append(screen.blit(layer, (dest_x, dest_y), area=(src_x, src_y, w, h)))
+                dest_x += w
+                src_x = 0
+
+        return drawn
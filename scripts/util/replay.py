@@ -0,0 +1,251 @@
+"""
+Records the input a level was played with, and plays it back exactly, so a session can be reproduced (to chase down a
+bug or a slow frame) or used as a benchmark.
+
+A recording is one entry per physics step: the keys that were held down during it, and the key presses and releases
+that were handled just before it. Together with the seed the level was built with, that is everything needed to
+play the level the same way again: the game clock and physics only ever advance by fixed steps.
+
+File layout (little-endian):
+    header:  magic b"LICR", version (u16), seed (u32), number of recorded keys (u8), their key codes (u32 each),
+             number of steps (u32)
+    steps:   held keys as a bitmask over the recorded keys (u16), number of events (u8), then one byte per event:
+             the key's index in the recorded keys, with the top bit set for a release
+    footer:  checksum of the level's state after the last step (8 bytes)
+
+example usage:
+    input_source.use(InputRecorder(input_source.current, "session.rec"))
+    ...                                     # play the level; call input_source.close() when done
+    recording = Recording.load("session.rec")
+"""
+
+import hashlib
+import struct
+from pathlib import Path
+from typing import Union
+
+import pygame
+
+from scripts.util import game_time
+from scripts.util.input_source import InputSource, KeyState
+
+MAGIC = b"LICR"
+# Bump this whenever the file layout or what state_checksum() covers changes, so older recordings are refused instead
+# of reported as not matching
+VERSION = 2
+
+# Keys that affect the game, and so are recorded. Anything else (e.g. showing hitboxes) only affects what is drawn
+RECORDED_KEYS: tuple[int, ...] = (
+    pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d, pygame.K_UP, pygame.K_w,
+    pygame.K_LSHIFT, pygame.K_RSHIFT, pygame.K_p, pygame.K_SPACE,
+)
+
+# Set on an event's byte if the key was released, rather than pressed
+_RELEASE_BIT = 0x80
+
+
+def state_checksum(scene) -> str:
+    """
+    Returns a short fingerprint of everything that can change in a level: the game time, the position, velocity and
+    health of the player, the position, velocity, health, type, facing and animation frame of every enemy (including
+    any asleep in inactive chunks), and the position of every bullet in flight. Enemy types are picked at random, so
+    runs built with different seeds end with different checksums. Two runs ending with the same checksum almost
+    certainly played out the same way.
+
+    :param scene: a level scene, like LevelOneScene.
+    :return: the checksum, as 16 hex digits.
+    """
+
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(struct.pack("<q", round(game_time.get_time("us"))))
+
+    player = scene.player
+    digest.update(struct.pack("<4dd", *player.body.position, *player.body.velocity, player.health))
+    # A streamed level's enemies include the ones asleep in chunks away from the camera, and the ones not created yet
+    chunks = scene.level_designer.chunks
+    enemies = scene.enemies if chunks is None else chunks.all_enemies()
+    for enemy in enemies:
+        digest.update(struct.pack("<4dd??I", *enemy.body.position, *enemy.body.velocity, enemy.healthbar.health,
+                                  enemy.enabled, enemy.facing_left, enemy.current_animation_frame[1]))
+        digest.update(enemy.enemy_type.encode() + b"\0")
+    if chunks is not None:
+        digest.update(struct.pack("<I", chunks.pending_count()))
+    digest.update(struct.pack("<I", len(player.bullets)))
+    for bullet in player.bullets:
+        digest.update(struct.pack("<2d", *bullet.body.position))
+    return digest.hexdigest()
+
+
+class Recording:
+    def __init__(self, seed: int, keys: tuple[int, ...] = RECORDED_KEYS):
+        """
+        The input a level was played with, one step at a time.
+
+        :param seed: the random seed the level was built with.
+        :param keys: the keys whose state is recorded.
+        """
+
+        self.seed: int = seed
+        self.keys: tuple[int, ...] = tuple(keys)
+        if len(self.keys) > 16:
+            raise Exception(f"At most 16 keys can be recorded, not {len(self.keys)}")
+
+        # One (held keys bitmask, event bytes) pair per step
+        self.steps: list[tuple[int, bytes]] = []
+        self.checksum: str = None
+
+        self._key_index: dict[int, int] = {key: i for i, key in enumerate(self.keys)}
+
+    def __len__(self):
+        return len(self.steps)
+
+    def add_step(self, pressed, events: list[pygame.event.Event]) -> None:
+        """
+        Adds a step to the end of the recording.
+
+        :param pressed: the keys held down during the step, as from pygame.key.get_pressed().
+        :param events: the events handled before the step. Only presses and releases of recorded keys are kept.
+        """
+
+        held = 0
+        for i, key in enumerate(self.keys):
+            if pressed[key]:
+                held |= 1 << i
+
+        recorded = bytearray()
+        for event in events:
+            if event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in self._key_index:
+                recorded.append(self._key_index[event.key] | (_RELEASE_BIT if event.type == pygame.KEYUP else 0))
+        if len(recorded) > 255:
+            raise Exception(f"At most 255 key presses and releases can be recorded per step, not {len(recorded)}")
+        self.steps.append((held, bytes(recorded)))
+
+    def step(self, i: int) -> tuple[KeyState, list[pygame.event.Event]]:
+        """ Returns the keys held down during a step, and the events to handle before it. """
+
+        held, recorded = self.steps[i]
+        keys = KeyState(key for bit, key in enumerate(self.keys) if held & (1 << bit))
+        events = [pygame.event.Event(pygame.KEYUP if byte & _RELEASE_BIT else pygame.KEYDOWN,
+                                     key=self.keys[byte & 0x7F]) for byte in recorded]
+        return keys, events
+
+    def save(self, path: Union[str, Path]) -> None:
+        """ Writes the recording to a file. """
+
+        data = bytearray(struct.pack("<4sHIB", MAGIC, VERSION, self.seed, len(self.keys)))
+        data += struct.pack(f"<{len(self.keys)}I", *self.keys)
+        data += struct.pack("<I", len(self.steps))
+        for held, events in self.steps:
+            data += struct.pack("<HB", held, len(events))
+            data += events
+        data += bytes.fromhex(self.checksum or "00" * 8)
+        Path(path).write_bytes(data)
+
+    @staticmethod
+    def load(path: Union[str, Path]) -> "Recording":
+        """ Reads a recording from a file written by save(). """
+
+        data = Path(path).read_bytes()
+        magic, version, seed, key_count = struct.unpack_from("<4sHIB", data, 0)
+        if magic != MAGIC:
+            raise Exception(f"'{path}' is not a recording")
+        if version != VERSION:
+            raise Exception(f"'{path}' is a version {version} recording, but only version {VERSION} can be read")
+        offset = struct.calcsize("<4sHIB")
+
+        keys = struct.unpack_from(f"<{key_count}I", data, offset)
+        offset += 4 * key_count
+        recording = Recording(seed=seed, keys=keys)
+
+        step_count, = struct.unpack_from("<I", data, offset)
+        offset += 4
+        for _ in range(step_count):
+            held, event_count = struct.unpack_from("<HB", data, offset)
+            offset += 3
+            recording.steps.append((held, data[offset:offset + event_count]))
+            offset += event_count
+
+        recording.checksum = data[offset:offset + 8].hex()
+        return recording
+
+
+class InputRecorder(InputSource):
+    def __init__(self, source: InputSource, path: Union[str, Path]):
+        """
+        Passes input through from another source, recording what each step of a level used.
+
+        A step is recorded whenever the keys held down are asked for, which the player does once per update. The
+        events handed out since the step before go with it. Recording starts over whenever a level starts, so the
+        file ends up holding the last level played. It is written when the recorder is closed.
+
+        :param source: where the input really comes from.
+        :param path: the file to write the recording to.
+        """
+
+        self.source: InputSource = source
+        self.path: Path = Path(path)
+        self.recording: Recording = None
+        self._scene = None
+        self._pending_events: list[pygame.event.Event] = []
+
+    def advance(self) -> None:
+        self.source.advance()
+
+    def start_level(self, scene) -> None:
+        self.source.start_level(scene)
+        self.recording = Recording(seed=scene.seed)
+        self._scene = scene
+        self._pending_events = []
+
+    def get_events(self) -> list[pygame.event.Event]:
+        events = self.source.get_events()
+        if self.recording is not None:
+            self._pending_events.extend(events)
+        return events
+
+    def get_pressed(self):
+        pressed = self.source.get_pressed()
+        if self.recording is not None:
+            self.recording.add_step(pressed, self._pending_events)
+            self._pending_events = []
+        return pressed
+
+    def close(self) -> None:
+        self.source.close()
+        if self.recording is None:
+            return
+        self.recording.checksum = state_checksum(self._scene)
+        self.recording.save(self.path)
+
+
+class InputReplay(InputSource):
+    def __init__(self, recording: Recording):
+        """
+        Plays back a recording, one step per frame. The level has to be built with the recording's seed, and
+        updated exactly once per frame (as the headless runner does), for it to play out the same way.
+
+        :param recording: the recording to play.
+        """
+
+        self.recording: Recording = recording
+        self.frame: int = -1
+        self._keys: KeyState = KeyState()
+        self._events: list[pygame.event.Event] = []
+
+    @property
+    def finished(self) -> bool:
+        """ Returns True once every step of the recording has been played. """
+        return self.frame >= len(self.recording) - 1
+
+    def advance(self) -> None:
+        self.frame += 1
+        if self.frame < len(self.recording):
+            self._keys, self._events = self.recording.step(self.frame)
+        else:
+            self._keys, self._events = KeyState(), []
+
+    def get_events(self) -> list[pygame.event.Event]:
+        return self._events
+
+    def get_pressed(self) -> KeyState:
+        return self._keys
@@ -22,6 +22,8 @@
 
 import pygame
 
+from scripts.util import assets
+
 # sounds dictionary which maps sound names (strings) to Sound objects
 sounds = {}
 
@@ -49,7 +51,7 @@ class _Sound:
         self.fpath = fpath
         self.volume = volume
         self.original_volume = volume
-        self.pygameSound = pygame.mixer.Sound(fpath)
+        self.pygameSound = assets.load_audio(fpath)
         self.pygameSound.set_volume(volume / 100)
 
         # add this sound to sounds dictionary when created
@@ -0,0 +1,113 @@
+"""
+Measures where the time goes between starting the game and the first frame appearing on screen.
+
+Only the standard library is used here, so this module can be imported (and enabled) before anything else.
+
+example usage:
+    startup_profile.enable()      # as early as possible
+    ...                           # imports, asset loading, etc. are recorded automatically
+    startup_profile.mark("scene created")
+    startup_profile.finish()      # right after the first display.flip(); prints the report
+"""
+
+import builtins
+import sys
+import time
+
+# Time at which this module was first imported, which main.py does before anything else
+_start: float = time.perf_counter()
+
+_enabled: bool = False
+_original_import = builtins.__import__
+_import_stack: list[float] = []
+_imports: list[tuple[str, float, float]] = []  # (module, self seconds, total seconds)
+_assets: list[tuple[str, float]] = []  # (asset path, seconds)
+_loaders: list[dict[str, float]] = []  # AssetLoader.report() of each loader that finished
+_marks: list[tuple[str, float]] = []  # (label, seconds since start)
+
+
+def enabled() -> bool:
+    """ Returns True while startup is being profiled. """
+    return _enabled
+
+
+def enable() -> None:
+    """ Starts recording module imports, asset loads and marks. """
+
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    builtins.__import__ = _timed_import
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """ Stand-in for the builtin __import__ that times each module the first time it is imported. """
+
+    # Already imported (or relative) imports are near free; don't bother timing them
+    if level != 0 or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    start = time.perf_counter()
+    _import_stack.append(0.0)
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        total = time.perf_counter() - start
+        nested = _import_stack.pop()
+        if _import_stack:
+            _import_stack[-1] += total
+        _imports.append((name, total - nested, total))
+
+
+def record_asset(name: str, seconds: float) -> None:
+    """ Records how long it took to load an asset. Does nothing unless profiling is enabled. """
+    if _enabled:
+        _assets.append((str(name), seconds))
+
+
+def record_loader(report: dict[str, float]) -> None:
+    """ Records how an AssetLoader did (see AssetLoader.report()). Does nothing unless profiling is enabled. """
+    if _enabled:
+        _loaders.append(report)
+
+
+def mark(label: str) -> None:
+    """ Records that some milestone of startup has been reached. Does nothing unless profiling is enabled. """
+    if _enabled:
+        _marks.append((label, time.perf_counter() - _start))
+
+
+def finish(top: int = 15) -> None:
+    """
+    Stops profiling and prints the report.
+
+    :param top: how many of the slowest modules and assets to list.
+    """
+
+    global _enabled
+    if not _enabled:
+        return
+    mark("first frame shown")
+    _enabled = False
+    builtins.__import__ = _original_import
+
+    print(f"--- Startup profile: {_marks[-1][1] * 1000:.1f} ms to first frame ---")
+
+    print("Milestones (ms since start):")
+    for label, seconds in _marks:
+        print(f"  {seconds * 1000:9.1f}  {label}")
+
+    print(f"Imports: {len(_imports)} modules, {sum(s for _, s, _ in _imports) * 1000:.1f} ms "
+          f"(slowest {top}, self / including nested imports):")
+    for name, self_seconds, total in sorted(_imports, key=lambda i: i[1], reverse=True)[:top]:
+        print(f"  {self_seconds * 1000:9.1f} / {total * 1000:9.1f}  {name}")
+
+    print("Asset loaders (wall time / decode time summed over every thread):")
+    for report in _loaders:
+        print(f"  {report['wall_seconds'] * 1000:9.1f} / {report['decode_seconds'] * 1000:9.1f}  "
+              f"{report['files']} files")
+
+    print(f"Assets: {len(_assets)} loaded, {sum(s for _, s in _assets) * 1000:.1f} ms (slowest {top}):")
+    for name, seconds in sorted(_assets, key=lambda a: a[1], reverse=True)[:top]:
+        print(f"  {seconds * 1000:9.1f}  {name}")
@@ -0,0 +1,30 @@
+"""
+Shared setup for the tests. Run them from the project folder with:
+    python -m pytest
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# The game's modules are imported as scripts.*, and load their assets from paths relative to the project folder
+sys.path.insert(0, str(PROJECT_DIR))
+os.chdir(PROJECT_DIR)
+
+# No window and no sound. Must be set before pygame is initialized
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def display() -> pygame.Surface:
+    """ Creates the (dummy) display, which images need before they can be converted. """
+    pygame.init()
+    yield pygame.display.set_mode((1280, 720))
+    pygame.quit()
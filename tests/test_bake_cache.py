@@ -0,0 +1,91 @@
+import pygame
+import pytest
+
+from scripts.util import bake_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """ Points the cache at an empty temporary folder. """
+    monkeypatch.setattr(bake_cache, "CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+def make_animations() -> dict[str, list[pygame.Surface]]:
+    animations = dict()
+    for name, color in (("idle", (255, 0, 0, 255)), ("run", (0, 128, 255, 100))):
+        frames = []
+        for i in range(3):
+            frame = pygame.Surface((4 + i, 6), pygame.SRCALPHA)
+            frame.fill(color)
+            frame.set_at((0, 0), (i, i, i, 255))
+            frames.append(frame)
+        animations[name] = frames
+    return animations
+
+
+def pixels(animations: dict[str, list[pygame.Surface]]) -> dict[str, list[tuple]]:
+    return {name: [(frame.get_size(), pygame.image.tostring(frame, "RGBA")) for frame in frames]
+            for name, frames in animations.items()}
+
+
+def test_round_trip(display, cache_dir):
+    animations = make_animations()
+    bake_cache.save("player", "a" * 40, animations)
+
+    loaded = bake_cache.load("player", "a" * 40)
+    assert loaded is not None
+    assert pixels(loaded) == pixels(animations)
+
+
+def test_missing_file_is_a_miss(display, cache_dir):
+    assert bake_cache.load("player", "a" * 40) is None
+
+
+def test_other_key_is_a_miss(display, cache_dir):
+    bake_cache.save("player", "a" * 40, make_animations())
+
+    assert bake_cache.load("player", "b" * 40) is None
+    # The file may still be good for whoever baked it with that key
+    assert (cache_dir / "player.bake").exists()
+
+
+def test_other_format_version_is_a_miss(display, cache_dir, monkeypatch):
+    bake_cache.save("player", "a" * 40, make_animations())
+    monkeypatch.setattr(bake_cache, "FORMAT_VERSION", bake_cache.FORMAT_VERSION + 1)
+
+    assert bake_cache.load("player", "a" * 40) is None
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: data[:len(data) // 2],  # truncated
+    lambda data: data[:bake_cache._HEADER.size] + b"not zlib data",  # garbage after the header
+    lambda data: data[:3],  # shorter than the header
+])
+def test_corrupt_file_is_a_miss(display, cache_dir, corrupt):
+    bake_cache.save("player", "a" * 40, make_animations())
+    path = cache_dir / "player.bake"
+    path.write_bytes(corrupt(path.read_bytes()))
+
+    assert bake_cache.load("player", "a" * 40) is None
+
+
+def test_corrupt_payload_is_deleted(display, cache_dir):
+    bake_cache.save("player", "a" * 40, make_animations())
+    path = cache_dir / "player.bake"
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) - 10])
+
+    assert bake_cache.load("player", "a" * 40) is None
+    assert not path.exists()
+
+
+def test_fingerprint_changes_with_sources_and_extra(tmp_path):
+    source = tmp_path / "frame.png"
+    source.write_bytes(b"one")
+    key = bake_cache.fingerprint([source], (32, 32))
+
+    assert bake_cache.fingerprint([source], (32, 32)) == key
+    assert bake_cache.fingerprint([source], (64, 64)) != key
+    source.write_bytes(b"longer")
+    assert bake_cache.fingerprint([source], (32, 32)) != key
@@ -0,0 +1,86 @@
+import pymunk
+import pytest
+
+from scripts.player.bullet import BulletPool
+from scripts.util.component_store import ComponentStore
+
+
+@pytest.fixture
+def world():
+    return pymunk.Space()
+
+
+def fire(pool: BulletPool, x: float = 0, direction: tuple = (1, 0)):
+    return pool.acquire(location=pymunk.Vec2d(x, 100), direction=pymunk.Vec2d(*direction), damage=50)
+
+
+def test_bullets_are_created_up_front(display, world):
+    pool = BulletPool(world, size=4)
+
+    assert len(pool) == 4
+    assert pool.stats() == {"allocated": 4, "active": 0, "free": 4, "high_water_mark": 0}
+    assert not world.bodies
+
+
+def test_acquire_fires_a_bullet(display, world):
+    pool = BulletPool(world, size=2)
+    bullet = fire(pool, x=10, direction=(-3, 0))
+
+    assert bullet.enabled
+    assert bullet.damage == 50
+    assert bullet.body.position == (10, 100)
+    assert bullet.body.velocity == (-1250, 0)
+    assert bullet.facing_left
+    assert bullet.body in world.bodies
+    assert pool.active == [bullet]
+    assert len(pool.free) == 1
+
+
+def test_despawn_returns_bullet_to_pool(display, world):
+    pool = BulletPool(world, size=2)
+    bullet = fire(pool)
+    bullet.despawn()
+
+    assert not bullet.enabled
+    assert bullet.body not in world.bodies
+    assert pool.active == []
+    assert bullet in pool.free
+
+    # The same bullet is fired again, rather than a new one
+    assert fire(pool) is bullet
+    assert len(pool) == 2
+
+
+def test_update_despawns_out_of_bounds(display, world):
+    pool = BulletPool(world, size=2)
+    inside, outside = fire(pool, x=50), fire(pool, x=500)
+    for bullet in list(pool.active):
+        bullet.update(right_bound=100, left_bound=0)
+
+    assert pool.active == [inside]
+    assert not outside.enabled
+
+
+def test_pool_grows_when_empty(display, world):
+    pool = BulletPool(world, size=2)
+    bullets = [fire(pool) for _ in range(5)]
+
+    assert len(set(map(id, bullets))) == 5
+    assert pool.stats() == {"allocated": 5, "active": 5, "free": 0, "high_water_mark": 5}
+
+    for bullet in bullets[:3]:
+        bullet.despawn()
+    fire(pool)
+    assert pool.stats() == {"allocated": 5, "active": 3, "free": 2, "high_water_mark": 5}
+
+
+def test_bullets_in_flight_are_kept_in_store(display, world):
+    pool = BulletPool(world, size=2)
+    pool.store = ComponentStore(capacity=1)
+    first, second = fire(pool), fire(pool)
+
+    assert len(pool.store) == 2
+    first.despawn()
+    assert first not in pool.store
+    assert second in pool.store
+    assert len(pool.store) == 1
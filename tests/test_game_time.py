@@ -0,0 +1,67 @@
+import pytest
+
+from scripts.util.game_time import FIXED_TIMESTEP, FixedTimestep
+
+
+@pytest.fixture
+def timestep():
+    # A step that floats represent exactly, so the sums below have no rounding error
+    return FixedTimestep(step=0.25, max_steps=5)
+
+
+def test_starts_with_nothing_owed(timestep):
+    assert timestep.accumulator == 0
+    assert timestep.alpha == 1
+    assert timestep.advance(0) == 0
+
+
+def test_short_frames_accumulate(timestep):
+    assert timestep.advance(0.125) == 0
+    assert timestep.alpha == 0.5
+    assert timestep.advance(0.0625) == 0
+    assert timestep.alpha == 0.75
+    assert timestep.advance(0.125) == 1
+    assert timestep.alpha == 0.25
+
+
+def test_whole_steps(timestep):
+    assert timestep.advance(0.5) == 2
+    assert timestep.accumulator == 0
+    assert timestep.alpha == 0
+
+
+def test_slow_frame_drops_time(timestep):
+    assert timestep.advance(10.125) == 5
+    assert timestep.dropped_time == 10 - 5 * 0.25
+    # What is left over is still less than a step, and is kept
+    assert timestep.alpha == 0.5
+    assert timestep.advance(0.125) == 1
+
+
+def test_counts_steps(timestep):
+    for _ in range(4):
+        timestep.advance(0.375)
+
+    assert timestep.steps == 6
+    assert timestep.dropped_time == 0
+
+
+def test_reset(timestep):
+    timestep.advance(0.375)
+    timestep.reset()
+
+    assert timestep.accumulator == 0
+    assert timestep.alpha == 1
+    assert timestep.advance(0.125) == 0
+
+
+@pytest.mark.parametrize("fps", [30, 60, 144, 240])
+def test_keeps_pace_with_real_time(fps):
+    timestep = FixedTimestep()
+    for _ in range(fps * 10):
+        steps = timestep.advance(1 / fps)
+        assert 0 <= steps <= timestep.max_steps
+        assert 0 <= timestep.alpha <= 1
+
+    # Ten seconds of frames run ten seconds of steps, give or take the one still being accumulated
+    assert round(10 / FIXED_TIMESTEP) - timestep.steps in (0, 1)
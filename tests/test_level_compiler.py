@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from scripts.leveldesigner import level_compiler
+from scripts.leveldesigner.level_compiler import compile_grid, read_level, write_level
+
+ROWS = [
+    ["", "", "e", ""],
+    ["a", "", "", "b"],
+    ["a", "a", "a"],  # ragged: padded with an empty tile
+]
+
+
+@pytest.fixture
+def level_file(tmp_path):
+    path = tmp_path / "compiled" / "level1.lvl"
+    write_level(path, compile_grid(ROWS, digest=bytes(range(20))))
+    return path
+
+
+def test_compile_grid_pads_ragged_rows():
+    level = compile_grid(ROWS)
+
+    assert level.grid.shape == (3, 4)
+    assert level.grid.dtype == np.uint8
+    assert [[level.codes[i] for i in row] for row in level.grid] == [ROWS[0], ROWS[1], ROWS[2] + [""]]
+
+
+def test_compile_grid_refuses_too_many_codes():
+    with pytest.raises(Exception, match="256"):
+        compile_grid([[str(i) for i in range(257)]])
+
+
+def test_round_trip(level_file):
+    written = compile_grid(ROWS, digest=bytes(range(20)))
+    level = read_level(level_file)
+
+    assert np.array_equal(level.grid, written.grid)
+    assert level.codes == written.codes
+    assert level.source_digest == bytes(range(20))
+
+
+def test_round_trip_empty_level(tmp_path):
+    path = tmp_path / "empty.lvl"
+    write_level(path, compile_grid([]))
+
+    assert read_level(path).grid.shape == (0, 0)
+
+
+def test_not_a_level(tmp_path):
+    path = tmp_path / "level1.lvl"
+    path.write_bytes(b"PNG" + bytes(100))
+
+    with pytest.raises(Exception, match="not a compiled level"):
+        read_level(path)
+
+
+def test_other_format_version(level_file, monkeypatch):
+    monkeypatch.setattr(level_compiler, "FORMAT_VERSION", level_compiler.FORMAT_VERSION + 1)
+
+    with pytest.raises(Exception, match="not a compiled level"):
+        read_level(level_file)
+
+
+def test_changed_tile_fails_checksum(level_file):
+    data = bytearray(level_file.read_bytes())
+    data[-1] ^= 1
+    level_file.write_bytes(bytes(data))
+
+    with pytest.raises(Exception, match="checksum"):
+        read_level(level_file)
+
+
+@pytest.mark.parametrize("keep", [0, 10, level_compiler._HEADER.size + 1, -1])
+def test_truncated_file(level_file, keep):
+    data = level_file.read_bytes()
+    level_file.write_bytes(data[:keep])
+
+    with pytest.raises(Exception, match="not a compiled level|corrupt"):
+        read_level(level_file)
+
+
+def test_padded_file(level_file):
+    level_file.write_bytes(level_file.read_bytes() + b"\0")
+
+    with pytest.raises(Exception, match="corrupt"):
+        read_level(level_file)
@@ -0,0 +1,100 @@
+import pygame
+import pymunk
+import pytest
+
+from scripts import headless
+from scripts.scenes.level_one import LevelOneScene
+from scripts.util.asset_loader import AssetLoader
+from scripts.util.input_source import KeyState
+from scripts.util.replay import MAGIC, VERSION, Recording, state_checksum
+
+
+@pytest.fixture
+def level_assets(display):
+    """ Loads level one's assets, or skips the test if any of them are missing from this checkout. """
+
+    manifest = LevelOneScene.manifest()
+    missing = [str(path) for path, _ in manifest.images if not path.exists()] + \
+        [str(path) for path in manifest.audio if not path.exists()]
+    if missing:
+        pytest.skip(f"level one's assets are missing: {', '.join(missing)}")
+    AssetLoader(manifest).wait()
+
+
+def test_recording_round_trip(tmp_path):
+    recording = Recording(seed=7)
+    recording.add_step(KeyState([pygame.K_d, pygame.K_F1]), [
+        pygame.event.Event(pygame.KEYDOWN, key=pygame.K_w),
+        pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F1),  # not a recorded key
+        pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(0, 0), button=1),
+        pygame.event.Event(pygame.KEYUP, key=pygame.K_d),
+    ])
+    recording.add_step(KeyState(), [])
+    recording.checksum = "0123456789abcdef"
+    recording.save(tmp_path / "session.rec")
+
+    loaded = Recording.load(tmp_path / "session.rec")
+    assert loaded.seed == 7
+    assert loaded.keys == recording.keys
+    assert loaded.steps == recording.steps
+    assert loaded.checksum == "0123456789abcdef"
+
+    keys, events = loaded.step(0)
+    assert keys.held == {pygame.K_d}
+    assert [(event.type, event.key) for event in events] == [(pygame.KEYDOWN, pygame.K_w),
+                                                             (pygame.KEYUP, pygame.K_d)]
+    keys, events = loaded.step(1)
+    assert keys.held == set() and events == []
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "session.rec"
+    path.write_bytes(b"RIFF" + bytes(32))
+    with pytest.raises(Exception, match="not a recording"):
+        Recording.load(path)
+
+    Recording(seed=7).save(path)
+    data = bytearray(path.read_bytes())
+    data[len(MAGIC)] = VERSION + 1
+    path.write_bytes(bytes(data))
+    with pytest.raises(Exception, match="version"):
+        Recording.load(path)
+
+
+def test_at_most_16_keys():
+    with pytest.raises(Exception, match="16 keys"):
+        Recording(seed=0, keys=range(17))
+
+
+@pytest.mark.parametrize("render, component_store", [(False, False), (True, False), (True, True)])
+def test_replay_matches_recording(level_assets, tmp_path, render, component_store):
+    path = tmp_path / "session.rec"
+    recorded = headless.run(seconds=5, seed=1, record=str(path), component_store=False)
+
+    replayed = headless.replay(str(path), render=render, component_store=component_store)
+    assert replayed["steps"] == recorded["steps"]
+    assert replayed["expected_checksum"] == recorded["checksum"]
+    assert replayed["checksum"] == recorded["checksum"]
+
+
+def test_checksum_depends_on_seed(level_assets):
+    assert headless.run(seconds=1, seed=1)["checksum"] != headless.run(seconds=1, seed=2)["checksum"]
+
+
+def test_checksum_covers_state(level_assets):
+    scene = LevelOneScene(seed=1)
+    chunks = scene.level_designer.chunks
+    enemy = next(iter(scene.enemies if chunks is None else chunks.all_enemies()))
+    player = scene.player
+
+    def changes_checksum(change) -> bool:
+        before = state_checksum(scene)
+        change()
+        return state_checksum(scene) != before
+
+    assert state_checksum(scene) == state_checksum(scene)
+    assert changes_checksum(lambda: setattr(enemy, "direction", -enemy.direction))
+    assert changes_checksum(lambda: setattr(enemy, "enemy_type", enemy.enemy_type + "_other"))
+    assert changes_checksum(lambda: setattr(player, "health", player.health - 1))
+    assert changes_checksum(lambda: player.bullet_pool.acquire(location=pymunk.Vec2d(0, 0),
+                                                               direction=pymunk.Vec2d(1, 0), damage=1))
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from scripts.leveldesigner.terrain_compiler import merge_rectangles, solid_mask
+
+
+def coverage(rects: list[tuple[int, int, int, int]], shape: tuple) -> np.ndarray:
+    """ How many rectangles cover each tile. """
+    covered = np.zeros(shape, dtype=int)
+    for col, row, width, height in rects:
+        assert width > 0 and height > 0
+        covered[row:row + height, col:col + width] += 1
+    return covered
+
+
+def test_empty():
+    assert merge_rectangles(np.zeros((0, 0), dtype=bool)) == []
+    assert merge_rectangles(np.zeros((3, 4), dtype=bool)) == []
+
+
+def test_full_grid_is_one_rectangle():
+    assert merge_rectangles(np.ones((3, 4), dtype=bool)) == [(0, 0, 4, 3)]
+
+
+def test_rows_and_columns():
+    solid = np.array([
+        [1, 1, 0, 1],
+        [0, 0, 0, 1],
+        [1, 1, 1, 1],
+    ], dtype=bool)
+
+    assert merge_rectangles(solid) == [(0, 0, 2, 1), (3, 0, 1, 3), (0, 2, 3, 1)]
+
+
+def test_grows_down_only_while_the_whole_width_is_solid():
+    solid = np.array([
+        [1, 1, 1],
+        [1, 1, 1],
+        [1, 1, 0],
+    ], dtype=bool)
+
+    assert merge_rectangles(solid) == [(0, 0, 3, 2), (0, 2, 2, 1)]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_covers_every_solid_tile_exactly_once(seed):
+    solid = np.random.default_rng(seed).random((20, 30)) < 0.6
+    rects = merge_rectangles(solid)
+
+    assert np.array_equal(coverage(rects, solid.shape), solid.astype(int))
+    assert len(rects) <= solid.sum()
+
+
+def test_solid_mask():
+    tiles = np.array([[0, 1], [2, 3]], dtype=np.uint8)
+
+    assert solid_mask(tiles, ["", "a", "e", "b"], solid_tiles={"a", "b"}).tolist() == [[False, True], [False, True]]
@@ -0,0 +1,65 @@
+import pytest
+
+from scripts.leveldesigner.walkable_spans import WalkableSpans
+
+TILE = 10
+
+# With 4 rows, the top of tile row y is at world y 10 * (5 - y)
+LEVEL = [
+    ["", "", "", "", "", "e"],
+    ["", "a", "", "", "", ""],
+    ["a", "a", "a", "", "b", "b"],
+    ["a", "a", "a", "a", "a", "a"],
+]
+
+
+@pytest.fixture
+def spans():
+    return WalkableSpans(LEVEL, solid_tiles={"a", "b"}, tile_size=TILE)
+
+
+def test_spans(spans):
+    assert sorted(spans.spans) == [
+        (0, 10, 30),  # a ledge, ended by the wall on top of column 1
+        (10, 20, 40),  # the block on top
+        (20, 30, 30),  # between the wall and the gap
+        (30, 40, 20),  # the bottom of the gap
+        (40, 60, 30),  # a run of two different solid tiles, ending at the edge of the level
+    ]
+    assert len(spans) == 5
+
+
+@pytest.mark.parametrize("x, feet_y, expected", [
+    (5, 30, (0, 10, 30)),
+    (15, 40, (10, 20, 40)),
+    (25, 30, (20, 30, 30)),
+    (35, 20, (30, 40, 20)),
+    (45, 30, (40, 60, 30)),
+    (59.9, 30, (40, 60, 30)),
+    (10, 40, (10, 20, 40)),  # a span's left edge is part of it
+    (25, 32, (20, 30, 30)),  # feet a little above or sunk into the ground still count
+    (25, 27.5, (20, 30, 30)),
+])
+def test_standing(spans, x, feet_y, expected):
+    assert spans.span_under(x, feet_y) == expected
+
+
+@pytest.mark.parametrize("x, feet_y", [
+    (25, 35),  # jumping
+    (25, 26),  # too far sunk in
+    (35, 30),  # over the gap
+    (55, 50),  # next to the non-solid "e" tile at the top
+    (-5, 30),  # off the left
+    (65, 30),  # off the right
+    (5, 500),  # far above
+    (5, -100),  # far below
+])
+def test_not_standing(spans, x, feet_y):
+    assert spans.span_under(x, feet_y) is None
+
+
+def test_empty_level():
+    spans = WalkableSpans([], solid_tiles={"a"}, tile_size=TILE)
+
+    assert len(spans) == 0
+    assert spans.span_under(0, 0) is None